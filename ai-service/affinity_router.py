@@ -0,0 +1,523 @@
+"""
+🧭 Affinity Router
+
+A small gRPC proxy in front of several AI service nodes that sends all of a
+user's requests to the same node, so per-user state (response caches, the
+near-duplicate index of analyzed days, precomputed recommendations) is
+reused instead of being rebuilt on every node.
+
+    - Requests are routed on ``user_id`` through a consistent-hash ring with
+      virtual nodes. When a node joins or leaves, only the users on the ring
+      segments it gains or loses move (about 1/N of them).
+    - Nodes are health-checked in the background through
+      ``grpc.health.v1.Health``, so a node that is warming up or draining
+      gets no traffic. A user whose node is down goes to the next healthy
+      node on the ring and returns once it recovers. A call that fails with
+      UNAVAILABLE on a node that also fails its health check is retried on
+      the next node.
+    - Messages are forwarded as raw bytes. ``user_id`` is read straight from
+      the wire, so the proxy never parses or re-serializes a message.
+    - PrecomputeMovieRecommendations batches are split per node; grid mode
+      (no user jobs) is sent to every healthy node.
+    - Requests without a user (AdminService) are spread round-robin.
+
+The node list comes from ``AFFINITY_NODES`` or ``--nodes``. With
+``--nodes-file`` (one address per line), the file is re-read on SIGHUP to
+add or remove nodes without a restart.
+
+Usage:
+    GRPC_PORT=50061 METRICS_PORT=0 python server.py   # and 50062, 50063, ...
+    python affinity_router.py --nodes localhost:50061,localhost:50062,localhost:50063
+"""
+
+import argparse
+import bisect
+import hashlib
+import itertools
+import logging
+import os
+import signal
+import threading
+from concurrent import futures
+from dataclasses import dataclass, field
+
+import grpc
+
+import ai_pb2
+from metrics import AFFINITY_NODE_HEALTHY, AFFINITY_ROUTED, MetricsInterceptor, start_metrics_server
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Configuration
+AFFINITY_PORT = os.getenv('AFFINITY_PORT', '50050')
+# Comma-separated host:port list of AI service nodes
+AFFINITY_NODES = os.getenv('AFFINITY_NODES', '')
+# Ring points per node; more points spread users more evenly
+AFFINITY_VNODES = int(os.getenv('AFFINITY_VNODES', '160'))
+AFFINITY_HEALTH_INTERVAL = float(os.getenv('AFFINITY_HEALTH_INTERVAL', '2'))
+AFFINITY_HEALTH_TIMEOUT = 1.0
+AFFINITY_MAX_WORKERS = int(os.getenv('AFFINITY_MAX_WORKERS', '64'))
+AFFINITY_METRICS_PORT = int(os.getenv('AFFINITY_METRICS_PORT', '9110'))  # 0 disables /metrics
+DRAIN_GRACE_SECONDS = float(os.getenv('DRAIN_GRACE_SECONDS', '25'))
+# Callers without a deadline report ~9.2e18 s remaining, which overflows as a timeout
+MAX_FORWARD_TIMEOUT = 365 * 24 * 3600.0
+
+HEALTH_CHECK_METHOD = '/grpc.health.v1.Health/Check'
+# HealthCheckResponse.status values
+SERVING, NOT_SERVING = 1, 2
+
+PRECOMPUTE_METHOD = '/ai.AIAnalysisService/PrecomputeMovieRecommendations'
+PRECOMPUTE_JOBS_FIELD = ai_pb2.PrecomputeRecommendationsRequest.DESCRIPTOR.fields_by_name['requests'].number
+JOB_USER_FIELD = ai_pb2.MovieRecommendationRequest.DESCRIPTOR.fields_by_name['user_id'].number
+
+
+def _method_table():
+    """``{path: (user_id field number or None, server_streaming)}`` for every ai RPC."""
+    table = {}
+    for service in ai_pb2.DESCRIPTOR.services_by_name.values():
+        for method in service.methods:
+            user_field = method.input_type.fields_by_name.get('user_id')
+            table[f'/{service.full_name}/{method.name}'] = (
+                user_field.number if user_field is not None else None,
+                method.server_streaming,
+            )
+    return table
+
+
+METHODS = _method_table()
+
+
+# ============================================
+# Protobuf wire reading
+# ============================================
+
+def _varint(data: bytes, pos: int) -> tuple:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def wire_fields(data: bytes):
+    """Yield ``(number, start, end, value)`` per top-level field; ``value`` is the
+    payload of length-delimited fields, the integer of varints, else None."""
+    pos, size = 0, len(data)
+    while pos < size:
+        start = pos
+        tag, pos = _varint(data, pos)
+        number, wire_type = tag >> 3, tag & 7
+        if wire_type == 0:
+            value, pos = _varint(data, pos)
+        elif wire_type == 2:
+            length, pos = _varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == 1:
+            value, pos = None, pos + 8
+        elif wire_type == 5:
+            value, pos = None, pos + 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        if pos > size:
+            raise ValueError("Truncated message")
+        yield number, start, pos, value
+
+
+def read_string_field(data: bytes, number: int) -> str:
+    """Value of a top-level string field, '' when absent or unreadable."""
+    try:
+        for field_number, _, _, value in wire_fields(data):
+            if field_number == number and isinstance(value, bytes):
+                return value.decode('utf-8', 'replace')
+    except (IndexError, ValueError):
+        pass
+    return ''
+
+
+# ============================================
+# Consistent-hash ring
+# ============================================
+
+def ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """Immutable consistent-hash ring; build a new one to change membership."""
+
+    def __init__(self, nodes=(), vnodes: int = AFFINITY_VNODES):
+        self.nodes = tuple(dict.fromkeys(nodes))
+        self.vnodes = vnodes
+        points = sorted((ring_hash(f'{node}#{i}'), node) for node in self.nodes for i in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def candidates(self, key: str) -> list:
+        """Distinct nodes in ring order from the key's position: owner first, then failover order."""
+        if not self._owners:
+            return []
+        start = bisect.bisect_right(self._hashes, ring_hash(key))
+        seen = {}
+        for i in range(len(self._owners)):
+            node = self._owners[(start + i) % len(self._owners)]
+            if node not in seen:
+                seen[node] = None
+                if len(seen) == len(self.nodes):
+                    break
+        return list(seen)
+
+    def owner(self, key: str):
+        if not self._owners:
+            return None
+        return self._owners[bisect.bisect_right(self._hashes, ring_hash(key)) % len(self._owners)]
+
+    def shares(self) -> dict:
+        """Fraction of the hash space owned by each node."""
+        shares = dict.fromkeys(self.nodes, 0.0)
+        if not self._owners:
+            return shares
+        space = float(1 << 64)
+        previous = self._hashes[-1] - (1 << 64)
+        for point, node in zip(self._hashes, self._owners):
+            shares[node] += (point - previous) / space
+            previous = point
+        return shares
+
+
+# ============================================
+# Nodes
+# ============================================
+
+@dataclass
+class Node:
+    address: str
+    channel: object
+    healthy: bool = True
+    _callables: dict = field(default_factory=dict, repr=False)
+
+    def unary(self, method: str):
+        call = self._callables.get((method, False))
+        if call is None:
+            call = self._callables[(method, False)] = self.channel.unary_unary(method)
+        return call
+
+    def stream(self, method: str):
+        call = self._callables.get((method, True))
+        if call is None:
+            call = self._callables[(method, True)] = self.channel.unary_stream(method)
+        return call
+
+    def set_healthy(self, healthy: bool, reason: str = ''):
+        if healthy != self.healthy:
+            if healthy:
+                logger.info(f"Node {self.address} is healthy again")
+            else:
+                logger.warning(f"Node {self.address} marked down: {reason}")
+        self.healthy = healthy
+        AFFINITY_NODE_HEALTHY.set(1 if healthy else 0, node=self.address)
+
+
+def _health_status(future) -> tuple:
+    """``(healthy, reason)`` from a finished health-check call."""
+    try:
+        response = future.result()
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.UNIMPLEMENTED:
+            return True, ''  # node without grpcio-health-checking: it answered, so it is up
+        return False, f"{e.code().name}: {e.details()}"
+    status = next((value for number, _, _, value in wire_fields(response) if number == 1), 0)
+    return status == SERVING, f"health status {status}"
+
+
+def forward_timeout(context):
+    """Timeout for the downstream call: the caller's remaining deadline, or None if it set none."""
+    remaining = context.time_remaining()
+    return remaining if remaining is not None and remaining < MAX_FORWARD_TIMEOUT else None
+
+
+def forwarded_metadata(context) -> tuple:
+    # Pseudo-headers and the user agent belong to the incoming connection
+    return tuple(
+        (key, value) for key, value in context.invocation_metadata()
+        if not key.startswith(':') and key != 'user-agent'
+    )
+
+
+class AffinityRouter(grpc.GenericRpcHandler):
+    """Forwards every ai RPC to the node owning its ``user_id`` on the ring."""
+
+    def __init__(self, addresses, vnodes: int = AFFINITY_VNODES):
+        self.vnodes = vnodes
+        self.ring = HashRing((), vnodes)
+        self.nodes = {}
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._stopped = threading.Event()
+        self.set_nodes(addresses)
+
+    # ---------- membership ----------
+
+    def set_nodes(self, addresses):
+        """Replace the node set; users only move on the ring segments that change owner."""
+        addresses = list(dict.fromkeys(a.strip() for a in addresses if a.strip()))
+        with self._lock:
+            old_ring = self.ring
+            nodes = {}
+            for address in addresses:
+                node = self.nodes.get(address)
+                if node is None:
+                    node = Node(address, grpc.insecure_channel(address))
+                    AFFINITY_NODE_HEALTHY.set(1, node=address)
+                nodes[address] = node
+            removed = [node for address, node in self.nodes.items() if address not in nodes]
+            self.nodes = nodes
+            self.ring = HashRing(addresses, self.vnodes)
+
+        for node in removed:
+            AFFINITY_NODE_HEALTHY.set(0, node=node.address)
+            node.channel.close()
+        if old_ring.nodes != self.ring.nodes:
+            moved = self._moved_share(old_ring, self.ring)
+            shares = ', '.join(f"{node} {share:.0%}" for node, share in self.ring.shares().items())
+            logger.info(f"Ring now has {len(addresses)} nodes ({shares}); {moved:.0%} of users moved")
+
+    @staticmethod
+    def _moved_share(old: HashRing, new: HashRing, samples: int = 4096) -> float:
+        if not old.nodes:
+            return 0.0
+        moved = sum(old.owner(f'sample-{i}') != new.owner(f'sample-{i}') for i in range(samples))
+        return moved / samples
+
+    # ---------- health ----------
+
+    def check_health(self, nodes=None):
+        """Health-check nodes concurrently and update their state."""
+        nodes = list(self.nodes.values()) if nodes is None else nodes
+        calls = [
+            (node, node.unary(HEALTH_CHECK_METHOD).future(b'', timeout=AFFINITY_HEALTH_TIMEOUT))
+            for node in nodes
+        ]
+        for node, call in calls:
+            healthy, reason = _health_status(call)
+            node.set_healthy(healthy, reason)
+
+    def _health_loop(self):
+        while not self._stopped.wait(AFFINITY_HEALTH_INTERVAL):
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.warning(f"Health check round failed: {e}")
+
+    def start(self):
+        self.check_health()
+        threading.Thread(target=self._health_loop, name='affinity-health', daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    # ---------- routing ----------
+
+    def route(self, user_id: str) -> list:
+        """Nodes to try for a user, in order: healthy ones on the ring, or all if none is healthy."""
+        with self._lock:
+            ring, nodes = self.ring, self.nodes
+        if user_id:
+            ordered = [nodes[address] for address in ring.candidates(user_id)]
+        else:
+            ordered = list(nodes.values())
+            if ordered:
+                offset = next(self._round_robin) % len(ordered)
+                ordered = ordered[offset:] + ordered[:offset]
+        return [node for node in ordered if node.healthy] or ordered
+
+    def _should_fail_over(self, node: Node, error: grpc.RpcError) -> bool:
+        """UNAVAILABLE from a node that also fails its health check means the call never ran there."""
+        if error.code() != grpc.StatusCode.UNAVAILABLE:
+            return False
+        self.check_health([node])
+        return not node.healthy
+
+    def _label(self, node: Node, nodes: list, user_id: str) -> str:
+        if not user_id:
+            return 'round_robin'
+        return 'affinity' if node.address == self.ring.owner(user_id) else 'failover'
+
+    def forward_unary(self, method: str, request: bytes, context, nodes: list, user_id: str = '') -> bytes:
+        if not nodes:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "No AI service nodes configured")
+        metadata = forwarded_metadata(context)
+        for attempt, node in enumerate(nodes):
+            call = node.unary(method).future(request, timeout=forward_timeout(context), metadata=metadata)
+            context.add_callback(call.cancel)
+            try:
+                response = call.result()
+                AFFINITY_ROUTED.inc(node=node.address, route=self._label(node, nodes, user_id))
+                return response
+            except grpc.FutureCancelledError:
+                context.abort(grpc.StatusCode.CANCELLED, "Cancelled by client")
+            except grpc.RpcError as e:
+                if attempt + 1 < len(nodes) and self._should_fail_over(node, e):
+                    logger.warning(f"{method} failed on {node.address}, trying {nodes[attempt + 1].address}")
+                    continue
+                context.abort(e.code(), e.details())
+
+    def forward_stream(self, method: str, request: bytes, context, nodes: list, user_id: str = ''):
+        if not nodes:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "No AI service nodes configured")
+        metadata = forwarded_metadata(context)
+        for attempt, node in enumerate(nodes):
+            responses = node.stream(method)(request, timeout=forward_timeout(context), metadata=metadata)
+            context.add_callback(responses.cancel)
+            sent = False
+            try:
+                for response in responses:
+                    sent = True
+                    yield response
+                AFFINITY_ROUTED.inc(node=node.address, route=self._label(node, nodes, user_id))
+                return
+            except grpc.RpcError as e:
+                if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                    return
+                # Only a stream that has not produced anything can be retried elsewhere
+                if not sent and attempt + 1 < len(nodes) and self._should_fail_over(node, e):
+                    logger.warning(f"{method} failed on {node.address}, trying {nodes[attempt + 1].address}")
+                    continue
+                context.abort(e.code(), e.details())
+
+    def precompute(self, request: bytes, context) -> bytes:
+        """Split per-user precompute jobs by owner node; grid mode goes to every healthy node."""
+        jobs, shared = {}, []
+        try:
+            for number, start, end, value in wire_fields(request):
+                if number == PRECOMPUTE_JOBS_FIELD and isinstance(value, bytes):
+                    user_id = read_string_field(value, JOB_USER_FIELD)
+                    jobs.setdefault(user_id, []).append(request[start:end])
+                else:
+                    shared.append(request[start:end])
+        except (IndexError, ValueError):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Malformed request")
+
+        if jobs:
+            batches = {}
+            for user_id, parts in jobs.items():
+                nodes = self.route(user_id)
+                if nodes:
+                    # The batch follows the failover order of its first user
+                    batches.setdefault(nodes[0].address, (user_id, nodes, []))[2].extend(parts)
+            targets = list(batches.values())
+        else:
+            targets = [('', [node], []) for node in self.route('') if node.healthy]
+
+        total = ai_pb2.PrecomputeRecommendationsResult()
+        for user_id, nodes, parts in targets:
+            response = self.forward_unary(PRECOMPUTE_METHOD, b''.join(shared + parts), context, nodes, user_id)
+            result = ai_pb2.PrecomputeRecommendationsResult.FromString(response)
+            total.queued += result.queued
+            total.pending += result.pending
+        return total.SerializeToString()
+
+    # ---------- grpc.GenericRpcHandler ----------
+
+    def _own_health(self, request: bytes, context) -> bytes:
+        healthy = any(node.healthy for node in self.nodes.values())
+        return bytes([0x08, SERVING if healthy else NOT_SERVING])
+
+    def service(self, handler_call_details):
+        method = handler_call_details.method
+        if method == HEALTH_CHECK_METHOD:
+            return grpc.unary_unary_rpc_method_handler(self._own_health)
+        if method == PRECOMPUTE_METHOD:
+            return grpc.unary_unary_rpc_method_handler(self.precompute)
+        if method not in METHODS:
+            return None
+        user_field, streaming = METHODS[method]
+
+        def user_of(request: bytes) -> str:
+            return read_string_field(request, user_field) if user_field is not None else ''
+
+        if streaming:
+            def handle_stream(request, context):
+                user_id = user_of(request)
+                yield from self.forward_stream(method, request, context, self.route(user_id), user_id)
+            return grpc.unary_stream_rpc_method_handler(handle_stream)
+
+        def handle_unary(request, context):
+            user_id = user_of(request)
+            return self.forward_unary(method, request, context, self.route(user_id), user_id)
+        return grpc.unary_unary_rpc_method_handler(handle_unary)
+
+
+# ============================================
+# Entry point
+# ============================================
+
+def read_nodes_file(path: str) -> list:
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def serve(port: str, addresses: list, vnodes: int, nodes_file: str = ''):
+    router = AffinityRouter(addresses, vnodes)
+    router.start()
+
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=AFFINITY_MAX_WORKERS),
+        handlers=[router],
+        interceptors=[MetricsInterceptor()],
+    )
+    server.add_insecure_port(f'[::]:{port}')
+    server.start()
+    logger.info(f"Affinity router listening on port {port} for {len(router.nodes)} nodes")
+    if AFFINITY_METRICS_PORT:
+        start_metrics_server(AFFINITY_METRICS_PORT)
+
+    stop_requested = threading.Event()
+
+    def request_stop(signum, frame):
+        stop_requested.set()
+
+    def reload_nodes(signum, frame):
+        if not nodes_file:
+            logger.warning("SIGHUP ignored: no --nodes-file to reload")
+            return
+        try:
+            router.set_nodes(read_nodes_file(nodes_file))
+        except OSError as e:
+            logger.error(f"Could not reload {nodes_file}: {e}")
+            return
+        router.check_health()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGHUP, reload_nodes)
+    stop_requested.wait()
+
+    logger.info(f"Stopping, waiting up to {DRAIN_GRACE_SECONDS:.0f}s for in-flight RPCs")
+    server.stop(DRAIN_GRACE_SECONDS).wait()
+    router.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Route AI service RPCs to nodes by user affinity')
+    parser.add_argument('--port', default=AFFINITY_PORT, help='Port to listen on')
+    parser.add_argument('--nodes', default=AFFINITY_NODES, help='Comma-separated host:port list of nodes')
+    parser.add_argument('--nodes-file', default='', help='File with one node per line, re-read on SIGHUP')
+    parser.add_argument('--vnodes', type=int, default=AFFINITY_VNODES, help='Ring points per node')
+    args = parser.parse_args()
+
+    addresses = read_nodes_file(args.nodes_file) if args.nodes_file else args.nodes.split(',')
+    if not any(a.strip() for a in addresses):
+        parser.error('no nodes given (--nodes, --nodes-file or AFFINITY_NODES)')
+    serve(args.port, addresses, args.vnodes, args.nodes_file)
+
+
+if __name__ == '__main__':
+    main()
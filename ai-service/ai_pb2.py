@@ -24,13 +24,17 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x08\x61i.proto\x12\x02\x61i\"U\n\x14\x44\x61ilyAnalysisRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61te\x18\x02 \x01(\t\x12\x1e\n\x05notes\x18\x03 \x03(\x0b\x32\x0f.ai.JournalNote\"y\n\x15WeeklyAnalysisRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x12\n\nweek_start\x18\x02 \x01(\t\x12\x10\n\x08week_end\x18\x03 \x01(\t\x12)\n\x0f\x64\x61ily_summaries\x18\x04 \x03(\x0b\x32\x10.ai.DailySummary\"J\n\x0bJournalNote\x12\n\n\x02id\x18\x01 \x01(\x03\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0c\n\x04\x62ody\x18\x03 \x01(\t\x12\x12\n\ncreated_at\x18\x04 \x01(\t\"\x90\x01\n\x0c\x44\x61ilySummary\x12\x0c\n\x04\x64\x61te\x18\x01 \x01(\t\x12\x0f\n\x07summary\x18\x02 \x01(\t\x12\x15\n\rdominant_mood\x18\x03 \x01(\t\x12\x12\n\nmood_score\x18\x04 \x01(\x05\x12\x12\n\nhighlights\x18\x05 \x03(\t\x12\x0e\n\x06\x61\x64vice\x18\x06 \x03(\t\x12\x12\n\nnote_count\x18\x07 \x01(\x05\"\x85\x01\n\x0e\x41nalysisResult\x12\x0f\n\x07summary\x18\x01 \x01(\t\x12\x15\n\rdominant_mood\x18\x02 \x01(\t\x12\x12\n\nmood_score\x18\x03 \x01(\x05\x12\x12\n\nhighlights\x18\x04 \x03(\t\x12\x0e\n\x06\x61\x64vice\x18\x05 \x03(\t\x12\x13\n\x0b\x61\x66\x66irmation\x18\x06 \x01(\t\"5\n\x13WritingStyleRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\r\n\x05texts\x18\x02 \x03(\t\"f\n\x0b\x41uthorMatch\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0bnationality\x18\x02 \x01(\t\x12\r\n\x05score\x18\x03 \x01(\x02\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x10\n\x08\x66un_fact\x18\x05 \x01(\t\"\xac\x02\n\x12WritingStyleResult\x12\x13\n\x0btotal_words\x18\x01 \x01(\x05\x12\x17\n\x0ftotal_sentences\x18\x02 \x01(\x05\x12\x1b\n\x13\x61vg_sentence_length\x18\x03 \x01(\x02\x12\x1b\n\x13vocabulary_richness\x18\x04 \x01(\x02\x12\x1b\n\x13punctuation_density\x18\x05 \x01(\x02\x12\x17\n\x0f\x61vg_word_length\x18\x06 \x01(\x02\x12\x19\n\x11\x64\x65tected_language\x18\x07 \x01(\t\x12\x11\n\ttop_words\x18\x08 \x03(\t\x12\"\n\ttop_match\x18\t \x01(\x0b\x32\x0f.ai.AuthorMatch\x12&\n\rother_matches\x18\n \x03(\x0b\x32\x0f.ai.AuthorMatch\"\x92\x01\n\x1aMovieRecommendationRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x15\n\rdominant_mood\x18\x02 \x01(\t\x12\x12\n\nmood_score\x18\x03 \x01(\x05\x12\x0f\n\x07summary\x18\x04 \x01(\t\x12\x12\n\nhighlights\x18\x05 \x03(\t\x12\x13\n\x0b\x61\x66\x66irmation\x18\x06 \x01(\t\"~\n\tMovieItem\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0c\n\x04year\x18\x02 \x01(\x05\x12\x0f\n\x07tagline\x18\x03 \x01(\t\x12\x0f\n\x07imdb_id\x18\x04 \x01(\t\x12\x0e\n\x06genres\x18\x05 \x03(\t\x12\x0e\n\x06reason\x18\x06 \x01(\t\x12\x12\n\nposter_url\x18\x07 \x01(\t\"\x86\x01\n\x19MovieRecommendationResult\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x12\n\nmood_label\x18\x02 \x01(\t\x12\x10\n\x08headline\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x1c\n\x05items\x18\x05 \x03(\x0b\x32\r.ai.MovieItem2\xb3\x02\n\x11\x41IAnalysisService\x12<\n\x0c\x41nalyzeDaily\x12\x18.ai.DailyAnalysisRequest\x1a\x12.ai.AnalysisResult\x12>\n\rAnalyzeWeekly\x12\x19.ai.WeeklyAnalysisRequest\x1a\x12.ai.AnalysisResult\x12\x46\n\x13\x41nalyzeWritingStyle\x12\x17.ai.WritingStyleRequest\x1a\x16.ai.WritingStyleResult\x12X\n\x17GetMovieRecommendations\x12\x1e.ai.MovieRecommendationRequest\x1a\x1d.ai.MovieRecommendationResultb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x08\x61i.proto\x12\x02\x61i\"U\n\x14\x44\x61ilyAnalysisRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61te\x18\x02 \x01(\t\x12\x1e\n\x05notes\x18\x03 \x03(\x0b\x32\x0f.ai.JournalNote\"y\n\x15WeeklyAnalysisRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x12\n\nweek_start\x18\x02 \x01(\t\x12\x10\n\x08week_end\x18\x03 \x01(\t\x12)\n\x0f\x64\x61ily_summaries\x18\x04 \x03(\x0b\x32\x10.ai.DailySummary\"J\n\x0bJournalNote\x12\n\n\x02id\x18\x01 \x01(\x03\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0c\n\x04\x62ody\x18\x03 \x01(\t\x12\x12\n\ncreated_at\x18\x04 \x01(\t\"\x90\x01\n\x0c\x44\x61ilySummary\x12\x0c\n\x04\x64\x61te\x18\x01 \x01(\t\x12\x0f\n\x07summary\x18\x02 \x01(\t\x12\x15\n\rdominant_mood\x18\x03 \x01(\t\x12\x12\n\nmood_score\x18\x04 \x01(\x05\x12\x12\n\nhighlights\x18\x05 \x03(\t\x12\x0e\n\x06\x61\x64vice\x18\x06 \x03(\t\x12\x12\n\nnote_count\x18\x07 \x01(\x05\"\x9a\x01\n\x0e\x41nalysisResult\x12\x0f\n\x07summary\x18\x01 \x01(\t\x12\x15\n\rdominant_mood\x18\x02 \x01(\t\x12\x12\n\nmood_score\x18\x03 \x01(\x05\x12\x12\n\nhighlights\x18\x04 \x03(\t\x12\x0e\n\x06\x61\x64vice\x18\x05 \x03(\t\x12\x13\n\x0b\x61\x66\x66irmation\x18\x06 \x01(\t\x12\x13\n\x0bprovisional\x18\x07 \x01(\x08\"5\n\x13WritingStyleRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\r\n\x05texts\x18\x02 \x03(\t\"f\n\x0b\x41uthorMatch\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0bnationality\x18\x02 \x01(\t\x12\r\n\x05score\x18\x03 \x01(\x02\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x10\n\x08\x66un_fact\x18\x05 \x01(\t\"\xe2\x03\n\x12WritingStyleResult\x12\x13\n\x0btotal_words\x18\x01 \x01(\x05\x12\x17\n\x0ftotal_sentences\x18\x02 \x01(\x05\x12\x1b\n\x13\x61vg_sentence_length\x18\x03 \x01(\x02\x12\x1b\n\x13vocabulary_richness\x18\x04 \x01(\x02\x12\x1b\n\x13punctuation_density\x18\x05 \x01(\x02\x12\x17\n\x0f\x61vg_word_length\x18\x06 \x01(\x02\x12\x19\n\x11\x64\x65tected_language\x18\x07 \x01(\t\x12\x11\n\ttop_words\x18\x08 \x03(\t\x12\"\n\ttop_match\x18\t \x01(\x0b\x32\x0f.ai.AuthorMatch\x12&\n\rother_matches\x18\n \x03(\x0b\x32\x0f.ai.AuthorMatch\x12\x1a\n\x12syllables_per_word\x18\x0b \x01(\x02\x12\x13\n\x0breadability\x18\x0c \x01(\x02\x12I\n\x12language_breakdown\x18\r \x03(\x0b\x32-.ai.WritingStyleResult.LanguageBreakdownEntry\x1a\x38\n\x16LanguageBreakdownEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\"\'\n\tDatedText\x12\x0c\n\x04\x64\x61te\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\"q\n\x1bWritingStyleTimelineRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x1e\n\x07\x65ntries\x18\x02 \x03(\x0b\x32\r.ai.DatedText\x12\x0e\n\x06window\x18\x03 \x01(\t\x12\x11\n\tstep_days\x18\x04 \x01(\x05\"r\n\x12WritingStyleWindow\x12\x12\n\nstart_date\x18\x01 \x01(\t\x12\x10\n\x08\x65nd_date\x18\x02 \x01(\t\x12\x0f\n\x07\x65ntries\x18\x03 \x01(\x05\x12%\n\x05style\x18\x04 \x01(\x0b\x32\x16.ai.WritingStyleResult\"E\n\x1aWritingStyleTimelineResult\x12\'\n\x07windows\x18\x01 \x03(\x0b\x32\x16.ai.WritingStyleWindow\"\x92\x01\n\x1aMovieRecommendationRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x15\n\rdominant_mood\x18\x02 \x01(\t\x12\x12\n\nmood_score\x18\x03 \x01(\x05\x12\x0f\n\x07summary\x18\x04 \x01(\t\x12\x12\n\nhighlights\x18\x05 \x03(\t\x12\x13\n\x0b\x61\x66\x66irmation\x18\x06 \x01(\t\"~\n\tMovieItem\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0c\n\x04year\x18\x02 \x01(\x05\x12\x0f\n\x07tagline\x18\x03 \x01(\t\x12\x0f\n\x07imdb_id\x18\x04 \x01(\t\x12\x0e\n\x06genres\x18\x05 \x03(\t\x12\x0e\n\x06reason\x18\x06 \x01(\t\x12\x12\n\nposter_url\x18\x07 \x01(\t\"\x86\x01\n\x19MovieRecommendationResult\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x12\n\nmood_label\x18\x02 \x01(\t\x12\x10\n\x08headline\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x1c\n\x05items\x18\x05 \x03(\x0b\x32\r.ai.MovieItem\"m\n PrecomputeRecommendationsRequest\x12\x30\n\x08requests\x18\x01 \x03(\x0b\x32\x1e.ai.MovieRecommendationRequest\x12\x17\n\x0fresults_per_key\x18\x02 \x01(\x05\"B\n\x1fPrecomputeRecommendationsResult\x12\x0e\n\x06queued\x18\x01 \x01(\x05\x12\x0f\n\x07pending\x18\x02 \x01(\x05\"_\n\x11MoodTrendsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12)\n\x0f\x64\x61ily_summaries\x18\x02 \x03(\x0b\x32\x10.ai.DailySummary\x12\x0e\n\x06window\x18\x03 \x01(\x05\"\x84\x01\n\x0eMoodTrendPoint\x12\x0c\n\x04\x64\x61te\x18\x01 \x01(\t\x12\x12\n\nmood_score\x18\x02 \x01(\x05\x12\x16\n\x0emoving_average\x18\x03 \x01(\x02\x12\x16\n\x0erolling_stddev\x18\x04 \x01(\x02\x12\x0f\n\x07z_score\x18\x05 \x01(\x02\x12\x0f\n\x07\x61nomaly\x18\x06 \x01(\x08\"?\n\x10MoodHistogramBin\x12\r\n\x05lower\x18\x01 \x01(\x05\x12\r\n\x05upper\x18\x02 \x01(\x05\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"\x94\x03\n\x10MoodTrendsResult\x12\x0c\n\x04\x64\x61ys\x18\x01 \x01(\x05\x12\x0f\n\x07\x61verage\x18\x02 \x01(\x02\x12\x12\n\nvolatility\x18\x03 \x01(\x02\x12\x13\n\x0btrend_slope\x18\x04 \x01(\x02\x12\x10\n\x08\x62\x65st_day\x18\x05 \x01(\t\x12\x11\n\tworst_day\x18\x06 \x01(\t\x12\x1f\n\x17longest_positive_streak\x18\x07 \x01(\x05\x12\x1f\n\x17longest_negative_streak\x18\x08 \x01(\x05\x12\x16\n\x0e\x63urrent_streak\x18\t \x01(\x05\x12\"\n\x06points\x18\n \x03(\x0b\x32\x12.ai.MoodTrendPoint\x12\'\n\thistogram\x18\x0b \x03(\x0b\x32\x14.ai.MoodHistogramBin\x12\x39\n\x0bmood_counts\x18\x0c \x03(\x0b\x32$.ai.MoodTrendsResult.MoodCountsEntry\x1a\x31\n\x0fMoodCountsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"M\n\x11\x43puProfileRequest\x12\x0f\n\x07seconds\x18\x01 \x01(\x02\x12\x11\n\tsample_hz\x18\x02 \x01(\x05\x12\x14\n\x0cinclude_idle\x18\x03 \x01(\x08\"O\n\x10\x43puProfileResult\x12\x18\n\x10\x63ollapsed_stacks\x18\x01 \x01(\t\x12\x0f\n\x07samples\x18\x02 \x01(\x05\x12\x10\n\x08\x64uration\x18\x03 \x01(\x02\"V\n\x15MemorySnapshotRequest\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\t\x12\x0b\n\x03top\x18\x02 \x01(\x05\x12\x10\n\x08group_by\x18\x03 \x01(\t\x12\x0e\n\x06\x66rames\x18\x04 \x01(\x05\"n\n\nMemoryStat\x12\x10\n\x08location\x18\x01 \x01(\t\x12\x12\n\nsize_bytes\x18\x02 \x01(\x03\x12\x17\n\x0fsize_diff_bytes\x18\x03 \x01(\x03\x12\r\n\x05\x63ount\x18\x04 \x01(\x05\x12\x12\n\ncount_diff\x18\x05 \x01(\x05\"\x82\x01\n\x14MemorySnapshotResult\x12\x0f\n\x07tracing\x18\x01 \x01(\x08\x12\x14\n\x0ctraced_bytes\x18\x02 \x01(\x03\x12\x12\n\npeak_bytes\x18\x03 \x01(\x03\x12\x10\n\x08has_diff\x18\x04 \x01(\x08\x12\x1d\n\x05stats\x18\x05 \x03(\x0b\x32\x0e.ai.MemoryStat2\xfa\x04\n\x11\x41IAnalysisService\x12<\n\x0c\x41nalyzeDaily\x12\x18.ai.DailyAnalysisRequest\x1a\x12.ai.AnalysisResult\x12\x44\n\x12\x41nalyzeDailyStream\x12\x18.ai.DailyAnalysisRequest\x1a\x12.ai.AnalysisResult0\x01\x12>\n\rAnalyzeWeekly\x12\x19.ai.WeeklyAnalysisRequest\x1a\x12.ai.AnalysisResult\x12\x39\n\nMoodTrends\x12\x15.ai.MoodTrendsRequest\x1a\x14.ai.MoodTrendsResult\x12\x46\n\x13\x41nalyzeWritingStyle\x12\x17.ai.WritingStyleRequest\x1a\x16.ai.WritingStyleResult\x12W\n\x14WritingStyleTimeline\x12\x1f.ai.WritingStyleTimelineRequest\x1a\x1e.ai.WritingStyleTimelineResult\x12X\n\x17GetMovieRecommendations\x12\x1e.ai.MovieRecommendationRequest\x1a\x1d.ai.MovieRecommendationResult\x12k\n\x1ePrecomputeMovieRecommendations\x12$.ai.PrecomputeRecommendationsRequest\x1a#.ai.PrecomputeRecommendationsResult2\x90\x01\n\x0c\x41\x64minService\x12\x39\n\nCpuProfile\x12\x15.ai.CpuProfileRequest\x1a\x14.ai.CpuProfileResult\x12\x45\n\x0eMemorySnapshot\x12\x19.ai.MemorySnapshotRequest\x1a\x18.ai.MemorySnapshotResultb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'ai_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_WRITINGSTYLERESULT_LANGUAGEBREAKDOWNENTRY']._loaded_options = None
+  _globals['_WRITINGSTYLERESULT_LANGUAGEBREAKDOWNENTRY']._serialized_options = b'8\001'
+  _globals['_MOODTRENDSRESULT_MOODCOUNTSENTRY']._loaded_options = None
+  _globals['_MOODTRENDSRESULT_MOODCOUNTSENTRY']._serialized_options = b'8\001'
   _globals['_DAILYANALYSISREQUEST']._serialized_start=16
   _globals['_DAILYANALYSISREQUEST']._serialized_end=101
   _globals['_WEEKLYANALYSISREQUEST']._serialized_start=103
@@ -40,19 +44,55 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_DAILYSUMMARY']._serialized_start=303
   _globals['_DAILYSUMMARY']._serialized_end=447
   _globals['_ANALYSISRESULT']._serialized_start=450
-  _globals['_ANALYSISRESULT']._serialized_end=583
-  _globals['_WRITINGSTYLEREQUEST']._serialized_start=585
-  _globals['_WRITINGSTYLEREQUEST']._serialized_end=638
-  _globals['_AUTHORMATCH']._serialized_start=640
-  _globals['_AUTHORMATCH']._serialized_end=742
-  _globals['_WRITINGSTYLERESULT']._serialized_start=745
-  _globals['_WRITINGSTYLERESULT']._serialized_end=1045
-  _globals['_MOVIERECOMMENDATIONREQUEST']._serialized_start=1048
-  _globals['_MOVIERECOMMENDATIONREQUEST']._serialized_end=1194
-  _globals['_MOVIEITEM']._serialized_start=1196
-  _globals['_MOVIEITEM']._serialized_end=1322
-  _globals['_MOVIERECOMMENDATIONRESULT']._serialized_start=1325
-  _globals['_MOVIERECOMMENDATIONRESULT']._serialized_end=1459
-  _globals['_AIANALYSISSERVICE']._serialized_start=1462
-  _globals['_AIANALYSISSERVICE']._serialized_end=1769
+  _globals['_ANALYSISRESULT']._serialized_end=604
+  _globals['_WRITINGSTYLEREQUEST']._serialized_start=606
+  _globals['_WRITINGSTYLEREQUEST']._serialized_end=659
+  _globals['_AUTHORMATCH']._serialized_start=661
+  _globals['_AUTHORMATCH']._serialized_end=763
+  _globals['_WRITINGSTYLERESULT']._serialized_start=766
+  _globals['_WRITINGSTYLERESULT']._serialized_end=1248
+  _globals['_WRITINGSTYLERESULT_LANGUAGEBREAKDOWNENTRY']._serialized_start=1192
+  _globals['_WRITINGSTYLERESULT_LANGUAGEBREAKDOWNENTRY']._serialized_end=1248
+  _globals['_DATEDTEXT']._serialized_start=1250
+  _globals['_DATEDTEXT']._serialized_end=1289
+  _globals['_WRITINGSTYLETIMELINEREQUEST']._serialized_start=1291
+  _globals['_WRITINGSTYLETIMELINEREQUEST']._serialized_end=1404
+  _globals['_WRITINGSTYLEWINDOW']._serialized_start=1406
+  _globals['_WRITINGSTYLEWINDOW']._serialized_end=1520
+  _globals['_WRITINGSTYLETIMELINERESULT']._serialized_start=1522
+  _globals['_WRITINGSTYLETIMELINERESULT']._serialized_end=1591
+  _globals['_MOVIERECOMMENDATIONREQUEST']._serialized_start=1594
+  _globals['_MOVIERECOMMENDATIONREQUEST']._serialized_end=1740
+  _globals['_MOVIEITEM']._serialized_start=1742
+  _globals['_MOVIEITEM']._serialized_end=1868
+  _globals['_MOVIERECOMMENDATIONRESULT']._serialized_start=1871
+  _globals['_MOVIERECOMMENDATIONRESULT']._serialized_end=2005
+  _globals['_PRECOMPUTERECOMMENDATIONSREQUEST']._serialized_start=2007
+  _globals['_PRECOMPUTERECOMMENDATIONSREQUEST']._serialized_end=2116
+  _globals['_PRECOMPUTERECOMMENDATIONSRESULT']._serialized_start=2118
+  _globals['_PRECOMPUTERECOMMENDATIONSRESULT']._serialized_end=2184
+  _globals['_MOODTRENDSREQUEST']._serialized_start=2186
+  _globals['_MOODTRENDSREQUEST']._serialized_end=2281
+  _globals['_MOODTRENDPOINT']._serialized_start=2284
+  _globals['_MOODTRENDPOINT']._serialized_end=2416
+  _globals['_MOODHISTOGRAMBIN']._serialized_start=2418
+  _globals['_MOODHISTOGRAMBIN']._serialized_end=2481
+  _globals['_MOODTRENDSRESULT']._serialized_start=2484
+  _globals['_MOODTRENDSRESULT']._serialized_end=2888
+  _globals['_MOODTRENDSRESULT_MOODCOUNTSENTRY']._serialized_start=2839
+  _globals['_MOODTRENDSRESULT_MOODCOUNTSENTRY']._serialized_end=2888
+  _globals['_CPUPROFILEREQUEST']._serialized_start=2890
+  _globals['_CPUPROFILEREQUEST']._serialized_end=2967
+  _globals['_CPUPROFILERESULT']._serialized_start=2969
+  _globals['_CPUPROFILERESULT']._serialized_end=3048
+  _globals['_MEMORYSNAPSHOTREQUEST']._serialized_start=3050
+  _globals['_MEMORYSNAPSHOTREQUEST']._serialized_end=3136
+  _globals['_MEMORYSTAT']._serialized_start=3138
+  _globals['_MEMORYSTAT']._serialized_end=3248
+  _globals['_MEMORYSNAPSHOTRESULT']._serialized_start=3251
+  _globals['_MEMORYSNAPSHOTRESULT']._serialized_end=3381
+  _globals['_AIANALYSISSERVICE']._serialized_start=3384
+  _globals['_AIANALYSISSERVICE']._serialized_end=4018
+  _globals['_ADMINSERVICE']._serialized_start=4021
+  _globals['_ADMINSERVICE']._serialized_end=4165
 # @@protoc_insertion_point(module_scope)
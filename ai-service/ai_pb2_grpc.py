@@ -40,21 +40,41 @@ class AIAnalysisServiceStub(object):
                 request_serializer=ai__pb2.DailyAnalysisRequest.SerializeToString,
                 response_deserializer=ai__pb2.AnalysisResult.FromString,
                 _registered_method=True)
+        self.AnalyzeDailyStream = channel.unary_stream(
+                '/ai.AIAnalysisService/AnalyzeDailyStream',
+                request_serializer=ai__pb2.DailyAnalysisRequest.SerializeToString,
+                response_deserializer=ai__pb2.AnalysisResult.FromString,
+                _registered_method=True)
         self.AnalyzeWeekly = channel.unary_unary(
                 '/ai.AIAnalysisService/AnalyzeWeekly',
                 request_serializer=ai__pb2.WeeklyAnalysisRequest.SerializeToString,
                 response_deserializer=ai__pb2.AnalysisResult.FromString,
                 _registered_method=True)
+        self.MoodTrends = channel.unary_unary(
+                '/ai.AIAnalysisService/MoodTrends',
+                request_serializer=ai__pb2.MoodTrendsRequest.SerializeToString,
+                response_deserializer=ai__pb2.MoodTrendsResult.FromString,
+                _registered_method=True)
         self.AnalyzeWritingStyle = channel.unary_unary(
                 '/ai.AIAnalysisService/AnalyzeWritingStyle',
                 request_serializer=ai__pb2.WritingStyleRequest.SerializeToString,
                 response_deserializer=ai__pb2.WritingStyleResult.FromString,
                 _registered_method=True)
+        self.WritingStyleTimeline = channel.unary_unary(
+                '/ai.AIAnalysisService/WritingStyleTimeline',
+                request_serializer=ai__pb2.WritingStyleTimelineRequest.SerializeToString,
+                response_deserializer=ai__pb2.WritingStyleTimelineResult.FromString,
+                _registered_method=True)
         self.GetMovieRecommendations = channel.unary_unary(
                 '/ai.AIAnalysisService/GetMovieRecommendations',
                 request_serializer=ai__pb2.MovieRecommendationRequest.SerializeToString,
                 response_deserializer=ai__pb2.MovieRecommendationResult.FromString,
                 _registered_method=True)
+        self.PrecomputeMovieRecommendations = channel.unary_unary(
+                '/ai.AIAnalysisService/PrecomputeMovieRecommendations',
+                request_serializer=ai__pb2.PrecomputeRecommendationsRequest.SerializeToString,
+                response_deserializer=ai__pb2.PrecomputeRecommendationsResult.FromString,
+                _registered_method=True)
 
 
 class AIAnalysisServiceServicer(object):
@@ -68,6 +88,13 @@ class AIAnalysisServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AnalyzeDailyStream(self, request, context):
+        """Stream a provisional local analysis first, then the full Gemini analysis
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AnalyzeWeekly(self, request, context):
         """Analyze a week based on daily summaries
         """
@@ -75,6 +102,13 @@ class AIAnalysisServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def MoodTrends(self, request, context):
+        """Numeric mood trends over daily summaries (no Gemini call)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AnalyzeWritingStyle(self, request, context):
         """Analyze writing style and find author doppelgänger
         """
@@ -82,6 +116,13 @@ class AIAnalysisServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def WritingStyleTimeline(self, request, context):
+        """Writing style and top author match per rolling week or month window
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetMovieRecommendations(self, request, context):
         """Get movie recommendations based on mood analysis
         """
@@ -89,6 +130,13 @@ class AIAnalysisServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PrecomputeMovieRecommendations(self, request, context):
+        """Queue low-priority batch generation of movie recommendations
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_AIAnalysisServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -97,21 +145,41 @@ def add_AIAnalysisServiceServicer_to_server(servicer, server):
                     request_deserializer=ai__pb2.DailyAnalysisRequest.FromString,
                     response_serializer=ai__pb2.AnalysisResult.SerializeToString,
             ),
+            'AnalyzeDailyStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.AnalyzeDailyStream,
+                    request_deserializer=ai__pb2.DailyAnalysisRequest.FromString,
+                    response_serializer=ai__pb2.AnalysisResult.SerializeToString,
+            ),
             'AnalyzeWeekly': grpc.unary_unary_rpc_method_handler(
                     servicer.AnalyzeWeekly,
                     request_deserializer=ai__pb2.WeeklyAnalysisRequest.FromString,
                     response_serializer=ai__pb2.AnalysisResult.SerializeToString,
             ),
+            'MoodTrends': grpc.unary_unary_rpc_method_handler(
+                    servicer.MoodTrends,
+                    request_deserializer=ai__pb2.MoodTrendsRequest.FromString,
+                    response_serializer=ai__pb2.MoodTrendsResult.SerializeToString,
+            ),
             'AnalyzeWritingStyle': grpc.unary_unary_rpc_method_handler(
                     servicer.AnalyzeWritingStyle,
                     request_deserializer=ai__pb2.WritingStyleRequest.FromString,
                     response_serializer=ai__pb2.WritingStyleResult.SerializeToString,
             ),
+            'WritingStyleTimeline': grpc.unary_unary_rpc_method_handler(
+                    servicer.WritingStyleTimeline,
+                    request_deserializer=ai__pb2.WritingStyleTimelineRequest.FromString,
+                    response_serializer=ai__pb2.WritingStyleTimelineResult.SerializeToString,
+            ),
             'GetMovieRecommendations': grpc.unary_unary_rpc_method_handler(
                     servicer.GetMovieRecommendations,
                     request_deserializer=ai__pb2.MovieRecommendationRequest.FromString,
                     response_serializer=ai__pb2.MovieRecommendationResult.SerializeToString,
             ),
+            'PrecomputeMovieRecommendations': grpc.unary_unary_rpc_method_handler(
+                    servicer.PrecomputeMovieRecommendations,
+                    request_deserializer=ai__pb2.PrecomputeRecommendationsRequest.FromString,
+                    response_serializer=ai__pb2.PrecomputeRecommendationsResult.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'ai.AIAnalysisService', rpc_method_handlers)
@@ -151,6 +219,33 @@ class AIAnalysisService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def AnalyzeDailyStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/ai.AIAnalysisService/AnalyzeDailyStream',
+            ai__pb2.DailyAnalysisRequest.SerializeToString,
+            ai__pb2.AnalysisResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def AnalyzeWeekly(request,
             target,
@@ -178,6 +273,33 @@ class AIAnalysisService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def MoodTrends(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ai.AIAnalysisService/MoodTrends',
+            ai__pb2.MoodTrendsRequest.SerializeToString,
+            ai__pb2.MoodTrendsResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def AnalyzeWritingStyle(request,
             target,
@@ -205,6 +327,33 @@ class AIAnalysisService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def WritingStyleTimeline(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ai.AIAnalysisService/WritingStyleTimeline',
+            ai__pb2.WritingStyleTimelineRequest.SerializeToString,
+            ai__pb2.WritingStyleTimelineResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetMovieRecommendations(request,
             target,
@@ -231,3 +380,150 @@ class AIAnalysisService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def PrecomputeMovieRecommendations(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ai.AIAnalysisService/PrecomputeMovieRecommendations',
+            ai__pb2.PrecomputeRecommendationsRequest.SerializeToString,
+            ai__pb2.PrecomputeRecommendationsResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+
+class AdminServiceStub(object):
+    """Admin-only diagnostics (requires the x-admin-token metadata header)
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.CpuProfile = channel.unary_unary(
+                '/ai.AdminService/CpuProfile',
+                request_serializer=ai__pb2.CpuProfileRequest.SerializeToString,
+                response_deserializer=ai__pb2.CpuProfileResult.FromString,
+                _registered_method=True)
+        self.MemorySnapshot = channel.unary_unary(
+                '/ai.AdminService/MemorySnapshot',
+                request_serializer=ai__pb2.MemorySnapshotRequest.SerializeToString,
+                response_deserializer=ai__pb2.MemorySnapshotResult.FromString,
+                _registered_method=True)
+
+
+class AdminServiceServicer(object):
+    """Admin-only diagnostics (requires the x-admin-token metadata header)
+    """
+
+    def CpuProfile(self, request, context):
+        """Sample the live server's Python stacks for a few seconds
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MemorySnapshot(self, request, context):
+        """Start/stop tracemalloc and take snapshots diffed against the previous one
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_AdminServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'CpuProfile': grpc.unary_unary_rpc_method_handler(
+                    servicer.CpuProfile,
+                    request_deserializer=ai__pb2.CpuProfileRequest.FromString,
+                    response_serializer=ai__pb2.CpuProfileResult.SerializeToString,
+            ),
+            'MemorySnapshot': grpc.unary_unary_rpc_method_handler(
+                    servicer.MemorySnapshot,
+                    request_deserializer=ai__pb2.MemorySnapshotRequest.FromString,
+                    response_serializer=ai__pb2.MemorySnapshotResult.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'ai.AdminService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('ai.AdminService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class AdminService(object):
+    """Admin-only diagnostics (requires the x-admin-token metadata header)
+    """
+
+    @staticmethod
+    def CpuProfile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ai.AdminService/CpuProfile',
+            ai__pb2.CpuProfileRequest.SerializeToString,
+            ai__pb2.CpuProfileResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def MemorySnapshot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ai.AdminService/MemorySnapshot',
+            ai__pb2.MemorySnapshotRequest.SerializeToString,
+            ai__pb2.MemorySnapshotResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,109 @@
+"""
+🔌 Circuit Breaker
+
+Guards a slow or flaky upstream (Gemini) with a rolling error-rate window.
+While the circuit is open, callers skip the upstream entirely and serve their
+fallback immediately. After a cool-off period a single probe request is let
+through; if it succeeds the circuit closes again.
+
+Slow calls count as failures, so an upstream that answers but takes too long
+trips the breaker just like one that errors.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker with half-open probing."""
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 60.0,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 8.0,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._calls = deque()  # (timestamp, failed)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if the caller may try the upstream right now."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+
+            if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+
+            # Half-open: let exactly one probe through at a time
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info(f"Circuit {self.name} half-open, sending probe request")
+                return True
+
+            return False
+
+    def release(self):
+        """Hand back an allowed call that never reached the upstream (nothing to record)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record(self, latency: float, ok: bool):
+        """Record the outcome of an upstream call that was allowed through."""
+        failed = not ok or latency > self.slow_call_seconds
+        now = time.monotonic()
+
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if failed:
+                    self._trip(now)
+                else:
+                    self._state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"Circuit {self.name} closed after successful probe")
+                return
+
+            self._calls.append((now, failed))
+            while self._calls and now - self._calls[0][0] > self.window_seconds:
+                self._calls.popleft()
+
+            if self._state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, f in self._calls if f)
+                if failures / len(self._calls) >= self.failure_rate_threshold:
+                    self._trip(now)
+
+    def _trip(self, now: float):
+        self._state = OPEN
+        self._opened_at = now
+        self._calls.clear()
+        logger.warning(f"Circuit {self.name} opened; skipping upstream for {self.open_seconds:.0f}s")
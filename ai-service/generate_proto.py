@@ -10,7 +10,7 @@ import os
 def main():
     # Get the directory of this script
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    proto_dir = os.path.join(script_dir, '..', 'shared', 'proto')
+    proto_dir = os.path.join(script_dir, 'proto')
     proto_file = os.path.join(proto_dir, 'ai.proto')
 
     if not os.path.exists(proto_file):
@@ -0,0 +1,94 @@
+"""
+🔎 Lexicon Matcher
+
+Matches a whole weighted lexicon against text in a single regex pass. The
+terms are folded into a character trie and compiled once into one pattern,
+so the cost per character stays flat as the lexicon grows to thousands of
+terms. At each position the longest term wins ("bersemangat" over
+"semangat"), and matches never overlap.
+
+Terms match whole words, optionally with common Indonesian and English
+affixes around them ("kesedihan", "sedihnya" and "sadness" hit "sedih" and
+"sad"), but never inside another word: "kesadaran", "enjoy" and "legal" do
+not hit "sad", "joy" or "lega".
+
+Lexicon files are tab-separated ``term  label  weight`` lines with ``#``
+comments. A term may appear on several lines with different labels.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Affixes a term may carry and still count as a hit. The prefix is lazy, so a
+# whole term ("menangis") wins over prefix + shorter term ("me" + "nangis").
+AFFIX_PREFIX = r'(?:ke|ber|ter|di|se|per|me|mem|men|meng)'
+AFFIX_SUFFIX = r'(?:an|kan|i|s|es|ed|ly|ness)?(?:nya|lah|kah|pun)?'
+
+
+def load_lexicon(path) -> dict:
+    """Read a lexicon file into ``{term: [(label, weight), ...]}``."""
+    lexicon = defaultdict(list)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                try:
+                    term, label, weight = line.split('\t')
+                    lexicon[term.lower()].append((label, float(weight)))
+                except ValueError:
+                    logger.warning(f"Skipping malformed lexicon line {line_no} in {path}")
+    except OSError as e:
+        logger.warning(f"Could not load lexicon from {Path(path).name}: {e}")
+    return dict(lexicon)
+
+
+def trie_pattern(terms) -> str:
+    """Build a regex that matches any of the terms, longest first."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = None  # end of term
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A shorter term ends here; the greedy optional keeps the longest match
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+
+    return build(trie)
+
+
+class LexiconMatcher:
+    """Score labels by the weighted lexicon terms found in text."""
+
+    def __init__(self, lexicon: dict):
+        self.lexicon = lexicon
+        self.pattern = re.compile(
+            rf'(?<![a-z]){AFFIX_PREFIX}??({trie_pattern(lexicon)}){AFFIX_SUFFIX}(?![a-z])'
+        ) if lexicon else None
+
+    def find(self, text: str) -> list:
+        """Return the lexicon terms found in text, in order."""
+        if not text or self.pattern is None:
+            return []
+        return self.pattern.findall(text.lower())
+
+    def scores(self, text: str, weight: float = 1.0, into: dict = None) -> dict:
+        """Add ``weight * term weight`` per hit to a ``{label: score}`` dict."""
+        totals = into if into is not None else defaultdict(float)
+        for term in self.find(text):
+            for label, term_weight in self.lexicon[term]:
+                totals[label] += weight * term_weight
+        return totals
@@ -0,0 +1,307 @@
+"""
+📊 Service Metrics
+
+A small Prometheus-compatible metrics registry (counters, gauges and
+histograms with labels) and an HTTP ``/metrics`` endpoint on a side port, in
+the standard text exposition format so any Prometheus server can scrape it.
+
+A gRPC server interceptor records request counts, status codes and latency
+for every RPC; the other service metrics are declared at the bottom of this
+module and updated where the work happens.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function):
+        """Read the (unlabelled) value from a callable at scrape time."""
+        self._function = function
+
+    def render(self) -> list:
+        if self._function is not None:
+            try:
+                self.set(self._function())
+            except Exception as e:
+                logger.debug(f"Gauge {self.name} callback failed: {e}")
+        return super().render()
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (),
+                  buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ============================================
+# HTTP endpoint
+# ============================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on a daemon thread."""
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    httpd = ThreadingHTTPServer(('', port), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name='metrics-http', daemon=True).start()
+    logger.info(f"Metrics endpoint listening on port {port} (/metrics)")
+    return httpd
+
+
+# ============================================
+# Service metrics
+# ============================================
+
+RPC_REQUESTS = REGISTRY.counter(
+    'ai_rpc_requests_total', 'RPCs handled, by method and status code', ('method', 'code'))
+RPC_DURATION = REGISTRY.histogram(
+    'ai_rpc_duration_seconds', 'RPC handling time', ('method',))
+THREADPOOL_QUEUE_DEPTH = REGISTRY.gauge(
+    'ai_threadpool_queue_depth', 'RPCs waiting for a worker thread')
+
+GEMINI_REQUESTS = REGISTRY.counter(
+    'ai_gemini_requests_total', 'Gemini calls, by model and outcome', ('model', 'outcome'))
+GEMINI_DURATION = REGISTRY.histogram(
+    'ai_gemini_request_duration_seconds', 'Gemini call latency', ('model',))
+GEMINI_PROMPT_CHARS = REGISTRY.histogram(
+    'ai_gemini_prompt_chars', 'Prompt size sent to Gemini', ('rpc',), SIZE_BUCKETS)
+GEMINI_RESPONSE_CHARS = REGISTRY.histogram(
+    'ai_gemini_response_chars', 'Response size received from Gemini', ('rpc',), SIZE_BUCKETS)
+
+MOVIE_RECOMMENDATION_SOURCE = REGISTRY.counter(
+    'ai_movie_recommendations_total', 'Movie recommendations served, by source', ('source',))
+
+WRITING_STYLE_INPUT_CHARS = REGISTRY.histogram(
+    'ai_writing_style_input_chars', 'Text size passed to analyze_text', (), SIZE_BUCKETS)
+WRITING_STYLE_DURATION = REGISTRY.histogram(
+    'ai_writing_style_analysis_seconds', 'analyze_text duration')
+
+AFFINITY_ROUTED = REGISTRY.counter(
+    'ai_affinity_routed_total', 'RPCs forwarded by the affinity router, by node and route', ('node', 'route'))
+AFFINITY_NODE_HEALTHY = REGISTRY.gauge(
+    'ai_affinity_node_healthy', 'Affinity router view of node health (1 = healthy)', ('node',))
+
+
+# ============================================
+# gRPC interceptor
+# ============================================
+
+def _status_name(context, failed: bool) -> str:
+    """Status set by the handler (or by abort); otherwise OK, or UNKNOWN if it raised."""
+    code = context.code()
+    if isinstance(code, grpc.StatusCode):
+        return code.name
+    return 'UNKNOWN' if failed else 'OK'
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Counts RPCs by status code and times them."""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        method = handler_call_details.method.rsplit('/', 1)[-1]
+
+        if handler.unary_unary:
+            behavior = handler.unary_unary
+
+            def unary_unary(request, context):
+                start = time.perf_counter()
+                failed = True
+                try:
+                    response = behavior(request, context)
+                    failed = False
+                    return response
+                finally:
+                    RPC_DURATION.observe(time.perf_counter() - start, method=method)
+                    RPC_REQUESTS.inc(method=method, code=_status_name(context, failed))
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        if handler.unary_stream:
+            behavior = handler.unary_stream
+
+            def unary_stream(request, context):
+                start = time.perf_counter()
+                failed = True
+                try:
+                    yield from behavior(request, context)
+                    failed = False
+                finally:
+                    RPC_DURATION.observe(time.perf_counter() - start, method=method)
+                    RPC_REQUESTS.inc(method=method, code=_status_name(context, failed))
+
+            return grpc.unary_stream_rpc_method_handler(
+                unary_stream,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
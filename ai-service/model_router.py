@@ -0,0 +1,279 @@
+"""
+🧭 Gemini Model Router
+
+Routes every generation call to one of several configured Gemini models.
+Short, cheap prompts go to the lightest model, long prompts and weekly
+reports go to the full model. Per-model latency and error rates are tracked
+as EWMAs, so a model that degrades is put in cooldown and traffic fails over
+to the next healthy model automatically.
+
+The router exposes the same ``generate_content`` call as
+``genai.GenerativeModel``, so it can be passed anywhere a model is expected.
+An optional requests-per-minute budget is shared by every caller; when it is
+spent, ``generate_content`` raises ``BudgetExhausted`` instead of calling out.
+
+The Gemini SDK is most of the service's import time, so it is only imported
+when the first model is needed (or when ``connect`` warms it up in the
+background after the server has started listening).
+"""
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from metrics import (
+    GEMINI_DURATION,
+    GEMINI_PROMPT_CHARS,
+    GEMINI_REQUESTS,
+    GEMINI_RESPONSE_CHARS,
+)
+from rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# RPCs that always go to the full (last configured) model
+HEAVY_RPCS = {'AnalyzeWeekly'}
+
+
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def load_genai(api_key: str = ''):
+    """Import (and configure) ``google.generativeai`` on first use."""
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                start = time.monotonic()
+                import google.generativeai as genai
+                if api_key:
+                    genai.configure(api_key=api_key)
+                _genai = genai
+                logger.info(f"Loaded Gemini SDK in {time.monotonic() - start:.2f}s")
+    return _genai
+
+
+class BudgetExhausted(Exception):
+    """Raised when the shared Gemini request budget is spent."""
+
+
+@dataclass
+class ModelStats:
+    latency_ewma: float = 0.0     # seconds per call
+    error_ewma: float = 0.0       # 0-1, recent failure rate
+    calls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0   # monotonic timestamp
+
+
+class ModelRouter:
+    """Pick a Gemini model per call based on prompt size, RPC and model health."""
+
+    def __init__(
+        self,
+        model_names: list,
+        light_prompt_chars: int = 2000,
+        latency_budget: float = 10.0,
+        error_threshold: float = 0.5,
+        max_consecutive_failures: int = 3,
+        cooldown_seconds: float = 30.0,
+        alpha: float = 0.2,
+        max_attempts: int = 2,
+        rpm_limit: float = 0,
+        api_key: str = '',
+    ):
+        if not model_names:
+            raise ValueError("ModelRouter needs at least one model")
+
+        # Ordered from lightest to heaviest
+        self.model_names = list(dict.fromkeys(model_names))
+        self.models = {}  # created on first use, see model()
+        self.api_key = api_key
+        self.stats = {name: ModelStats() for name in self.model_names}
+
+        self.light_prompt_chars = light_prompt_chars
+        self.latency_budget = latency_budget
+        self.error_threshold = error_threshold
+        self.max_consecutive_failures = max_consecutive_failures
+        self.cooldown_seconds = cooldown_seconds
+        self.alpha = alpha
+        self.max_attempts = max_attempts
+        self.limiter = TokenBucket(rpm_limit) if rpm_limit > 0 else None
+
+        self._lock = threading.Lock()
+
+    def model(self, name: str):
+        """The ``GenerativeModel`` for ``name``, loading the SDK if needed."""
+        model = self.models.get(name)
+        if model is None:
+            genai = load_genai(self.api_key)
+            with self._lock:
+                model = self.models.setdefault(name, genai.GenerativeModel(name))
+        return model
+
+    def _ping(self, name: str, timeout: float):
+        try:
+            self.model(name).count_tokens('ping', request_options={'timeout': timeout})
+        except Exception as e:
+            logger.warning(f"Could not pre-connect to Gemini model {name}: {e}")
+
+    def connect(self, timeout: float = 5.0) -> bool:
+        """Open the upstream connections (including TLS) with a free ``count_tokens`` call per model.
+
+        Waits at most ``timeout`` overall; the SDK does not always honour its own
+        deadline while the channel is still resolving. Returns False if calls are
+        still pending.
+        """
+        threads = [
+            threading.Thread(target=self._ping, args=(name, timeout), name=f'connect-{name}', daemon=True)
+            for name in self.model_names
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        pending = [t.name for t in threads if t.is_alive()]
+        if pending:
+            logger.warning(f"Gemini pre-connect still pending after {timeout:.0f}s, continuing without it")
+        return not pending
+
+    def preferred_tier(self, prompt: str, rpc: str = '') -> int:
+        """Return the index of the model that best fits the prompt."""
+        heaviest = len(self.model_names) - 1
+        if rpc in HEAVY_RPCS:
+            return heaviest
+        return min(heaviest, len(prompt) // max(1, self.light_prompt_chars))
+
+    def has_budget(self, reserve: float = 0.0) -> bool:
+        """True if a call can be made while leaving ``reserve`` requests for others."""
+        return self.limiter is None or self.limiter.available() >= 1 + reserve
+
+    def is_degraded(self, name: str, now: Optional[float] = None) -> bool:
+        """A model is degraded while it sits in cooldown."""
+        now = now if now is not None else time.monotonic()
+        return self.stats[name].cooldown_until > now
+
+    def candidates(self, prompt: str, rpc: str = '') -> list:
+        """Return model names in the order they should be tried."""
+        preferred = self.preferred_tier(prompt, rpc)
+        now = time.monotonic()
+
+        def cost(item):
+            tier, name = item
+            stats = self.stats[name]
+            penalty = 100.0 if self.is_degraded(name, now) else 0.0
+            # Tier distance dominates; latency and errors break ties and
+            # push traffic away from a model before it is fully degraded
+            return (
+                penalty
+                + abs(tier - preferred)
+                + stats.latency_ewma / self.latency_budget
+                + stats.error_ewma
+                - tier * 1e-3  # prefer the heavier model on exact ties
+            )
+
+        with self._lock:
+            self._end_expired_cooldowns(now)
+            ranked = sorted(enumerate(self.model_names), key=cost)
+        return [name for _, name in ranked]
+
+    def generate_content(self, contents, generation_config=None, rpc: str = '', **kwargs):
+        """Generate content on the best available model, failing over on errors."""
+        prompt = contents if isinstance(contents, str) else str(contents)
+        last_error = None
+
+        if self.limiter and not self.limiter.try_acquire():
+            GEMINI_REQUESTS.inc(model='none', outcome='budget_exhausted')
+            raise BudgetExhausted("Gemini request budget exhausted")
+
+        GEMINI_PROMPT_CHARS.observe(len(prompt), rpc=rpc or 'other')
+        for name in self.candidates(prompt, rpc)[:self.max_attempts]:
+            start = time.monotonic()
+            try:
+                response = self.model(name).generate_content(
+                    contents, generation_config=generation_config, **kwargs
+                )
+            except Exception as e:
+                self.record(name, time.monotonic() - start, ok=False)
+                logger.warning(f"Gemini model {name} failed for {rpc or 'request'}: {e}")
+                last_error = e
+                continue
+
+            self.record(name, time.monotonic() - start, ok=True)
+            GEMINI_RESPONSE_CHARS.observe(len(getattr(response, 'text', '') or ''), rpc=rpc or 'other')
+            logger.debug(f"Routed {rpc or 'request'} ({len(prompt)} chars) to {name}")
+            return response
+
+        raise last_error
+
+    def record(self, name: str, latency: float, ok: bool):
+        """Update the EWMAs for a model after a call."""
+        GEMINI_DURATION.observe(latency, model=name)
+        GEMINI_REQUESTS.inc(model=name, outcome='ok' if ok else 'error')
+
+        now = time.monotonic()
+        with self._lock:
+            stats = self.stats[name]
+            stats.calls += 1
+            if stats.calls == 1:
+                stats.latency_ewma = latency
+            else:
+                stats.latency_ewma += self.alpha * (latency - stats.latency_ewma)
+            stats.error_ewma += self.alpha * ((0.0 if ok else 1.0) - stats.error_ewma)
+
+            if ok:
+                stats.consecutive_failures = 0
+            else:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+
+            degraded = (
+                stats.consecutive_failures >= self.max_consecutive_failures
+                or stats.error_ewma >= self.error_threshold
+                or stats.latency_ewma > self.latency_budget
+            )
+            if degraded and stats.cooldown_until <= now:
+                stats.cooldown_until = now + self.cooldown_seconds
+                logger.warning(
+                    f"Gemini model {name} degraded (latency {stats.latency_ewma:.2f}s, "
+                    f"errors {stats.error_ewma:.0%}); cooling down for {self.cooldown_seconds:.0f}s"
+                )
+
+    def snapshot(self) -> dict:
+        """Learned per-model statistics, with cooldowns as remaining seconds."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {**asdict(stats), 'cooldown_until': max(0.0, stats.cooldown_until - now)}
+                for name, stats in self.stats.items()
+            }
+
+    def restore(self, snapshot: dict, elapsed: float = 0.0) -> int:
+        """Load statistics from ``snapshot`` taken ``elapsed`` seconds ago; unknown models are skipped."""
+        now = time.monotonic()
+        restored = 0
+        with self._lock:
+            for name, data in snapshot.items():
+                if name not in self.stats:
+                    continue
+                stats = ModelStats(**data)
+                remaining = stats.cooldown_until - elapsed
+                stats.cooldown_until = now + remaining if remaining > 0 else 0.0
+                self.stats[name] = stats
+                restored += 1
+        return restored
+
+    def _end_expired_cooldowns(self, now: float):
+        """Give models a fresh start once their cooldown has elapsed."""
+        for name, stats in self.stats.items():
+            if stats.cooldown_until and stats.cooldown_until <= now:
+                stats.cooldown_until = 0.0
+                stats.consecutive_failures = 0
+                stats.error_ewma = 0.0
+                stats.latency_ewma = min(stats.latency_ewma, self.latency_budget / 2)
+                logger.info(f"Gemini model {name} back in rotation")
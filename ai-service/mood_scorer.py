@@ -0,0 +1,188 @@
+"""
+⚡ Provisional Mood Scorer
+
+Scores a day's journal notes locally, without Gemini, in well under a
+millisecond. Uses a weighted Indonesian/English sentiment lexicon with
+negation ("tidak senang") and intensifiers ("senang banget"), plus the mood
+category lexicon to name the dominant mood.
+
+The result is a provisional ``AnalysisResult``-shaped dict: returned directly
+when the LLM is unavailable or out of budget, or sent as the first message of
+a streaming daily analysis while Gemini is still working.
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from lexicon_matcher import load_lexicon
+from movie_recommendations import category_keywords, get_mood_matcher
+
+SENTIMENT_LEXICON_PATH = os.getenv(
+    'SENTIMENT_LEXICON_PATH', str(Path(__file__).parent / 'data' / 'sentiment_lexicon.tsv')
+)
+
+# Negation covers this many following tokens
+NEGATION_SCOPE = 3
+# Negated terms flip sign and lose some strength ("tidak senang" is not "sedih")
+NEGATION_FACTOR = -0.7
+# Intensifiers that follow the word they modify ("senang banget")
+POSTFIX_INTENSIFIERS = {'banget', 'bgt', 'sekali'}
+# Squashing constant for mapping the raw sum into (-1, 1)
+NORMALIZATION_ALPHA = 15.0
+
+# Words, plus runs of sentence/line breaks, which end negation and intensifier reach
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:['-][a-z]+)*|[.!?;\n]+")
+
+# Indonesian label for each mood category
+CATEGORY_MOODS = {
+    'joyful': 'bahagia',
+    'comfort': 'sedih',
+    'grounding': 'cemas',
+    'reflective': 'tenang',
+    'motivational': 'termotivasi',
+}
+
+CATEGORY_ADVICE = {
+    'joyful': 'Catat hal-hal yang membuatmu senang hari ini agar bisa diulang.',
+    'comfort': 'Beri dirimu waktu istirahat dan ceritakan perasaanmu pada orang terdekat.',
+    'grounding': 'Coba tarik napas dalam beberapa kali dan tulis satu hal yang bisa kamu kendalikan.',
+    'reflective': 'Nikmati ketenangan ini dan tuliskan apa yang sedang kamu renungkan.',
+    'motivational': 'Pecah targetmu menjadi langkah kecil dan rayakan setiap kemajuan.',
+}
+
+
+def _load_sentiment_lexicon(path) -> tuple:
+    sentiment, negators, intensifiers = {}, set(), {}
+    for term, labels in load_lexicon(path).items():
+        for label, weight in labels:
+            if label == 'sentiment':
+                sentiment[term] = weight
+            elif label == 'negator':
+                negators.add(term)
+            elif label == 'intensifier':
+                intensifiers[term] = weight
+    return sentiment, negators, intensifiers
+
+
+@lru_cache(maxsize=None)
+def sentiment_lexicon() -> tuple:
+    """``(weights, negators, intensifiers)``, loaded on first use."""
+    return _load_sentiment_lexicon(SENTIMENT_LEXICON_PATH)
+
+
+@dataclass
+class SentimentScore:
+    total: float = 0.0
+    positive_terms: list = field(default_factory=list)
+    negative_terms: list = field(default_factory=list)
+
+    @property
+    def compound(self) -> float:
+        """Raw sum squashed into (-1, 1)."""
+        return self.total / math.sqrt(self.total * self.total + NORMALIZATION_ALPHA)
+
+    @property
+    def mood_score(self) -> int:
+        """Compound mapped onto the 0-100 mood scale."""
+        return max(1, min(100, round(50 + 50 * self.compound)))
+
+
+def score_sentiment(text: str) -> SentimentScore:
+    """Score text with the sentiment lexicon, handling negation and intensifiers."""
+    result = SentimentScore()
+    tokens = TOKEN_PATTERN.findall(text.lower()) if text else []
+    weights, negators, intensifiers = sentiment_lexicon()
+
+    negated_until = -1
+    boost, boost_at = 1.0, -2  # prefix intensifier and its token index
+    last_contribution = 0.0
+    last_end = -2  # index of the last token of the previous sentiment term
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if not token[0].isalpha():
+            negated_until = -1
+            i += 1
+            continue
+
+        # Two-word terms ("patah hati") take precedence over single words
+        bigram = f"{token} {tokens[i + 1]}" if i + 1 < len(tokens) else None
+        # A prefix intensifier only reaches the next token, or past a negator ("sangat tidak senang")
+        term_boost = boost if boost_at == i - 1 else 1.0
+        if bigram in weights:
+            term, weight, i = bigram, weights[bigram], i + 1
+        elif token in weights:
+            term, weight = token, weights[token]
+        else:
+            if token in negators:
+                negated_until = i + NEGATION_SCOPE
+                if boost_at == i - 1:
+                    boost_at = i
+            elif token in intensifiers:
+                if token in POSTFIX_INTENSIFIERS and last_end == i - 1:
+                    extra = last_contribution * (intensifiers[token] - 1)
+                    result.total += extra
+                    last_contribution = 0.0
+                else:
+                    boost, boost_at = intensifiers[token], i
+            i += 1
+            continue
+
+        contribution = weight * term_boost
+        if i <= negated_until:
+            contribution *= NEGATION_FACTOR
+            term = f"tidak {term}"
+        result.total += contribution
+        (result.positive_terms if contribution > 0 else result.negative_terms).append(term)
+
+        last_contribution = contribution
+        last_end = i
+        i += 1
+
+    return result
+
+
+def provisional_analysis(notes: list, date: str) -> dict:
+    """Build a provisional analysis dict (same shape as the Gemini response)."""
+    if not notes:
+        return {
+            "summary": f"Tidak ada catatan yang ditulis pada {date}.",
+            "dominantMood": "netral",
+            "moodScore": 50,
+            "highlights": [],
+            "advice": ["Luangkan beberapa menit untuk menulis apa yang kamu rasakan hari ini."],
+            "affirmation": "Setiap hari adalah kesempatan baru untuk mengenal dirimu.",
+        }
+
+    text = "\n".join(f"{note.title or ''}\n{note.body or ''}" for note in notes)
+    sentiment = score_sentiment(text)
+    mood_score = sentiment.mood_score
+
+    categories = get_mood_matcher().scores(text)
+    if categories:
+        order = list(category_keywords())
+        category = max(categories, key=lambda c: (categories[c], -order.index(c) if c in order else 0))
+        dominant_mood = CATEGORY_MOODS.get(category, 'netral')
+    else:
+        category = None
+        dominant_mood = 'senang' if mood_score >= 65 else 'sedih' if mood_score <= 35 else 'netral'
+
+    highlights = []
+    if sentiment.positive_terms:
+        highlights.append(f"Nuansa positif: {', '.join(dict.fromkeys(sentiment.positive_terms[:5]))}")
+    if sentiment.negative_terms:
+        highlights.append(f"Nuansa berat: {', '.join(dict.fromkeys(sentiment.negative_terms[:5]))}")
+
+    return {
+        "summary": f"Analisis sementara dari {len(notes)} catatan pada {date}; "
+                   f"mood cenderung {dominant_mood}. Analisis lengkap sedang disiapkan.",
+        "dominantMood": dominant_mood,
+        "moodScore": mood_score,
+        "highlights": highlights,
+        "advice": [CATEGORY_ADVICE[category]] if category in CATEGORY_ADVICE else [],
+        "affirmation": "Perasaanmu valid, dan kamu sudah melakukan yang terbaik hari ini.",
+    }
@@ -0,0 +1,152 @@
+"""
+📈 Mood Trend Analytics
+
+Numeric trend analysis over a series of daily summaries, with no LLM call:
+rolling averages and volatility, least-squares trend slope, anomaly flags,
+positive/negative streaks and a mood-score histogram. Everything is computed
+with vectorized NumPy in a single pass over the series, so months or years of
+history return in milliseconds.
+
+Days with a mood score of 0 (unknown) or without a date are left out of the
+numeric series.
+Rolling windows span calendar days, so a window over a gap in journaling
+holds fewer entries rather than reaching further back.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Days at or above / at or below these scores count towards streaks
+POSITIVE_THRESHOLD = 60
+NEGATIVE_THRESHOLD = 40
+# |z| above this (against the previous window) flags a day as an anomaly
+ANOMALY_Z = 2.0
+# Minimum entries in the previous window before anomalies are flagged
+MIN_ANOMALY_HISTORY = 3
+HISTOGRAM_BINS = 10
+
+
+@dataclass
+class MoodTrends:
+    days: int
+    average: float
+    volatility: float           # stddev of day-to-day changes
+    trend_slope: float          # mood points per calendar day
+    best_day: str
+    worst_day: str
+    longest_positive_streak: int
+    longest_negative_streak: int
+    current_streak: int         # > 0 positive run, < 0 negative run
+    dates: list = field(default_factory=list)
+    scores: np.ndarray = None
+    moving_average: np.ndarray = None
+    rolling_stddev: np.ndarray = None
+    z_scores: np.ndarray = None
+    anomalies: np.ndarray = None
+    histogram: list = field(default_factory=list)    # (lower, upper, count)
+    mood_counts: dict = field(default_factory=dict)
+
+
+def rolling_mean_std(values: np.ndarray, start: np.ndarray, end: np.ndarray) -> tuple:
+    """Mean and stddev of ``values[start[i]:end[i]]`` for every i (0 where empty)."""
+    c1 = np.concatenate(([0.0], np.cumsum(values)))
+    c2 = np.concatenate(([0.0], np.cumsum(values * values)))
+
+    count = end - start
+    safe = np.maximum(count, 1)
+    mean = np.where(count > 0, (c1[end] - c1[start]) / safe, 0.0)
+    variance = np.where(count > 0, np.maximum((c2[end] - c2[start]) / safe - mean * mean, 0.0), 0.0)
+    return mean, np.sqrt(variance)
+
+
+def longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True values."""
+    if not mask.any():
+        return 0
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def trailing_run(mask: np.ndarray) -> int:
+    """Length of the run of True values ending at the last element."""
+    if len(mask) == 0 or not mask[-1]:
+        return 0
+    falses = np.flatnonzero(~mask)
+    return int(len(mask) - (falses[-1] + 1 if len(falses) else 0))
+
+
+def compute_mood_trends(summaries: list, window: int = 7) -> MoodTrends:
+    """Compute trend analytics from objects with date, mood_score and dominant_mood.
+
+    ``window`` is in calendar days (entries, if the dates do not parse).
+    """
+    window = max(1, window)
+    mood_counts = Counter(
+        s.dominant_mood.strip().lower() for s in summaries if s.dominant_mood and s.dominant_mood.strip()
+    )
+
+    known = sorted((s.date.strip(), s.mood_score) for s in summaries if s.mood_score > 0 and s.date.strip())
+    if not known:
+        return MoodTrends(0, 0.0, 0.0, 0.0, '', '', 0, 0, 0, mood_counts=dict(mood_counts))
+
+    dates = [d for d, _ in known]
+    scores = np.fromiter((score for _, score in known), dtype=np.float64, count=len(known))
+    n = len(scores)
+
+    try:
+        parsed = np.array(dates, dtype='datetime64[D]')
+    except ValueError:
+        parsed = None
+    # "NaT" parses without error but cannot be placed on the calendar either
+    if parsed is not None and not np.isnat(parsed).any():
+        offsets = (parsed - parsed[0]).astype(np.float64)
+    else:
+        offsets = np.arange(n, dtype=np.float64)
+
+    # Trailing window: the entries of the last `window` days, up to and including each day
+    index = np.arange(n)
+    moving_average, rolling_stddev = rolling_mean_std(
+        scores, np.searchsorted(offsets, offsets - window, side='right'), index + 1
+    )
+
+    # Anomalies: compare each day with the `window` days that precede it, but
+    # never fewer days than could hold MIN_ANOMALY_HISTORY entries
+    history_start = np.searchsorted(offsets, offsets - max(window, MIN_ANOMALY_HISTORY), side='left')
+    prev_mean, prev_std = rolling_mean_std(scores, history_start, index)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_scores = np.where(prev_std > 0, (scores - prev_mean) / prev_std, 0.0)
+    z_scores = np.nan_to_num(z_scores)
+    anomalies = (np.abs(z_scores) > ANOMALY_Z) & (index - history_start >= MIN_ANOMALY_HISTORY)
+
+    # Slope against calendar days, so gaps in journaling do not distort it
+    trend_slope = float(np.polyfit(offsets, scores, 1)[0]) if n > 1 and np.ptp(offsets) > 0 else 0.0
+
+    positive = scores >= POSITIVE_THRESHOLD
+    negative = scores <= NEGATIVE_THRESHOLD
+    current_streak = trailing_run(positive) or -trailing_run(negative)
+
+    counts, edges = np.histogram(scores, bins=HISTOGRAM_BINS, range=(0, 100))
+    histogram = [(int(edges[i]), int(edges[i + 1]), int(counts[i])) for i in range(HISTOGRAM_BINS)]
+
+    return MoodTrends(
+        days=n,
+        average=float(scores.mean()),
+        volatility=float(np.diff(scores).std()) if n > 1 else 0.0,
+        trend_slope=trend_slope,
+        best_day=dates[int(scores.argmax())],
+        worst_day=dates[int(scores.argmin())],
+        longest_positive_streak=longest_run(positive),
+        longest_negative_streak=longest_run(negative),
+        current_streak=current_streak,
+        dates=dates,
+        scores=scores,
+        moving_average=moving_average,
+        rolling_stddev=rolling_stddev,
+        z_scores=z_scores,
+        anomalies=anomalies,
+        histogram=histogram,
+        mood_counts=dict(mood_counts),
+    )
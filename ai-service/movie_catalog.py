@@ -0,0 +1,153 @@
+"""
+🎞️ Local Movie Catalog
+
+Indexed catalog of films for the offline (non-AI) recommendation path.
+Films are loaded once from a compact TSV file into inverted indexes by
+category, genre, decade and mood tag, and selection uses maximal marginal
+relevance (MMR) so the three picks differ in genre and era.
+
+File format (tab-separated, ``|`` inside multi-value columns, ``#`` comments):
+    title  year  imdb_id  genres  categories  mood_tags  tagline
+"""
+
+import logging
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent / 'data' / 'movie_catalog.tsv'
+
+# Candidates kept (by relevance) before the MMR pass
+MMR_POOL_SIZE = 40
+
+
+@dataclass(frozen=True)
+class CatalogMovie:
+    title: str
+    year: int
+    imdb_id: Optional[str]
+    genres: frozenset
+    genre_list: tuple  # original order, for display
+    categories: tuple
+    mood_tags: frozenset
+    tagline: str
+
+    @property
+    def decade(self) -> int:
+        return self.year // 10 * 10
+
+
+class MovieCatalog:
+    """In-memory catalog with inverted indexes and diversity-aware selection."""
+
+    def __init__(self, movies: list):
+        self.movies = movies
+        self.by_category = defaultdict(set)
+        self.by_genre = defaultdict(set)
+        self.by_decade = defaultdict(set)
+        self.by_tag = defaultdict(set)
+
+        for idx, movie in enumerate(movies):
+            for category in movie.categories:
+                self.by_category[category].add(idx)
+            for genre in movie.genres:
+                self.by_genre[genre.lower()].add(idx)
+            for tag in movie.mood_tags:
+                self.by_tag[tag].add(idx)
+            self.by_decade[movie.decade].add(idx)
+
+    @classmethod
+    def load(cls, path=DEFAULT_CATALOG_PATH) -> 'MovieCatalog':
+        """Load a catalog file. A missing or unreadable file yields an empty catalog."""
+        movies = []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.rstrip('\n')
+                    if not line or line.startswith('#'):
+                        continue
+                    try:
+                        title, year, imdb_id, genres, categories, tags, tagline = line.split('\t')
+                        genre_list = tuple(g for g in genres.split('|') if g)
+                        movies.append(CatalogMovie(
+                            title=title,
+                            year=int(year),
+                            imdb_id=imdb_id or None,
+                            genres=frozenset(genre_list),
+                            genre_list=genre_list,
+                            categories=tuple(c for c in categories.split('|') if c),
+                            mood_tags=frozenset(t for t in tags.split('|') if t),
+                            tagline=tagline,
+                        ))
+                    except ValueError:
+                        logger.warning(f"Skipping malformed catalog line {line_no} in {path}")
+        except OSError as e:
+            logger.warning(f"Could not load movie catalog from {path}: {e}")
+
+        logger.info(f"Loaded {len(movies)} movies into the local catalog")
+        return cls(movies)
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def query(self, category: str = None, genre: str = None,
+              decade: int = None, tag: str = None) -> set:
+        """Return indexes of movies matching every given filter."""
+        filters = []
+        if category is not None:
+            filters.append(self.by_category.get(category, set()))
+        if genre is not None:
+            filters.append(self.by_genre.get(genre.lower(), set()))
+        if decade is not None:
+            filters.append(self.by_decade.get(decade, set()))
+        if tag is not None:
+            filters.append(self.by_tag.get(tag, set()))
+
+        if not filters:
+            return set(range(len(self.movies)))
+        filters.sort(key=len)
+        return set.intersection(*filters)
+
+    def select(self, category: str, mood_tags: set = frozenset(), k: int = 3,
+               diversity: float = 0.6, rng: random.Random = None) -> list:
+        """
+        Pick k movies for a category using maximal marginal relevance.
+
+        Relevance rewards overlap with the requested mood tags, with a little
+        random jitter so repeated requests see different films. Similarity
+        between picks combines genre overlap and same-decade.
+        """
+        rng = rng or random
+        candidates = self.query(category=category)
+        if not candidates:
+            return []
+
+        relevance = {}
+        for idx in candidates:
+            overlap = len(self.movies[idx].mood_tags & mood_tags) if mood_tags else 0
+            relevance[idx] = 1.0 + 0.3 * overlap + rng.random() * 0.5
+
+        pool = sorted(candidates, key=relevance.__getitem__, reverse=True)[:MMR_POOL_SIZE]
+        selected = []
+
+        while pool and len(selected) < k:
+            best_idx, best_score = None, None
+            for idx in pool:
+                redundancy = max((self._similarity(idx, s) for s in selected), default=0.0)
+                score = (1 - diversity) * relevance[idx] - diversity * redundancy
+                if best_score is None or score > best_score:
+                    best_idx, best_score = idx, score
+            selected.append(best_idx)
+            pool.remove(best_idx)
+
+        return [self.movies[idx] for idx in selected]
+
+    def _similarity(self, a: int, b: int) -> float:
+        first, second = self.movies[a], self.movies[b]
+        union = len(first.genres | second.genres)
+        genre_sim = len(first.genres & second.genres) / union if union else 0.0
+        return 0.7 * genre_sim + 0.3 * (first.decade == second.decade)
@@ -6,15 +6,49 @@ Uses Google Gemini API for AI-powered suggestions with fallback to curated lists
 """
 
 import os
+import re
 import json
+import time
 import logging
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 
-import google.generativeai as genai
+from circuit_breaker import CircuitBreaker
+from lexicon_matcher import LexiconMatcher, load_lexicon
+from metrics import MOVIE_RECOMMENDATION_SOURCE
+from model_router import BudgetExhausted
+from movie_catalog import DEFAULT_CATALOG_PATH, MovieCatalog
+from recommendation_cache import RecommendationCache
+from shared_cache import SharedCache
+from structured_output import MOVIE_SCHEMA, gemini_schema, parse_structured
 
 logger = logging.getLogger(__name__)
 
+MOVIE_RESPONSE_SCHEMA = gemini_schema(MOVIE_SCHEMA)
+
+# Breaker around the Gemini path; while open, requests go straight to the curated fallback
+ai_breaker = CircuitBreaker(
+    'movie-ai',
+    slow_call_seconds=float(os.getenv('MOVIE_AI_SLOW_CALL_SECONDS', '8')),
+    open_seconds=float(os.getenv('MOVIE_AI_OPEN_SECONDS', '30')),
+)
+
+# Pool of AI results per (category, mood score bucket, normalized mood)
+recommendation_cache = RecommendationCache(
+    max_keys=int(os.getenv('MOVIE_CACHE_MAX_KEYS', '1024')),
+    ttl_seconds=float(os.getenv('MOVIE_CACHE_TTL_SECONDS', '86400')),
+    pool_size=int(os.getenv('MOVIE_CACHE_POOL_SIZE', '3')),
+    bucket_size=int(os.getenv('MOVIE_CACHE_BUCKET_SIZE', '10')),
+)
+MOVIE_CACHE_PATH = os.getenv(
+    'MOVIE_CACHE_PATH', str(Path(__file__).parent / 'cache' / 'movie_recommendations.json')
+)
+# Optional cross-process tier behind recommendation_cache (see attach_shared_cache)
+SHARED_CACHE_NAMESPACE = 'movie_recommendations'
+shared_cache = None
+
 
 @dataclass
 class MovieItem:
@@ -106,24 +140,73 @@ DESCRIPTIONS = {
     'balanced': 'Tontonan seimbang penuh empati untuk mood yang belum pasti.',
 }
 
-# Mood keyword mapping
-CATEGORY_KEYWORDS = {
-    'joyful': ['bahagia', 'senang', 'gembira', 'ceria', 'optimis', 'positif', 'bersemangat', 'lega', 'happy', 'joy'],
-    'comfort': ['sedih', 'murung', 'lelah', 'letih', 'kecewa', 'down', 'capek', 'patah', 'galau', 'sepi', 'sunyi', 'kesepian', 'sad'],
-    'grounding': ['cemas', 'gelisah', 'khawatir', 'resah', 'stres', 'stress', 'tegang', 'panik', 'overwhelmed', 'kacau', 'takut', 'anxious'],
-    'reflective': ['tenang', 'damai', 'reflektif', 'nostalgia', 'merenung', 'kontemplatif', 'campur', 'campuran', 'mixed', 'calm'],
-    'motivational': ['termotivasi', 'ambisius', 'ambitious', 'fokus', 'produktif', 'berdaya', 'tekad', 'berani', 'gigih', 'semangat', 'motivated'],
+# Catalog mood tags every category leans towards
+CATEGORY_TAGS = {
+    'joyful': {'ceria', 'lucu', 'musik'},
+    'comfort': {'hangat', 'keluarga', 'haru'},
+    'grounding': {'tenang', 'alam', 'lembut'},
+    'reflective': {'mendalam', 'nostalgia', 'tenang'},
+    'motivational': {'inspiratif', 'perjuangan', 'harapan'},
+    'balanced': {'hangat', 'harapan', 'persahabatan'},
 }
 
+# Personal reasons for catalog picks, by category
+CATALOG_REASONS = {
+    'joyful': 'Film {genre} yang ringan dan penuh warna untuk menjaga mood positifmu.',
+    'comfort': 'Kisah {genre} yang hangat untuk menemani hati yang sedang lelah.',
+    'grounding': 'Tontonan {genre} bertempo tenang yang membantu pikiranmu kembali membumi.',
+    'reflective': 'Film {genre} kontemplatif yang memberi ruang untuk merenung.',
+    'motivational': 'Kisah {genre} penuh tekad yang memantik semangatmu.',
+    'balanced': 'Perpaduan {genre} yang seimbang untuk mood yang campur aduk.',
+}
 
-def resolve_category(mood: str, mood_score: Optional[int]) -> str:
-    """Resolve recommendation category based on mood and score."""
-    mood_lower = mood.lower().strip()
-    
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in mood_lower:
-                return category
+# The catalog and lexicon are loaded on first use (or by the server's warm-up),
+# so importing this module stays cheap
+MOVIE_CATALOG_PATH = os.getenv('MOVIE_CATALOG_PATH', str(DEFAULT_CATALOG_PATH))
+MOOD_LEXICON_PATH = os.getenv('MOOD_LEXICON_PATH', str(Path(__file__).parent / 'data' / 'mood_lexicon.tsv'))
+
+
+@lru_cache(maxsize=None)
+def get_movie_catalog() -> MovieCatalog:
+    return MovieCatalog.load(MOVIE_CATALOG_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_mood_matcher() -> LexiconMatcher:
+    """Mood lexicon: term -> [(category, weight)], matched in one compiled pass."""
+    return LexiconMatcher(load_lexicon(MOOD_LEXICON_PATH))
+
+
+@lru_cache(maxsize=None)
+def category_keywords() -> dict:
+    """Lexicon terms per category, in lexicon order (category order breaks score ties)."""
+    keywords = {}
+    for term, labels in get_mood_matcher().lexicon.items():
+        for category, _ in labels:
+            keywords.setdefault(category, []).append(term)
+    return keywords
+
+
+# How much a dominant-mood hit counts compared to one in the summary or highlights
+MOOD_FIELD_WEIGHT = 3.0
+
+
+def resolve_category(
+    mood: str,
+    mood_score: Optional[int],
+    summary: str = "",
+    highlights: list = None
+) -> str:
+    """Resolve recommendation category from weighted lexicon hits, then score."""
+    mood_matcher = get_mood_matcher()
+    scores = mood_matcher.scores(mood, weight=MOOD_FIELD_WEIGHT)
+    mood_matcher.scores(summary, into=scores)
+    for highlight in highlights or []:
+        mood_matcher.scores(highlight, into=scores)
+
+    if scores:
+        order = list(category_keywords())
+        return max(scores, key=lambda c: (scores[c], -order.index(c) if c in order else -len(order)))
     
     # Score-based fallback
     if mood_score is not None:
@@ -137,6 +220,20 @@ def resolve_category(mood: str, mood_score: Optional[int]) -> str:
     return 'balanced'
 
 
+def normalize_mood(mood: str) -> str:
+    """Normalize a free-form mood for cache keys.
+
+    Moods that hit the lexicon collapse to the category of their first term, so
+    "sedih", "kecewa" and "lelah" share one key (and one precomputed grid entry).
+    """
+    mood_lower = ' '.join(mood.lower().split()) if mood else ''
+    mood_matcher = get_mood_matcher()
+    hits = mood_matcher.find(mood_lower)
+    if not hits:
+        return mood_lower
+    return max(mood_matcher.lexicon[hits[0]], key=lambda label: label[1])[0]
+
+
 def build_recommendation_prompt(
     mood: str,
     mood_score: Optional[int],
@@ -167,22 +264,7 @@ KRITERIA PEMILIHAN FILM:
 - Jika mood reflektif/nostalgia: pilih film yang bermakna dan kontemplatif
 - Jika mood termotivasi: pilih film yang inspiratif dan membangun semangat
 
-Kembalikan dalam format JSON EXACT berikut:
-{{
-  "category": "string (joyful/comfort/grounding/reflective/motivational/balanced)",
-  "headline": "string (judul bagian dalam bahasa Indonesia, personal dan hangat)",
-  "description": "string (deskripsi singkat mengapa film-film ini cocok, dalam bahasa Indonesia)",
-  "movies": [
-    {{
-      "title": "string (judul film dalam bahasa Inggris)",
-      "year": number (tahun rilis),
-      "tagline": "string (tagline singkat dalam bahasa Indonesia)",
-      "imdbId": "string atau null (format: tt1234567)",
-      "genres": ["string"] (maksimal 3 genre),
-      "reason": "string (alasan personal mengapa film ini cocok untuk mood pengguna, dalam bahasa Indonesia)"
-    }}
-  ]
-}}
+Kembalikan dalam format JSON. Tagline, deskripsi dan alasan dalam bahasa Indonesia.
 
 PENTING:
 - Pilih film-film yang BERAGAM (berbeda genre, tahun, style)
@@ -192,59 +274,214 @@ PENTING:
 
 
 def get_ai_recommendations(
-    model: genai.GenerativeModel,
+    model,
     mood: str,
     mood_score: Optional[int],
     summary: str,
     highlights: list,
     affirmation: str
 ) -> Optional[MovieRecommendationResult]:
-    """Get AI-generated movie recommendations from Gemini."""
+    """Get AI-generated movie recommendations from Gemini.
+
+    Raises BudgetExhausted when the local Gemini budget is spent: that is not
+    an upstream failure and must not count against the circuit breaker.
+    """
     try:
         prompt = build_recommendation_prompt(mood, mood_score, summary, highlights, affirmation)
         
         response = model.generate_content(
             prompt,
-            generation_config=genai.GenerationConfig(
-                response_mime_type="application/json",
-                temperature=0.7,
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=2048,
-            )
+            generation_config={
+                'response_mime_type': 'application/json',
+                'temperature': 0.7,
+                'top_p': 0.95,
+                'top_k': 40,
+                'max_output_tokens': 2048,
+                'response_schema': MOVIE_RESPONSE_SCHEMA,
+            }
         )
         
-        decoded = json.loads(response.text)
+        decoded = parse_structured(response.text, MOVIE_SCHEMA) or {}
         
         items = []
         for movie in decoded.get('movies', []):
+            if not movie.get('title'):
+                continue
             items.append(MovieItem(
-                title=movie.get('title', 'Unknown'),
+                title=movie['title'],
                 year=movie.get('year', 0),
                 tagline=movie.get('tagline', ''),
-                imdb_id=movie.get('imdbId'),
+                imdb_id=movie.get('imdbId') or None,
                 genres=movie.get('genres', []),
-                reason=movie.get('reason', 'Film yang cocok untuk mood kamu.'),
+                reason=movie.get('reason') or 'Film yang cocok untuk mood kamu.',
             ))
         
+        if not items:
+            logger.warning("AI movie recommendations returned no usable movies")
+            return None
+        
         return MovieRecommendationResult(
-            category=decoded.get('category', 'ai-generated'),
+            category=decoded.get('category') or 'ai-generated',
             mood_label=mood if mood else '',
-            headline=decoded.get('headline', 'Rekomendasi Film untuk Minggu Ini'),
-            description=decoded.get('description', 'Film-film yang dipilih khusus berdasarkan mood mingguan kamu.'),
+            headline=decoded.get('headline') or 'Rekomendasi Film untuk Minggu Ini',
+            description=decoded.get('description') or 'Film-film yang dipilih khusus berdasarkan mood mingguan kamu.',
             items=items,
         )
         
+    except BudgetExhausted:
+        raise
     except Exception as e:
         logger.warning(f"AI movie recommendations failed: {e}")
         return None
 
 
-def get_fallback_recommendations(mood: str, mood_score: Optional[int]) -> MovieRecommendationResult:
+def result_from_dict(data: dict) -> MovieRecommendationResult:
+    """Rebuild a result from ``asdict`` output."""
+    data = dict(data)
+    data['items'] = [MovieItem(**item) for item in data.get('items', [])]
+    return MovieRecommendationResult(**data)
+
+
+def attach_shared_cache(path) -> SharedCache:
+    """Back the recommendation cache with a SQLite tier shared by worker processes."""
+    global shared_cache
+    shared_cache = SharedCache(path)
+    purged = shared_cache.purge(SHARED_CACHE_NAMESPACE, recommendation_cache.ttl_seconds)
+    logger.info(f"Attached shared recommendation cache at {path} ({purged} expired entries purged)")
+    return shared_cache
+
+
+def is_user_key(key: tuple) -> bool:
+    """Keys from ``make_key`` are shared across users; precompute appends a user id."""
+    return len(key) > 3
+
+
+def shareable_result(result: MovieRecommendationResult, category: str) -> MovieRecommendationResult:
+    """Copy of a result for pools served to other users: the movies, without the
+    headline, description and reasons Gemini wrote from one user's journal."""
+    category = category if category in CATALOG_REASONS else 'balanced'
+    return replace(
+        result,
+        headline=HEADLINES[category],
+        description=DESCRIPTIONS[category],
+        items=[replace(item, reason=catalog_reason(item.genres, category)) for item in result.items],
+    )
+
+
+def cache_recommendation(key: tuple, result: MovieRecommendationResult) -> bool:
+    """Add a result set to the local pool and write it through to the shared tier."""
+    if not is_user_key(key):
+        result = shareable_result(result, key[0])
+    added = recommendation_cache.put(key, result)
+    if added and shared_cache is not None:
+        member = '|'.join(recommendation_cache.signature(result))
+        shared_cache.add(SHARED_CACHE_NAMESPACE, key, member, asdict(result))
+    return added
+
+
+def pull_shared_recommendations(key: tuple):
+    """Fill an incomplete local pool with result sets other workers have cached."""
+    if shared_cache is None or recommendation_cache.is_full(key):
+        return
+    members = shared_cache.members(
+        SHARED_CACHE_NAMESPACE, key, recommendation_cache.ttl_seconds, recommendation_cache.pool_size
+    )
+    if members:
+        results = [(age, result_from_dict(data)) for age, data in members]
+        if not is_user_key(key):
+            # Rows written before shared pools were depersonalized
+            results = [(age, shareable_result(result, key[0])) for age, result in results]
+        recommendation_cache.restore([(key, results)])
+
+
+def save_recommendation_cache(path: str = MOVIE_CACHE_PATH) -> int:
+    """Persist the recommendation cache to a JSON file. Returns result sets written."""
+    now = time.time()
+    entries = [
+        {
+            'key': list(key),
+            'results': [{'storedAt': now - age, 'result': asdict(result)} for age, result in results],
+        }
+        for key, results in recommendation_cache.snapshot()
+    ]
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+    tmp.replace(target)
+
+    count = sum(len(e['results']) for e in entries)
+    logger.info(f"Saved {count} cached movie recommendation sets to {path}")
+    return count
+
+
+def load_recommendation_cache(path: str = MOVIE_CACHE_PATH) -> int:
+    """Load a cache file written by ``save_recommendation_cache``."""
+    try:
+        entries = json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return 0
+    except Exception as e:
+        logger.warning(f"Could not load movie recommendation cache from {path}: {e}")
+        return 0
+
+    now = time.time()
+    snapshot = []
+    for entry in entries:
+        key = tuple(entry['key'])
+        results = [
+            (now - stored['storedAt'], result_from_dict(stored['result']))
+            for stored in entry['results']
+        ]
+        if not is_user_key(key):
+            # Files written before shared pools were depersonalized
+            results = [(age, shareable_result(result, key[0])) for age, result in results]
+        snapshot.append((key, results))
+
+    restored = recommendation_cache.restore(snapshot)
+    logger.info(f"Loaded {restored} cached movie recommendation sets from {path}")
+    return restored
+
+
+def catalog_reason(genres: list, category: str) -> str:
+    """Category reason for a movie, not tied to any user's notes."""
+    genre = genres[0].lower() if genres else 'pilihan'
+    return CATALOG_REASONS.get(category, CATALOG_REASONS['balanced']).format(genre=genre)
+
+
+@lru_cache(maxsize=None)
+def catalog_movie_item(movie, category: str) -> MovieItem:
+    """Build (once) the MovieItem shown for a catalog movie in a category."""
+    return MovieItem(
+        title=movie.title,
+        year=movie.year,
+        tagline=movie.tagline,
+        imdb_id=movie.imdb_id,
+        genres=list(movie.genre_list[:3]),
+        reason=catalog_reason(movie.genre_list, category),
+    )
+
+
+def get_catalog_movies(category: str, text: str = "") -> list:
+    """Pick diverse catalog movies for a category, nudged by tags mentioned in text."""
+    words = set(re.findall(r'[a-z]+', text.lower())) if text else set()
+    movie_catalog = get_movie_catalog()
+    mood_tags = CATEGORY_TAGS.get(category, set()) | (words & movie_catalog.by_tag.keys())
+    return [catalog_movie_item(m, category) for m in movie_catalog.select(category, mood_tags)]
+
+
+def get_fallback_recommendations(
+    mood: str,
+    mood_score: Optional[int],
+    summary: str = "",
+    highlights: list = None
+) -> MovieRecommendationResult:
     """Get fallback recommendations when AI is unavailable."""
-    category = resolve_category(mood, mood_score)
+    category = resolve_category(mood, mood_score, summary, highlights)
     
-    movies = FALLBACK_MOVIES.get(category, FALLBACK_MOVIES['balanced'])
+    context = ' '.join([mood or '', summary or ''] + list(highlights or []))
+    movies = get_catalog_movies(category, context) or FALLBACK_MOVIES.get(category, FALLBACK_MOVIES['balanced'])
     headline = HEADLINES.get(category, HEADLINES['balanced'])
     description = DESCRIPTIONS.get(category, DESCRIPTIONS['balanced'])
     
@@ -258,26 +495,69 @@ def get_fallback_recommendations(mood: str, mood_score: Optional[int]) -> MovieR
 
 
 def get_movie_recommendations(
-    model: Optional[genai.GenerativeModel],
+    model,
     mood: str,
     mood_score: Optional[int],
     summary: str = "",
     highlights: list = None,
-    affirmation: str = ""
+    affirmation: str = "",
+    user_id: str = ""
 ) -> MovieRecommendationResult:
     """
     Get movie recommendations based on mood analysis.
-    Tries AI first, falls back to curated list if AI fails.
+    Serves precomputed or mood-bucketed cached results when available, otherwise
+    tries AI and falls back to the cache or the curated list if AI fails or the
+    circuit is open.
     """
     highlights = highlights or []
-    
+    mood_label = mood if mood else ''
+    cache_key = recommendation_cache.make_key(
+        resolve_category(mood, mood_score, summary, highlights), normalize_mood(mood), mood_score
+    )
+
+    pull_shared_recommendations(cache_key)
+
+    # Results precomputed for this user's weekly analysis
+    if user_id:
+        pull_shared_recommendations(cache_key + (user_id,))
+        precomputed = recommendation_cache.get(cache_key + (user_id,))
+        if precomputed:
+            logger.info(f"Serving precomputed movie recommendations for user {user_id}")
+            MOVIE_RECOMMENDATION_SOURCE.inc(source='precomputed')
+            return replace(precomputed, mood_label=mood_label)
+
+    if recommendation_cache.is_full(cache_key):
+        logger.info(f"Serving cached movie recommendations for {cache_key}")
+        MOVIE_RECOMMENDATION_SOURCE.inc(source='cache')
+        return replace(recommendation_cache.get(cache_key), mood_label=mood_label)
+
     # Try AI-generated recommendations first
-    if model:
-        result = get_ai_recommendations(model, mood, mood_score, summary, highlights, affirmation)
+    if model and ai_breaker.allow_request():
+        start = time.monotonic()
+        try:
+            result = get_ai_recommendations(model, mood, mood_score, summary, highlights, affirmation)
+        except BudgetExhausted:
+            ai_breaker.release()
+            logger.info("Gemini budget exhausted, serving movie recommendations locally")
+            result = None
+        else:
+            ai_breaker.record(time.monotonic() - start, ok=bool(result and result.items))
         if result and result.items:
             logger.info(f"AI-generated {len(result.items)} movie recommendations")
+            cache_recommendation(cache_key, result)
+            MOVIE_RECOMMENDATION_SOURCE.inc(source='ai')
             return result
+    elif model:
+        logger.info("Movie AI circuit open, skipping Gemini")
+
+    # A partially filled pool still beats the generic curated list
+    cached = recommendation_cache.get(cache_key)
+    if cached:
+        logger.info(f"Serving cached movie recommendations for {cache_key}")
+        MOVIE_RECOMMENDATION_SOURCE.inc(source='partial_cache')
+        return replace(cached, mood_label=mood_label)
     
     # Fallback to curated recommendations
     logger.info("Using fallback movie recommendations")
-    return get_fallback_recommendations(mood, mood_score)
+    MOVIE_RECOMMENDATION_SOURCE.inc(source='fallback')
+    return get_fallback_recommendations(mood, mood_score, summary, highlights)
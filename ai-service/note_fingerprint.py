@@ -0,0 +1,135 @@
+"""
+🧬 Near-Duplicate Note Detection
+
+Users often save several almost identical drafts of the same note, and each
+small edit re-triggers a full daily analysis. This module fingerprints every
+note and every day's note set with a 64-bit SimHash over word unigrams and
+bigrams, and keeps already-analyzed days in a bounded local index. When a
+day's notes come back within a small Hamming distance of an analyzed set, the
+cached result can be reused instead of calling Gemini again.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def note_text(note) -> str:
+    return f"{note.title or ''}\n{note.body or ''}"
+
+
+def text_features(text: str) -> Counter:
+    """Word unigrams and bigrams of lowercased text."""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return features
+
+
+def simhash(features: Counter) -> int:
+    """64-bit SimHash of weighted features."""
+    if not features:
+        return 0
+
+    digests = b''.join(
+        hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest() for feature in features
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(len(features), 64)
+    weights = np.fromiter(features.values(), dtype=np.float64, count=len(features))
+
+    # +weight where the bit is set, -weight where it is not
+    totals = weights @ (bits.astype(np.float64) * 2 - 1)
+    return int(''.join('1' if total > 0 else '0' for total in totals), 2)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class DayFingerprint:
+    day: int
+    notes: tuple  # one fingerprint per note
+
+    @classmethod
+    def from_notes(cls, notes: list) -> 'DayFingerprint':
+        per_note = [text_features(note_text(note)) for note in notes]
+        combined = Counter()
+        for features in per_note:
+            combined.update(features)
+        return cls(day=simhash(combined), notes=tuple(simhash(f) for f in per_note))
+
+    def distance(self, other: 'DayFingerprint', max_distance: int) -> Optional[int]:
+        """Day-level distance if every note also has a close counterpart, else None."""
+        if len(self.notes) != len(other.notes):
+            return None
+
+        distance = hamming(self.day, other.day)
+        if distance > max_distance:
+            return None
+
+        remaining = list(other.notes)
+        for fingerprint in self.notes:
+            match = next((fp for fp in remaining if hamming(fingerprint, fp) <= max_distance), None)
+            if match is None:
+                return None
+            remaining.remove(match)
+        return distance
+
+
+class NearDuplicateIndex:
+    """Bounded LRU index of analyzed days, keyed by (user_id, date)."""
+
+    def __init__(self, max_entries: int = 4096, max_distance: int = 3, per_day: int = 4):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.per_day = per_day
+
+        self._entries = OrderedDict()  # (user_id, date) -> [(fingerprint, payload)]
+        self._lock = threading.Lock()
+
+    def lookup(self, user_id: str, date: str, fingerprint: DayFingerprint) -> Optional[tuple]:
+        """Return ``(payload, distance)`` for the closest analyzed set, or None."""
+        key = (user_id, date)
+        with self._lock:
+            best = None
+            for stored, payload in self._entries.get(key, []):
+                distance = fingerprint.distance(stored, self.max_distance)
+                if distance is not None and (best is None or distance < best[1]):
+                    best = (payload, distance)
+            if best:
+                self._entries.move_to_end(key)
+            return best
+
+    def add(self, user_id: str, date: str, fingerprint: DayFingerprint, payload):
+        key = (user_id, date)
+        with self._lock:
+            entries = self._entries.setdefault(key, [])
+            entries.append((fingerprint, payload))
+            del entries[:-self.per_day]
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot(self) -> list:
+        """``[(key, [(fingerprint, payload), ...]), ...]``, least recently used first."""
+        with self._lock:
+            return [(key, list(entries)) for key, entries in self._entries.items()]
+
+    def restore(self, snapshot: list) -> int:
+        """Load entries produced by ``snapshot``; returns the number of days restored."""
+        with self._lock:
+            for key, entries in snapshot:
+                self._entries[tuple(key)] = list(entries)[-self.per_day:]
+                self._entries.move_to_end(tuple(key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return len(snapshot)
@@ -0,0 +1,223 @@
+"""
+🌅 Movie Recommendation Pre-warming
+
+Weekly analyses finish for everyone at roughly the same time, and the next
+morning every user opens the dashboard at once. This module batch-generates
+movie recommendations ahead of that spike and stores them in the
+recommendation cache, so the spike is served locally instead of piling up on
+Gemini.
+
+Two modes:
+    - Grid: every category keyword and mood score bucket
+    - Per user: one job per weekly analysis (keyed by user id)
+
+Jobs run on a single background thread at a fixed pace, wait while the shared
+Gemini budget is low or the movie AI circuit refuses calls (a precompute call
+can be the half-open probe that closes it again), and persist the cache to
+disk when the queue drains. A job that waits longer than
+``PRECOMPUTE_MAX_WAIT_SECONDS`` is dropped.
+
+Usage (trigger a grid warm-up on a running server):
+    python precompute.py
+    python precompute.py --host localhost --port 50052 --results-per-key 3
+"""
+
+import argparse
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from model_router import BudgetExhausted
+from rate_limiter import TokenBucket
+from movie_recommendations import (
+    ai_breaker,
+    cache_recommendation,
+    category_keywords,
+    get_ai_recommendations,
+    normalize_mood,
+    recommendation_cache,
+    resolve_category,
+    save_recommendation_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+PRECOMPUTE_RPM = float(os.getenv('PRECOMPUTE_RPM', '10'))
+# Requests left in the shared Gemini budget for live traffic
+PRECOMPUTE_BUDGET_RESERVE = float(os.getenv('PRECOMPUTE_BUDGET_RESERVE', '5'))
+# Longest a job waits for budget or a closed circuit before it is dropped
+PRECOMPUTE_MAX_WAIT_SECONDS = float(os.getenv('PRECOMPUTE_MAX_WAIT_SECONDS', '300'))
+
+
+@dataclass
+class PrecomputeJob:
+    mood: str
+    mood_score: Optional[int]
+    summary: str = ""
+    highlights: list = field(default_factory=list)
+    affirmation: str = ""
+    user_id: str = ""
+    results: int = 1  # result sets wanted for the key
+
+
+def grid_jobs(results_per_key: int) -> list:
+    """One job per category and mood score bucket, plus score-only moods.
+
+    Lexicon moods are cached per category (see ``normalize_mood``), so one
+    keyword per category warms every mood of that category.
+    """
+    bucket = recommendation_cache.bucket_size
+    scores = range(bucket // 2, 101, bucket)
+    moods = [keywords[0] for keywords in category_keywords().values()] + ['']
+
+    return [
+        PrecomputeJob(mood=mood, mood_score=score, results=results_per_key)
+        for mood in moods
+        for score in scores
+    ]
+
+
+class RecommendationPrecomputer:
+    """Low-priority background worker that fills the recommendation cache."""
+
+    def __init__(self, model, rate_per_minute: float = PRECOMPUTE_RPM,
+                 budget_reserve: float = PRECOMPUTE_BUDGET_RESERVE,
+                 max_wait_seconds: float = PRECOMPUTE_MAX_WAIT_SECONDS):
+        self.model = model
+        self.pace = TokenBucket(rate_per_minute, capacity=1)
+        self.max_wait_seconds = max_wait_seconds
+
+        # The bucket never holds more than its capacity, so a reserve at or above
+        # it would never leave room for a precompute call
+        limiter = getattr(model, 'limiter', None)
+        if limiter is not None and budget_reserve > limiter.capacity - 1:
+            capped = max(0.0, limiter.capacity - 1)
+            logger.warning(
+                f"Precompute budget reserve {budget_reserve:g} exceeds the Gemini RPM limit; using {capped:g}"
+            )
+            budget_reserve = capped
+        self.budget_reserve = budget_reserve
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, jobs: list) -> int:
+        """Queue jobs and make sure the worker is running. Returns jobs queued."""
+        for job in jobs:
+            self._queue.put(job)
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='recommendation-precompute', daemon=True
+                )
+                self._thread.start()
+
+        logger.info(f"Queued {len(jobs)} movie recommendation precompute jobs")
+        return len(jobs)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            try:
+                job = self._queue.get(timeout=5)
+            except queue.Empty:
+                return
+
+            try:
+                self._process(job)
+            except Exception as e:
+                logger.error(f"Precompute job failed for mood '{job.mood}': {e}")
+            finally:
+                self._queue.task_done()
+
+            if self._queue.empty():
+                save_recommendation_cache()
+
+    def _process(self, job: PrecomputeJob):
+        category = resolve_category(job.mood, job.mood_score, job.summary, job.highlights)
+        key = recommendation_cache.make_key(category, normalize_mood(job.mood), job.mood_score)
+        user_key = key + (job.user_id,) if job.user_id else None
+
+        for _ in range(job.results):
+            if not user_key and recommendation_cache.is_full(key):
+                return
+
+            if not self._wait_for_budget():
+                logger.warning(
+                    f"Dropping precompute job for mood '{job.mood}' after waiting "
+                    f"{self.max_wait_seconds:.0f}s for Gemini budget or the movie AI circuit"
+                )
+                return
+
+            start = time.monotonic()
+            try:
+                result = get_ai_recommendations(
+                    self.model, job.mood, job.mood_score, job.summary, job.highlights, job.affirmation
+                )
+            except BudgetExhausted:
+                # Live traffic took the budget between the check and the call; not a Gemini failure
+                ai_breaker.release()
+                continue
+            ok = bool(result and result.items)
+            ai_breaker.record(time.monotonic() - start, ok=ok)
+            if not ok:
+                continue
+
+            cache_recommendation(key, result)
+            if user_key:
+                cache_recommendation(user_key, result)
+
+    def _wait_for_budget(self) -> bool:
+        """Pace the job and yield to live traffic and an unhealthy upstream.
+
+        Returns False if no call was allowed within ``max_wait_seconds``. On
+        True the caller must record the outcome on ``ai_breaker``.
+        """
+        deadline = time.monotonic() + self.max_wait_seconds
+        if not self.pace.acquire(timeout=self.max_wait_seconds):
+            return False
+        has_budget = getattr(self.model, 'has_budget', None)
+        while True:
+            # Check the budget first: allow_request() hands out the half-open probe
+            if (not has_budget or has_budget(self.budget_reserve)) and ai_breaker.allow_request():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(1.0)
+
+
+def main():
+    import grpc
+    import ai_pb2
+    import ai_pb2_grpc
+
+    parser = argparse.ArgumentParser(
+        description="🌅 Pre-warm movie recommendations for every mood bucket"
+    )
+    parser.add_argument('--host', default='localhost', help="AI service host")
+    parser.add_argument('--port', default=os.getenv('GRPC_PORT', '50052'), help="AI service port")
+    parser.add_argument(
+        '--results-per-key', type=int, default=0,
+        help="Result sets per mood bucket (default: the cache pool size)"
+    )
+    args = parser.parse_args()
+
+    with grpc.insecure_channel(f'{args.host}:{args.port}') as channel:
+        stub = ai_pb2_grpc.AIAnalysisServiceStub(channel)
+        response = stub.PrecomputeMovieRecommendations(
+            ai_pb2.PrecomputeRecommendationsRequest(results_per_key=args.results_per_key)
+        )
+
+    print(f"Queued {response.queued} precompute jobs ({response.pending} pending)")
+
+
+if __name__ == '__main__':
+    main()
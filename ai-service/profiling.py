@@ -0,0 +1,159 @@
+"""
+🔥 Live Profiling
+
+Diagnostics that run against a live server without restarting it:
+
+    - SamplingProfiler: samples every thread's Python stack with
+      ``sys._current_frames()`` at a fixed rate for a few seconds and returns
+      collapsed stacks (``frame;frame;frame count``), the input format of
+      flamegraph.pl and speedscope. The cost is one stack walk per thread per
+      sample, on a separate thread, and nothing at all between profiles.
+    - MemoryTracker: starts and stops ``tracemalloc`` and takes snapshots,
+      each diffed against the previous one, to find growing allocations.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = 60.0
+MAX_SAMPLE_HZ = 1000
+
+# Leaf frames of threads that are blocked rather than running Python code
+IDLE_LEAVES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    ('socketserver.py', 'serve_forever'),
+    ('_server.py', '_serve'),
+    ('thread.py', '_worker'),
+}
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Statistical profiler over all threads, one profile at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, sample_hz: int = 100, include_idle: bool = False) -> tuple:
+        """Sample for ``seconds``; returns ``(collapsed_stacks, samples, duration)``."""
+        seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+        interval = 1.0 / min(max(sample_hz, 1), MAX_SAMPLE_HZ)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A CPU profile is already running")
+
+        try:
+            me = threading.get_ident()
+            stacks = Counter()
+            samples = 0
+            start = time.monotonic()
+            deadline = start + seconds
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == me:
+                        continue
+                    leaf = frame.f_code
+                    if not include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_LEAVES:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(frame_label(frame))
+                        frame = frame.f_back
+                    stacks[';'.join(reversed(labels))] += 1
+                samples += 1
+                time.sleep(interval)
+            duration = time.monotonic() - start
+        finally:
+            self._lock.release()
+
+        collapsed = '\n'.join(f"{stack} {count}" for stack, count in stacks.most_common())
+        logger.info(f"CPU profile: {samples} samples over {duration:.1f}s, {len(stacks)} distinct stacks")
+        return collapsed, samples, duration
+
+
+@dataclass
+class MemoryStat:
+    location: str
+    size: int
+    size_diff: int
+    count: int
+    count_diff: int
+
+
+class MemoryTracker:
+    """tracemalloc control with snapshots diffed against the previous one."""
+
+    def __init__(self):
+        self._previous = None
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(max(1, frames))
+                logger.info(f"tracemalloc started ({max(1, frames)} frames per allocation)")
+            self._previous = None
+
+    def stop(self):
+        with self._lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+                logger.info("tracemalloc stopped")
+            self._previous = None
+
+    def snapshot(self, top: int = 25, group_by: str = 'lineno') -> tuple:
+        """Return ``(stats, has_diff)`` for the largest (or fastest growing) allocations."""
+        if group_by not in ('lineno', 'filename', 'traceback'):
+            group_by = 'lineno'
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return [], False
+
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ))
+            previous, self._previous = self._previous, snapshot
+
+        if previous is not None:
+            stats = [
+                MemoryStat(self._location(s.traceback), s.size, s.size_diff, s.count, s.count_diff)
+                for s in snapshot.compare_to(previous, group_by)
+            ]
+        else:
+            stats = [
+                MemoryStat(self._location(s.traceback), s.size, 0, s.count, 0)
+                for s in snapshot.statistics(group_by)
+            ]
+        return stats[:max(1, top)], previous is not None
+
+    @staticmethod
+    def _location(traceback) -> str:
+        return ' <- '.join(f"{frame.filename}:{frame.lineno}" for frame in traceback)
+
+    @staticmethod
+    def usage() -> tuple:
+        """``(traced_bytes, peak_bytes)`` while tracing, else zeros."""
+        return tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
@@ -0,0 +1,179 @@
+"""
+✂️ Prompt Token Budget
+
+Bounds the size of the notes section of a daily prompt, however much a user
+writes. Tokens are estimated per rendered note (timestamp, title and body);
+when the day fits the budget nothing changes. Otherwise the most recent notes
+are kept verbatim up to a share of the budget, and the rest are compressed
+extractively: sentences are scored by salience (how central their content
+words are to the day, plus emotional signal from the sentiment and mood
+lexicons) and the best ones are kept, in their original order, until the
+budget is spent. Titles are capped, and when the note headers alone exceed
+the budget the oldest notes are left out.
+"""
+
+import logging
+import math
+import os
+import re
+from collections import Counter
+
+from mood_scorer import sentiment_lexicon
+from movie_recommendations import get_mood_matcher
+from writing_style import ALL_STOPWORDS, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Token budget for the notes of one daily prompt
+DAILY_PROMPT_TOKEN_BUDGET = int(os.getenv('DAILY_PROMPT_TOKEN_BUDGET', '3000'))
+# Share of the budget reserved for the most recent notes, kept verbatim
+RECENT_VERBATIM_SHARE = 0.4
+# Rough characters-per-token ratio for budgeting prompts
+CHARS_PER_TOKEN = 4
+# Longer "sentences" (pasted text without punctuation) are split into chunks
+MAX_SENTENCE_CHARS = 400
+# Extra salience per unit of lexicon weight, and for a note's opening sentence
+SIGNAL_WEIGHT = 0.5
+LEAD_BONUS = 0.25
+GAP_MARKER = '[…]'
+# Titles longer than this are cut, so a pasted title cannot take the budget
+MAX_TITLE_CHARS = 120
+NOTE_SEPARATOR = '\n\n---\n\n'
+EMPTY_BODY = '(tidak ada isi)'
+
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def render_note(note, body: str) -> str:
+    """A note as it appears in the daily prompt."""
+    title = note.title or 'Tanpa judul'
+    if len(title) > MAX_TITLE_CHARS:
+        title = title[:MAX_TITLE_CHARS].rstrip() + '…'
+    return f"Waktu: {note.created_at}\nJudul: {title}\nIsi: {body or EMPTY_BODY}"
+
+
+def split_sentences(text: str) -> list:
+    sentences = []
+    for sentence in SENTENCE_PATTERN.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > MAX_SENTENCE_CHARS:
+            cut = sentence.rfind(' ', 0, MAX_SENTENCE_CHARS)
+            cut = cut if cut > 0 else MAX_SENTENCE_CHARS
+            sentences.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+    return sentences
+
+
+def signal_weight(word: str) -> float:
+    """Emotional weight of a word from the sentiment and mood lexicons."""
+    weight = abs(sentiment_lexicon()[0].get(word, 0.0))
+    for _, term_weight in get_mood_matcher().lexicon.get(word, ()):
+        weight = max(weight, term_weight)
+    return weight
+
+
+def compress(sentences: list, frequencies: Counter, budget: int) -> str:
+    """Keep the most salient sentences that fit the budget, in original order."""
+    scored = []
+    for position, sentence in enumerate(sentences):
+        words = [w for w in tokenize(sentence) if w not in ALL_STOPWORDS and len(w) > 2]
+        if words:
+            centrality = sum(math.log1p(frequencies[w]) for w in words) / len(words)
+            signal = sum(signal_weight(w) for w in words)
+        else:
+            centrality = signal = 0.0
+        score = centrality + SIGNAL_WEIGHT * signal + (LEAD_BONUS if position == 0 else 0.0)
+        # +1 covers the joining space and gap markers
+        scored.append((score, position, estimate_tokens(sentence) + 1))
+
+    kept, spent = set(), 0
+    for score, position, cost in sorted(scored, key=lambda s: (-s[0], s[1])):
+        if spent + cost <= budget:
+            kept.add(position)
+            spent += cost
+
+    parts, previous = [], -1
+    for position in sorted(kept):
+        if position != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(sentences[position])
+        previous = position
+    if previous != len(sentences) - 1:
+        parts.append(GAP_MARKER)
+    return ' '.join(parts)
+
+
+def fit_notes(notes: list, budget: int = DAILY_PROMPT_TOKEN_BUDGET, date: str = '') -> list:
+    """
+    Return ``(note, body)`` pairs whose rendered notes together fit the token budget.
+
+    Unchanged when the day already fits. Notes keep their order; the oldest are
+    dropped only when the headers of the rest would not fit otherwise.
+    """
+    bodies = [note.body or '' for note in notes]
+    separator = estimate_tokens(NOTE_SEPARATOR)
+    overheads = [estimate_tokens(render_note(note, '')) + separator for note in notes]
+    costs = [estimate_tokens(body) for body in bodies]
+    total = sum(overheads) + sum(costs)
+    if budget <= 0 or total <= budget:
+        return list(zip(notes, bodies))
+
+    # Most recent notes first; each kept note needs its header plus room for a gap marker
+    recent_first = sorted(range(len(notes)), key=lambda i: notes[i].created_at or '', reverse=True)
+    marker = estimate_tokens(GAP_MARKER)
+    kept, overhead = [], 0
+    for i in recent_first:
+        if overhead + overheads[i] + marker > budget:
+            break
+        kept.append(i)
+        overhead += overheads[i]
+    if not kept:
+        # Not even one header fits: keep the latest note's title and nothing else
+        latest = notes[recent_first[0]]
+        logger.info(f"Dropped {len(notes) - 1} of {len(notes)} notes{f' for {date}' if date else ''}: "
+                    f"headers exceed the ~{budget} token budget")
+        return [(latest, GAP_MARKER)]
+    body_budget = budget - overhead
+
+    # Verbatim while they fit the recent share
+    verbatim_budget = int(body_budget * RECENT_VERBATIM_SHARE)
+    verbatim, spent = set(), 0
+    for i in kept:
+        if spent + costs[i] <= verbatim_budget:
+            verbatim.add(i)
+            spent += costs[i]
+
+    # Most recent notes first, verbatim while they fit the recent share
+    recent_first = sorted(range(len(notes)), key=lambda i: notes[i].created_at or '', reverse=True)
+    verbatim_budget = int(budget * RECENT_VERBATIM_SHARE)
+    verbatim, spent = set(), 0
+    for i in recent_first:
+        if spent + costs[i] <= verbatim_budget:
+            verbatim.add(i)
+            spent += costs[i]
+
+    # Split the rest of the budget across the remaining notes by size
+    remaining = [i for i in sorted(kept) if i not in verbatim]
+    remaining_cost = sum(costs[i] for i in remaining)
+    available = body_budget - spent
+
+    frequencies = Counter(w for i in remaining for w in tokenize(bodies[i])
+                          if w not in ALL_STOPWORDS and len(w) > 2)
+    fitted = list(bodies)
+    for i in remaining:
+        # The share pays for a trailing gap marker on top of the kept sentences
+        share = max(marker, available * costs[i] // max(1, remaining_cost))
+        fitted[i] = compress(split_sentences(bodies[i]), frequencies, share - marker)
+
+    kept = sorted(kept)
+    compacted = sum(overheads[i] + estimate_tokens(fitted[i]) for i in kept)
+    logger.info(f"Compacted notes{f' for {date}' if date else ''}: ~{total} -> ~{compacted} tokens "
+                f"({compacted / total:.0%}), {len(verbatim)} of {len(notes)} notes verbatim"
+                f"{f', {len(notes) - len(kept)} dropped' if len(kept) < len(notes) else ''}")
+    return [(notes[i], fitted[i]) for i in kept]
@@ -0,0 +1,152 @@
+"""
+📦 Daily Prompt Packing
+
+Every AnalyzeDaily call pays the fixed cost of a whole Gemini request: the
+round trip, the instruction preamble and the response format. During batch
+backfills many days arrive at once, so this module gathers the daily
+requests that arrive within a short window (up to a token and item budget)
+into one prompt that asks for a JSON array keyed by id, then hands each
+waiting caller its own entry.
+
+Entries the model drops, or returns in an unusable shape, are retried on
+their own with the caller's single-day fallback, so a packed call never
+loses a day. The same happens to every day of a packed call that fails
+outright. Fallbacks run in the callers' own threads, in parallel. A window
+that collects a single request skips packing.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from prompt_budget import estimate_tokens
+from structured_output import PACKED_ANALYSIS_SCHEMA, gemini_schema, parse_structured
+
+logger = logging.getLogger(__name__)
+
+PACKED_PROMPT_HEADER = """Anda adalah mentor journaling yang empatik. Berikut catatan harian dari beberapa hari yang berbeda, masing-masing ditandai dengan id. Analisis setiap hari secara terpisah dan jangan mencampur isi antar id."""
+
+PACKED_PROMPT_FOOTER = """Berikan tanggapan berupa array JSON dengan tepat satu objek untuk setiap id ({count} id). Gunakan bahasa Indonesia dan sertakan rujukan spesifik ke catatan saat relevan."""
+
+PACKED_RESPONSE_SCHEMA = gemini_schema(PACKED_ANALYSIS_SCHEMA)
+
+
+@dataclass
+class PackedDay:
+    notes_text: str
+    date: str
+    future: Future = field(default_factory=Future)
+    tokens: int = 0
+
+
+def build_packed_prompt(days: list) -> str:
+    """Build one prompt covering several days, keyed d0, d1, ..."""
+    sections = [
+        f"=== id: d{i} (tanggal {day.date}) ===\n{day.notes_text}"
+        for i, day in enumerate(days)
+    ]
+    return (
+        PACKED_PROMPT_HEADER
+        + "\n\n" + "\n\n".join(sections) + "\n\n"
+        + PACKED_PROMPT_FOOTER.format(count=len(days))
+    )
+
+
+def parse_packed_response(text: str) -> dict:
+    """Map ids to result dicts; malformed responses yield an empty mapping."""
+    results = {}
+    for entry in parse_structured(text, PACKED_ANALYSIS_SCHEMA) or []:
+        entry_id = entry.pop('id', '').strip()
+        if entry_id and entry.get('summary') and entry_id not in results:
+            results[entry_id] = entry
+    return results
+
+
+class DailyPromptPacker:
+    """Collects concurrent daily analyses into packed Gemini calls."""
+
+    def __init__(self, model, window_seconds: float, max_tokens: int = 6000,
+                 max_items: int = 8, max_concurrent_calls: int = 2):
+        self.model = model
+        self.window_seconds = window_seconds
+        self.max_tokens = max_tokens
+        self.max_items = max_items
+
+        self._queue = queue.Queue()
+        self._carry = None  # day that did not fit into the previous batch
+        self._calls = ThreadPoolExecutor(max_workers=max_concurrent_calls,
+                                         thread_name_prefix='daily-packer')
+        self._thread = threading.Thread(target=self._collect, name='daily-packer-collector', daemon=True)
+        self._thread.start()
+
+    def submit(self, notes_text: str, date: str, fallback: Callable[[], dict]) -> dict:
+        """Queue a day for the next packed call and wait for its result dict."""
+        day = PackedDay(notes_text=notes_text, date=date, tokens=estimate_tokens(notes_text))
+        self._queue.put(day)
+        result = day.future.result()
+        # None: the day was not packed or the packed call lost it, analyze it alone
+        return result if result is not None else fallback()
+
+    def _collect(self):
+        while True:
+            batch = self._next_batch()
+            self._calls.submit(self._dispatch, batch)
+
+    def _next_batch(self) -> list:
+        """Block for the first day, then gather more until the window or budget runs out."""
+        first = self._carry or self._queue.get()
+        self._carry = None
+
+        batch, tokens = [first], first.tokens
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                day = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if tokens + day.tokens > self.max_tokens:
+                self._carry = day
+                break
+            batch.append(day)
+            tokens += day.tokens
+        return batch
+
+    def _dispatch(self, batch: list):
+        if len(batch) == 1:
+            batch[0].future.set_result(None)
+            return
+
+        try:
+            prompt = build_packed_prompt(batch)
+            start = time.perf_counter()
+            response = self.model.generate_content(
+                prompt,
+                generation_config={
+                    'response_mime_type': 'application/json',
+                    'response_schema': PACKED_RESPONSE_SCHEMA,
+                },
+                rpc='AnalyzeDaily'
+            )
+            results = parse_packed_response(response.text)
+            logger.info(f"Packed {len(batch)} daily analyses into one Gemini call "
+                        f"(~{estimate_tokens(prompt)} tokens, {time.perf_counter() - start:.2f}s)")
+        except Exception as e:
+            logger.warning(f"Packed call for {len(batch)} days failed, retrying them individually: {e}")
+            results = {}
+
+        missing = 0
+        for i, day in enumerate(batch):
+            result = results.get(f"d{i}")
+            missing += result is None
+            day.future.set_result(result)
+
+        if missing and results:
+            logger.warning(f"Packed response dropped {missing} of {len(batch)} days, "
+                           f"retrying them individually")
@@ -0,0 +1,56 @@
+"""
+🪣 Token Bucket Rate Limiter
+
+Keeps Gemini usage within a requests-per-minute quota. Live requests take a
+token without waiting; background jobs can ask for a reserve to be left in the
+bucket so they never starve interactive traffic.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def available(self) -> float:
+        """Return the number of tokens currently in the bucket."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0, reserve: float = 0.0) -> bool:
+        """Take tokens if at least ``reserve`` would remain afterwards."""
+        with self._lock:
+            self._refill()
+            if self._tokens - tokens < reserve:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0, reserve: float = 0.0, timeout: float = None) -> bool:
+        """Block until tokens are available (or the timeout passes)."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self.try_acquire(tokens, reserve):
+            with self._lock:
+                missing = tokens + reserve - self._tokens
+            wait = max(0.01, missing / self.rate_per_second) if self.rate_per_second else 1.0
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+        return True
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
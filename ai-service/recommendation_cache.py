@@ -0,0 +1,149 @@
+"""
+🗂️ Recommendation Cache
+
+Caches AI-generated movie recommendations per mood bucket. Users whose weeks
+resolve to the same category, a similar mood score and the same normalized
+dominant mood get semantically similar answers from Gemini anyway, so each key
+keeps a small pool of distinct result sets and rotates between them. Most
+requests are served locally while users still see variety.
+
+Keys expire after a TTL and the least recently used keys are evicted once the
+cache is full.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    results: list = field(default_factory=list)  # (stored_at, result) pairs
+    attempts: int = 0                              # puts, including duplicates
+    cursor: int = 0
+
+
+class RecommendationCache:
+    """TTL + LRU cache holding a rotating pool of result sets per key."""
+
+    def __init__(
+        self,
+        max_keys: int = 1024,
+        ttl_seconds: float = 24 * 3600,
+        pool_size: int = 3,
+        bucket_size: int = 10,
+    ):
+        self.max_keys = max_keys
+        self.ttl_seconds = ttl_seconds
+        self.pool_size = pool_size
+        self.bucket_size = bucket_size
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, category: str, mood: str, mood_score: Optional[int]) -> tuple:
+        """Build a cache key from the category, score bucket and normalized mood."""
+        bucket = mood_score // self.bucket_size if mood_score is not None else -1
+        return (category, bucket, mood)
+
+    def is_full(self, key: tuple) -> bool:
+        """True once the key's pool is complete and Gemini can be skipped."""
+        with self._lock:
+            entry = self._live_entry(key)
+            return entry is not None and entry.results and entry.attempts >= self.pool_size
+
+    def get(self, key: tuple):
+        """Return the next result set from the key's pool, or None."""
+        with self._lock:
+            entry = self._live_entry(key)
+            if not entry or not entry.results:
+                return None
+
+            self._entries.move_to_end(key)
+            _, result = entry.results[entry.cursor % len(entry.results)]
+            entry.cursor += 1
+            return result
+
+    @staticmethod
+    def signature(result) -> tuple:
+        """Identity of a result set: its movie titles."""
+        return tuple(item.title.lower() for item in result.items)
+
+    def put(self, key: tuple, result) -> bool:
+        """Add a result set to the key's pool. Returns False for duplicates."""
+        signature = self.signature(result)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                entry = CacheEntry()
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            entry.attempts += 1
+
+            if any(self.signature(r) == signature for _, r in entry.results):
+                return False
+
+            entry.results.append((now, result))
+            if len(entry.results) > self.pool_size:
+                entry.results.pop(0)
+
+            while len(self._entries) > self.max_keys:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug(f"Evicted recommendation cache key {evicted}")
+            return True
+
+    def snapshot(self) -> list:
+        """Return ``[(key, [(age_seconds, result), ...]), ...]`` for persistence."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, [(now - stored_at, result) for stored_at, result in entry.results])
+                for key, entry in self._entries.items()
+                if entry.results
+            ]
+
+    def restore(self, snapshot: list) -> int:
+        """Load result sets produced by ``snapshot``; expired and known ones are skipped."""
+        restored = 0
+        now = time.monotonic()
+        with self._lock:
+            for key, results in snapshot:
+                live = [(now - age, result) for age, result in results if age < self.ttl_seconds]
+                if not live:
+                    continue
+                entry = self._entries.setdefault(key, CacheEntry())
+                known = {self.signature(r) for _, r in entry.results}
+                live = [(t, r) for t, r in live if self.signature(r) not in known]
+                entry.results = sorted(entry.results + live, key=lambda r: r[0])[-self.pool_size:]
+                entry.attempts = max(entry.attempts, len(entry.results))
+                restored += len(live)
+
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        return restored
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _live_entry(self, key: tuple) -> Optional[CacheEntry]:
+        """Return the entry for key after dropping expired result sets."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        cutoff = time.monotonic() - self.ttl_seconds
+        if entry.results and entry.results[0][0] < cutoff:
+            entry.results = [(t, r) for t, r in entry.results if t >= cutoff]
+            entry.attempts = len(entry.results)
+            if not entry.results:
+                del self._entries[key]
+                return None
+        return entry
@@ -0,0 +1,181 @@
+"""
+🧩 Prebuilt Responses
+
+Most of what the writing-style and movie RPCs return is static: author
+descriptions and fun facts, category headlines, and the catalog and curated
+movie items. Building those protobuf messages field by field on every
+request is the bulk of the response cost, so they are built once here:
+
+    - AuthorMatch templates for every author profile, merged into the
+      response and completed with the per-request score.
+    - Serialized movie items and result headers. A protobuf message
+      serialized as the concatenation of its parts parses exactly like the
+      whole message, so a movie response is joined from cached bytes plus the
+      per-request mood label, and returned through ``PreSerialized`` so gRPC
+      sends the bytes as they are.
+"""
+
+import threading
+from collections import OrderedDict
+
+import grpc
+
+import ai_pb2
+from movie_recommendations import (
+    DESCRIPTIONS,
+    FALLBACK_MOVIES,
+    HEADLINES,
+    MovieRecommendationResult,
+    catalog_movie_item,
+    get_movie_catalog,
+)
+from writing_style import AUTHOR_PROFILES
+
+# Serialized movie items and headers kept (items are cached by identity)
+MAX_TEMPLATE_ENTRIES = 4096
+
+
+class PreSerialized:
+    """A response whose wire bytes are already known."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class PreSerializedInterceptor(grpc.ServerInterceptor):
+    """Lets unary handlers return ``PreSerialized`` instead of a message."""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or not handler.unary_unary:
+            return handler
+
+        serializer = handler.response_serializer
+
+        def serialize(response) -> bytes:
+            if type(response) is PreSerialized:
+                return response.data
+            return serializer(response)
+
+        return grpc.unary_unary_rpc_method_handler(
+            handler.unary_unary,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=serialize,
+        )
+
+
+# ============================================
+# Writing style
+# ============================================
+
+AUTHOR_MATCH_TEMPLATES = {
+    author.name: ai_pb2.AuthorMatch(
+        name=author.name,
+        nationality=author.nationality,
+        description=author.description,
+        fun_fact=author.fun_fact,
+    )
+    for author in AUTHOR_PROFILES
+}
+
+
+def fill_author_match(target: ai_pb2.AuthorMatch, author, score: float):
+    """Fill a (sub)message from the author's template and set the score."""
+    template = AUTHOR_MATCH_TEMPLATES.get(author.name)
+    if template is None:
+        template = ai_pb2.AuthorMatch(
+            name=author.name,
+            nationality=author.nationality,
+            description=author.description,
+            fun_fact=author.fun_fact,
+        )
+    target.MergeFrom(template)
+    target.score = score
+
+
+# ============================================
+# Movie recommendations
+# ============================================
+
+class _BytesCache:
+    """Bounded LRU of serialized parts."""
+
+    def __init__(self, max_entries: int = MAX_TEMPLATE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, owner=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not owner:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, data: bytes, owner=None):
+        with self._lock:
+            self._entries[key] = (owner, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Items are keyed by identity: catalog and curated items are built once, and
+# cached AI results reuse theirs. The entry holds the item, so its id cannot
+# be reused while cached.
+_item_bytes = _BytesCache()
+_header_bytes = _BytesCache()
+
+
+def movie_item_bytes(item) -> bytes:
+    """``items`` field bytes for one MovieItem."""
+    data = _item_bytes.get(id(item), item)
+    if data is None:
+        data = ai_pb2.MovieRecommendationResult(items=[ai_pb2.MovieItem(
+            title=item.title,
+            year=item.year,
+            tagline=item.tagline,
+            imdb_id=item.imdb_id or "",
+            genres=item.genres,
+            reason=item.reason,
+            poster_url=item.poster_url or "",
+        )]).SerializeToString()
+        _item_bytes.put(id(item), data, item)
+    return data
+
+
+def movie_result_bytes(result) -> bytes:
+    """Wire bytes of a MovieRecommendationResult built from cached parts."""
+    key = (result.category, result.headline, result.description)
+    header = _header_bytes.get(key)
+    if header is None:
+        header = ai_pb2.MovieRecommendationResult(
+            category=result.category,
+            headline=result.headline,
+            description=result.description,
+        ).SerializeToString()
+        _header_bytes.put(key, header)
+
+    label = ai_pb2.MovieRecommendationResult(mood_label=result.mood_label).SerializeToString()
+    return b''.join([header, label] + [movie_item_bytes(item) for item in result.items])
+
+
+def prime_movie_templates() -> int:
+    """Serialize the static fallback parts (headers, curated and catalog items) ahead of use."""
+    catalog = get_movie_catalog()
+    items = 0
+    for category, curated in FALLBACK_MOVIES.items():
+        movie_result_bytes(MovieRecommendationResult(
+            category=category,
+            mood_label='',
+            headline=HEADLINES.get(category, HEADLINES['balanced']),
+            description=DESCRIPTIONS.get(category, DESCRIPTIONS['balanced']),
+            items=curated,
+        ))
+        for idx in catalog.query(category=category):
+            movie_item_bytes(catalog_movie_item(catalog.movies[idx], category))
+        items += len(curated) + len(catalog.query(category=category))
+    return items
@@ -2,26 +2,44 @@
 AI Analysis gRPC Server
 
 This server provides journal mood analysis using Google Gemini API.
-It exposes three RPCs:
+It exposes the following RPCs:
 - AnalyzeDaily: Analyze a single day's journal notes
+- AnalyzeDailyStream: Instant provisional daily analysis followed by the full one
 - AnalyzeWeekly: Aggregate daily summaries into a weekly report
+- MoodTrends: Numeric mood trend analytics over daily summaries (no Gemini)
 - AnalyzeWritingStyle: Analyze writing style and find author doppelgänger
+- WritingStyleTimeline: Writing style and top author match per rolling week/month window
+- GetMovieRecommendations: Mood-based movie recommendations
+- PrecomputeMovieRecommendations: Pre-warm movie recommendations in the background
+
+AdminService (only registered when ADMIN_TOKEN is set):
+- CpuProfile: Sample live Python stacks and return collapsed stacks for a flamegraph
+- MemorySnapshot: tracemalloc snapshots diffed against the previous one
+
+grpc.health.v1.Health reports NOT_SERVING until the startup warm-up finishes.
 """
 
 import os
-import json
+import hmac
 import logging
+import signal
+import threading
+import time
 from concurrent import futures
 from pathlib import Path
+from typing import Optional
 
 import grpc
 from dotenv import load_dotenv
-import google.generativeai as genai
-
 # Import generated protobuf code
 import ai_pb2
 import ai_pb2_grpc
 
+try:
+    from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+except ImportError:  # grpcio-health-checking not installed
+    health = None
+
 # Import writing style analysis functions
 from writing_style import (
     analyze_text,
@@ -32,8 +50,52 @@ from writing_style import (
 # Import movie recommendation functions
 from movie_recommendations import (
     get_movie_recommendations,
+    attach_shared_cache,
+    category_keywords,
+    get_fallback_recommendations,
+    get_movie_catalog,
+    load_recommendation_cache,
+    recommendation_cache,
+    save_recommendation_cache,
     MovieRecommendationResult,
 )
+from precompute import PrecomputeJob, RecommendationPrecomputer, grid_jobs
+
+from metrics import (
+    THREADPOOL_QUEUE_DEPTH,
+    WRITING_STYLE_DURATION,
+    WRITING_STYLE_INPUT_CHARS,
+    MetricsInterceptor,
+    start_metrics_server,
+)
+from model_router import BudgetExhausted, ModelRouter
+from mood_scorer import provisional_analysis, score_sentiment, sentiment_lexicon
+from note_fingerprint import DayFingerprint, NearDuplicateIndex, note_text
+from response_templates import (
+    PreSerialized,
+    PreSerializedInterceptor,
+    fill_author_match,
+    movie_result_bytes,
+    prime_movie_templates,
+)
+from profiling import MemoryTracker, ProfilerBusy, SamplingProfiler
+from prompt_budget import DAILY_PROMPT_TOKEN_BUDGET, NOTE_SEPARATOR, fit_notes, render_note
+from prompt_packing import DailyPromptPacker
+from state_handoff import (
+    NEAR_DUPLICATES_PATH,
+    ROUTER_STATS_PATH,
+    load_near_duplicates,
+    load_router_stats,
+    save_near_duplicates,
+    save_router_stats,
+    worker_path,
+)
+from stemming import STEM_DICTIONARY_PATH, get_stemmer, load_stem_dictionary, save_stem_dictionary
+from supervisor import supervise
+from structured_output import ANALYSIS_SCHEMA, gemini_schema, parse_structured
+from tracing import TracingInterceptor, span
+from mood_trends import compute_mood_trends
+from style_timeline import DEFAULT_STEP_DAYS, WINDOW_DAYS, style_timeline
 
 # Load environment variables from backend/.env
 env_path = Path(__file__).parent.parent / 'backend' / '.env'
@@ -48,55 +110,83 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 GRPC_PORT = os.getenv('GRPC_PORT', '50052')
+# Worker processes sharing GRPC_PORT via SO_REUSEPORT; 1 serves in-process
+GRPC_WORKERS = int(os.getenv('GRPC_WORKERS', '1'))
+# SQLite tier for the recommendation cache shared across workers
+SHARED_CACHE_DIR = os.getenv(
+    'SHARED_CACHE_DIR', str(Path(__file__).parent / 'cache' / 'shared') if GRPC_WORKERS > 1 else ''
+)
+WORKER_HEARTBEAT_INTERVAL = 2.0
+# How long a stopping server keeps serving after reporting NOT_SERVING, so load
+# balancers notice before new RPCs are refused (0 disables)
+DRAIN_NOTICE_SECONDS = float(os.getenv('DRAIN_NOTICE_SECONDS', '5'))
+# How long a stopping server lets in-flight RPCs finish before cancelling them
+DRAIN_GRACE_SECONDS = float(os.getenv('DRAIN_GRACE_SECONDS', '25'))
+# Timeout of each warm-up call that opens the Gemini connection
+WARMUP_CONNECT_TIMEOUT = float(os.getenv('WARMUP_CONNECT_TIMEOUT', '5'))
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9102'))  # 0 disables /metrics
+# Shared secret for the AdminService (x-admin-token metadata); empty disables it
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
 GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash')
+GEMINI_FAST_MODEL = os.getenv('GEMINI_FAST_MODEL', 'gemini-2.0-flash-lite')
+# Comma-separated list ordered from lightest to heaviest; overrides the two above
+GEMINI_MODELS = [
+    name.strip() for name in os.getenv('GEMINI_MODELS', '').split(',') if name.strip()
+] or [name for name in (GEMINI_FAST_MODEL, GEMINI_MODEL) if name]
+ROUTER_LIGHT_PROMPT_CHARS = int(os.getenv('ROUTER_LIGHT_PROMPT_CHARS', '2000'))
+ROUTER_LATENCY_BUDGET = float(os.getenv('ROUTER_LATENCY_BUDGET', '10'))
+GEMINI_RPM_LIMIT = float(os.getenv('GEMINI_RPM_LIMIT', '0'))  # 0 = unlimited
 GOOGLE_API_KEY = os.getenv('GOOGLE_GENAI_API_KEY', '')
+# Max SimHash distance for reusing a day's analysis after small edits (< 0 disables)
+NEAR_DUPLICATE_MAX_HAMMING = int(os.getenv('NEAR_DUPLICATE_MAX_HAMMING', '3'))
+# Pack daily analyses arriving within this window into one Gemini call (0 disables)
+DAILY_PACKING_WINDOW_MS = float(os.getenv('DAILY_PACKING_WINDOW_MS', '0'))
+DAILY_PACKING_MAX_TOKENS = int(os.getenv('DAILY_PACKING_MAX_TOKENS', '6000'))
+DAILY_PACKING_MAX_ITEMS = int(os.getenv('DAILY_PACKING_MAX_ITEMS', '8'))
+
+ANALYSIS_RESPONSE_SCHEMA = gemini_schema(ANALYSIS_SCHEMA)
+EMPTY_SUMMARY = "Tidak ada tanggapan dari AI."
 
 if not GOOGLE_API_KEY:
     logger.warning("GOOGLE_GENAI_API_KEY not set. AI analysis will fail.")
 
 
 def configure_gemini():
-    """Configure the Gemini API client."""
+    """Configure the Gemini API client and the router over the configured models."""
     if GOOGLE_API_KEY:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        return genai.GenerativeModel(GEMINI_MODEL)
+        logger.info(f"Routing Gemini calls across models: {', '.join(GEMINI_MODELS)}")
+        return ModelRouter(
+            GEMINI_MODELS,
+            light_prompt_chars=ROUTER_LIGHT_PROMPT_CHARS,
+            latency_budget=ROUTER_LATENCY_BUDGET,
+            rpm_limit=GEMINI_RPM_LIMIT,
+            api_key=GOOGLE_API_KEY,
+        )
     return None
 
 
+def format_daily_notes(notes: list, date: str = '') -> str:
+    """Render a day's notes as prompt text, compacted to the prompt token budget."""
+    return NOTE_SEPARATOR.join(
+        render_note(note, body) for note, body in fit_notes(notes, DAILY_PROMPT_TOKEN_BUDGET, date)
+    )
+
+
 def build_daily_prompt(notes: list, date: str) -> str:
     """Build the prompt for daily journal analysis."""
     if not notes:
         return f"""Anda adalah mentor journaling yang empatik. Tidak ada catatan yang ditulis pada {date}.
-Berikan tanggapan dalam format JSON dengan struktur:
-{{
-  "summary": string,
-  "dominantMood": string,
-  "moodScore": number (0-100),
-  "highlights": string[],
-  "advice": string[],
-  "affirmation": string
-}}
+Berikan tanggapan dalam format JSON.
 Gunakan bahasa Indonesia."""
 
-    notes_text = "\n\n---\n\n".join([
-        f"Waktu: {note.created_at}\nJudul: {note.title or 'Tanpa judul'}\nIsi: {note.body or '(tidak ada isi)'}"
-        for note in notes
-    ])
+    notes_text = format_daily_notes(notes, date)
 
     return f"""Anda adalah mentor journaling yang empatik. Tinjau catatan harian yang ditulis pada {date}.
 
 Catatan:
 {notes_text}
 
-Berikan tanggapan dalam format JSON dengan struktur:
-{{
-  "summary": string,
-  "dominantMood": string,
-  "moodScore": number (0-100),
-  "highlights": string[],
-  "advice": string[],
-  "affirmation": string
-}}
+Berikan tanggapan dalam format JSON.
 Gunakan bahasa Indonesia dan sertakan rujukan spesifik ke catatan saat relevan."""
 
 
@@ -104,15 +194,7 @@ def build_weekly_prompt(daily_summaries: list, week_start: str, week_end: str) -
     """Build the prompt for weekly journal analysis."""
     if not daily_summaries:
         return f"""Anda adalah analis jurnal mingguan. Tidak ada aktivitas jurnal antara {week_start} dan {week_end}.
-Berikan tanggapan dalam format JSON:
-{{
-  "summary": string,
-  "dominantMood": string,
-  "moodScore": number (0-100),
-  "highlights": string[],
-  "advice": string[],
-  "affirmation": string
-}}
+Berikan tanggapan dalam format JSON.
 Gunakan bahasa Indonesia yang hangat."""
 
     summaries_text = "\n\n---\n\n".join([
@@ -127,33 +209,30 @@ Gunakan bahasa Indonesia yang hangat."""
 Rangkuman harian:
 {summaries_text}
 
-Ringkaslah perkembangan emosi mingguan, sebutkan mood dominan, sorotan penting, saran tindak lanjut, dan afirmasi motivasi. Balas dalam format JSON:
-{{
-  "summary": string,
-  "dominantMood": string,
-  "moodScore": number (0-100),
-  "highlights": string[],
-  "advice": string[],
-  "affirmation": string
-}}
+Ringkaslah perkembangan emosi mingguan, sebutkan mood dominan, sorotan penting, saran tindak lanjut, dan afirmasi motivasi. Balas dalam format JSON.
 Gunakan bahasa Indonesia yang hangat."""
 
 
 def parse_gemini_response(text: str) -> dict:
     """Parse Gemini response text into a dictionary."""
-    try:
-        # Try to parse as JSON directly
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # If parsing fails, return a default response
-        return {
-            "summary": text.strip() if text else "Tidak ada tanggapan dari AI.",
-            "dominantMood": "unknown",
-            "moodScore": 0,
-            "highlights": [],
-            "advice": [],
-            "affirmation": None
-        }
+    # Validate against the schema, repairing truncated JSON where possible
+    data = parse_structured(text, ANALYSIS_SCHEMA)
+    if isinstance(data, dict):
+        # Valid JSON with a blank summary is still a usable analysis
+        if not data.get("summary", "").strip():
+            data["summary"] = EMPTY_SUMMARY
+        return data
+
+    # Unusable response, return a default one (flagged so it is never reused)
+    return {
+        "summary": text.strip() if text else EMPTY_SUMMARY,
+        "dominantMood": "unknown",
+        "moodScore": 0,
+        "highlights": [],
+        "advice": [],
+        "affirmation": None,
+        "_fallback": True,
+    }
 
 
 def dict_to_analysis_result(data: dict) -> ai_pb2.AnalysisResult:
@@ -168,34 +247,146 @@ def dict_to_analysis_result(data: dict) -> ai_pb2.AnalysisResult:
     )
 
 
+def writing_style_result(style) -> ai_pb2.WritingStyleResult:
+    """WritingStyleResult with the metrics of a WritingStyle (author matches are added by the caller)."""
+    return ai_pb2.WritingStyleResult(
+        total_words=style.total_words,
+        total_sentences=style.total_sentences,
+        avg_sentence_length=style.avg_sentence_length,
+        vocabulary_richness=style.vocabulary_richness,
+        punctuation_density=style.punctuation_density,
+        avg_word_length=style.avg_word_length,
+        detected_language=style.language,
+        syllables_per_word=style.syllables_per_word,
+        readability=style.readability,
+        language_breakdown=style.language_breakdown,
+        # Extract top words as simple strings
+        top_words=[f"{word} ({count}x)" for word, count in style.top_words],
+    )
+
+
+def local_sentiment(notes: list) -> tuple:
+    """Local mood score and matched (positive, negative) term sets for a day's notes."""
+    sentiment = score_sentiment("\n".join(note_text(n) for n in notes))
+    return sentiment.mood_score, (frozenset(sentiment.positive_terms), frozenset(sentiment.negative_terms))
+
+
+def patch_near_duplicate(cached: ai_pb2.AnalysisResult, cached_local_score: int, cached_terms,
+                         notes: list, distance: int) -> Optional[ai_pb2.AnalysisResult]:
+    """
+    Reuse a cached analysis, shifting its mood score by the local sentiment change.
+
+    Returns None when the edit changed which sentiment terms the day matches: a
+    small SimHash distance can still flip the meaning, so the summary is stale.
+    """
+    result = ai_pb2.AnalysisResult()
+    result.CopyFrom(cached)
+    if distance > 0:
+        local_score, terms = local_sentiment(notes)
+        if terms != cached_terms:
+            return None
+        result.mood_score = max(1, min(100, cached.mood_score + local_score - cached_local_score))
+    return result
+
+
 class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
     """Implementation of the AI Analysis gRPC service."""
 
     def __init__(self):
         self.model = configure_gemini()
+        self.precomputer = RecommendationPrecomputer(self.model) if self.model else None
+        self.near_duplicates = (
+            NearDuplicateIndex(max_distance=NEAR_DUPLICATE_MAX_HAMMING)
+            if NEAR_DUPLICATE_MAX_HAMMING >= 0 else None
+        )
+        self.packer = (
+            DailyPromptPacker(
+                self.model,
+                window_seconds=DAILY_PACKING_WINDOW_MS / 1000,
+                max_tokens=DAILY_PACKING_MAX_TOKENS,
+                max_items=DAILY_PACKING_MAX_ITEMS,
+            )
+            if self.model and DAILY_PACKING_WINDOW_MS > 0 else None
+        )
+
+    def _call_daily(self, notes: list, date: str) -> dict:
+        """One Gemini call for one day."""
+        with span('build_daily_prompt', notes=len(notes)) as stage:
+            prompt = build_daily_prompt(notes, date)
+            stage.set('prompt_chars', len(prompt))
+
+        with span('gemini_call', rpc='AnalyzeDaily') as stage:
+            response = self.model.generate_content(
+                prompt,
+                generation_config={
+                    'response_mime_type': 'application/json',
+                    'response_schema': ANALYSIS_RESPONSE_SCHEMA,
+                },
+                rpc='AnalyzeDaily'
+            )
+            stage.set('response_chars', len(response.text or ''))
+
+        with span('parse_gemini_response'):
+            return parse_gemini_response(response.text)
+
+    def _analyze_daily_with_gemini(self, request) -> ai_pb2.AnalysisResult:
+        """Run the full Gemini daily analysis (packed when enabled), reusing it for near-duplicate note sets."""
+        notes = list(request.notes)
+
+        fingerprint = None
+        if self.near_duplicates is not None and notes:
+            with span('near_duplicate_lookup') as stage:
+                fingerprint = DayFingerprint.from_notes(notes)
+                hit = self.near_duplicates.lookup(request.user_id, request.date, fingerprint)
+                stage.set('hit', bool(hit))
+            if hit:
+                (cached, cached_local_score, cached_terms), distance = hit
+                patched = patch_near_duplicate(cached, cached_local_score, cached_terms, notes, distance)
+                if patched is not None:
+                    logger.info(f"Reusing daily analysis for near-duplicate notes on {request.date} "
+                                f"(distance {distance})")
+                    return patched
+                logger.info(f"Near-duplicate notes on {request.date} changed sentiment, re-analyzing")
+
+        if self.packer is not None and notes:
+            with span('packed_gemini_call'):
+                result_dict = self.packer.submit(
+                    format_daily_notes(notes, request.date),
+                    request.date,
+                    fallback=lambda: self._call_daily(notes, request.date)
+                )
+        else:
+            result_dict = self._call_daily(notes, request.date)
+        logger.info(f"Daily analysis completed for {request.date}")
+        with span('dict_to_analysis_result'):
+            result = dict_to_analysis_result(result_dict)
+
+        # Only a successfully parsed analysis is worth reusing for later edits of the day
+        if fingerprint is not None and not result_dict.get("_fallback"):
+            local_score, terms = local_sentiment(notes)
+            self.near_duplicates.add(request.user_id, request.date, fingerprint, (result, local_score, terms))
+        return result
+
+    def _provisional_daily(self, request) -> ai_pb2.AnalysisResult:
+        """Instant local estimate of the day's mood."""
+        result = dict_to_analysis_result(provisional_analysis(list(request.notes), request.date))
+        result.provisional = True
+        return result
 
     def AnalyzeDaily(self, request, context):
         """Analyze a single day's journal notes."""
         logger.info(f"AnalyzeDaily called for user {request.user_id}, date {request.date}")
 
         if not self.model:
-            context.set_code(grpc.StatusCode.UNAVAILABLE)
-            context.set_details("Gemini API not configured")
-            return ai_pb2.AnalysisResult()
+            logger.info("Gemini API not configured, returning provisional daily analysis")
+            return self._provisional_daily(request)
 
         try:
-            prompt = build_daily_prompt(list(request.notes), request.date)
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json"
-                )
-            )
+            return self._analyze_daily_with_gemini(request)
 
-            result_dict = parse_gemini_response(response.text)
-            logger.info(f"Daily analysis completed for {request.date}")
-            return dict_to_analysis_result(result_dict)
+        except BudgetExhausted:
+            logger.warning(f"Gemini budget exhausted, returning provisional analysis for {request.date}")
+            return self._provisional_daily(request)
 
         except Exception as e:
             logger.error(f"Error in AnalyzeDaily: {e}")
@@ -206,6 +397,26 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
                 dominant_mood="error"
             )
 
+    def AnalyzeDailyStream(self, request, context):
+        """Stream a provisional local analysis, then the full Gemini analysis."""
+        logger.info(f"AnalyzeDailyStream called for user {request.user_id}, date {request.date}")
+
+        yield self._provisional_daily(request)
+
+        if not self.model:
+            return
+
+        try:
+            yield self._analyze_daily_with_gemini(request)
+
+        except BudgetExhausted:
+            logger.warning(f"Gemini budget exhausted, keeping provisional analysis for {request.date}")
+
+        except Exception as e:
+            logger.error(f"Error in AnalyzeDailyStream: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+
     def AnalyzeWeekly(self, request, context):
         """Analyze a week based on daily summaries."""
         logger.info(f"AnalyzeWeekly called for user {request.user_id}, "
@@ -225,9 +436,11 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
 
             response = self.model.generate_content(
                 prompt,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json"
-                )
+                generation_config={
+                    'response_mime_type': 'application/json',
+                    'response_schema': ANALYSIS_RESPONSE_SCHEMA,
+                },
+                rpc='AnalyzeWeekly'
             )
 
             result_dict = parse_gemini_response(response.text)
@@ -243,6 +456,49 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
                 dominant_mood="error"
             )
 
+    def MoodTrends(self, request, context):
+        """Compute mood trend analytics from daily summaries without Gemini."""
+        logger.info(f"MoodTrends called for user {request.user_id} "
+                    f"with {len(request.daily_summaries)} daily summaries")
+
+        try:
+            trends = compute_mood_trends(list(request.daily_summaries), request.window or 7)
+
+            points = []
+            for i, date in enumerate(trends.dates):
+                points.append(ai_pb2.MoodTrendPoint(
+                    date=date,
+                    mood_score=int(trends.scores[i]),
+                    moving_average=trends.moving_average[i],
+                    rolling_stddev=trends.rolling_stddev[i],
+                    z_score=trends.z_scores[i],
+                    anomaly=bool(trends.anomalies[i])
+                ))
+
+            return ai_pb2.MoodTrendsResult(
+                days=trends.days,
+                average=trends.average,
+                volatility=trends.volatility,
+                trend_slope=trends.trend_slope,
+                best_day=trends.best_day,
+                worst_day=trends.worst_day,
+                longest_positive_streak=trends.longest_positive_streak,
+                longest_negative_streak=trends.longest_negative_streak,
+                current_streak=trends.current_streak,
+                points=points,
+                histogram=[
+                    ai_pb2.MoodHistogramBin(lower=lower, upper=upper, count=count)
+                    for lower, upper, count in trends.histogram
+                ],
+                mood_counts=trends.mood_counts
+            )
+
+        except Exception as e:
+            logger.error(f"Error in MoodTrends: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ai_pb2.MoodTrendsResult()
+
     def AnalyzeWritingStyle(self, request, context):
         """Analyze writing style and find the closest author match."""
         logger.info(f"AnalyzeWritingStyle called for user {request.user_id}, "
@@ -258,7 +514,9 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
                 return ai_pb2.WritingStyleResult()
 
             # Analyze the text
-            style = analyze_text(combined_text)
+            WRITING_STYLE_INPUT_CHARS.observe(len(combined_text))
+            with WRITING_STYLE_DURATION.time(), span('analyze_text', chars=len(combined_text)):
+                style = analyze_text(combined_text, entries=list(request.texts))
             
             if not style:
                 context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
@@ -266,44 +524,18 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
                 return ai_pb2.WritingStyleResult()
 
             # Find author matches
-            matches = find_doppelganger(style)
-            
-            # Build the response
-            top_author, top_score = matches[0]
-            top_match = ai_pb2.AuthorMatch(
-                name=top_author.name,
-                nationality=top_author.nationality,
-                score=top_score,
-                description=top_author.description,
-                fun_fact=top_author.fun_fact
-            )
-            
-            other_matches = []
-            for author, score in matches[1:5]:  # Top 4 runner-ups
-                other_matches.append(ai_pb2.AuthorMatch(
-                    name=author.name,
-                    nationality=author.nationality,
-                    score=score,
-                    description=author.description,
-                    fun_fact=author.fun_fact
-                ))
-            
-            # Extract top words as simple strings
-            top_words = [f"{word} ({count}x)" for word, count in style.top_words]
-            
-            result = ai_pb2.WritingStyleResult(
-                total_words=style.total_words,
-                total_sentences=style.total_sentences,
-                avg_sentence_length=style.avg_sentence_length,
-                vocabulary_richness=style.vocabulary_richness,
-                punctuation_density=style.punctuation_density,
-                avg_word_length=style.avg_word_length,
-                detected_language=style.language,
-                top_words=top_words,
-                top_match=top_match,
-                other_matches=other_matches
-            )
+            with span('find_doppelganger', authors=len(AUTHOR_PROFILES)):
+                matches = find_doppelganger(style)
             
+            with span('build_response'):
+                # Build the response
+                top_author, top_score = matches[0]
+                result = writing_style_result(style)
+                # Static author fields come from prebuilt templates
+                fill_author_match(result.top_match, top_author, top_score)
+                for author, score in matches[1:5]:  # Top 4 runner-ups
+                    fill_author_match(result.other_matches.add(), author, score)
+
             logger.info(f"Writing style analysis completed for user {request.user_id}. "
                        f"Top match: {top_author.name} ({top_score:.1f}%)")
             return result
@@ -314,6 +546,48 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
             context.set_details(str(e))
             return ai_pb2.WritingStyleResult()
 
+    def WritingStyleTimeline(self, request, context):
+        """Writing style and top author match per rolling window of dated entries."""
+        logger.info(f"WritingStyleTimeline called for user {request.user_id} "
+                    f"with {len(request.entries)} entries")
+
+        window_days = WINDOW_DAYS.get(request.window or 'month')
+        step_days = request.step_days or DEFAULT_STEP_DAYS
+        if window_days is None or not 1 <= step_days <= window_days:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(
+                f"window must be one of {', '.join(WINDOW_DAYS)} and step_days between 1 and window_days (0 for default)"
+            )
+            return ai_pb2.WritingStyleTimelineResult()
+        entries = [(entry.date, entry.text) for entry in request.entries]
+        try:
+            with span('style_timeline', entries=len(entries)):
+                windows = style_timeline(entries, window_days, step_days)
+        except (ValueError, OverflowError) as e:
+            # Malformed dates, or dates so close to 9999-12-31 that a window ends past it
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Invalid entry date: {e}")
+            return ai_pb2.WritingStyleTimelineResult()
+
+        try:
+            result = ai_pb2.WritingStyleTimelineResult()
+            for window in windows:
+                item = result.windows.add(
+                    start_date=window.start.isoformat(),
+                    end_date=window.end.isoformat(),
+                    entries=window.entries,
+                )
+                item.style.CopyFrom(writing_style_result(window.style))
+                top_author, top_score = find_doppelganger(window.style)[0]
+                fill_author_match(item.style.top_match, top_author, top_score)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in WritingStyleTimeline: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ai_pb2.WritingStyleTimelineResult()
+
     def GetMovieRecommendations(self, request, context):
         """Get movie recommendations based on mood analysis."""
         logger.info(f"GetMovieRecommendations called for user {request.user_id}, "
@@ -327,29 +601,12 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
                 mood_score=request.mood_score if request.mood_score > 0 else None,
                 summary=request.summary,
                 highlights=list(request.highlights) if request.highlights else [],
-                affirmation=request.affirmation
+                affirmation=request.affirmation,
+                user_id=request.user_id
             )
 
-            # Convert to protobuf message
-            movie_items = []
-            for item in result.items:
-                movie_items.append(ai_pb2.MovieItem(
-                    title=item.title,
-                    year=item.year,
-                    tagline=item.tagline,
-                    imdb_id=item.imdb_id or "",
-                    genres=item.genres,
-                    reason=item.reason,
-                    poster_url=item.poster_url or ""
-                ))
-
-            response = ai_pb2.MovieRecommendationResult(
-                category=result.category,
-                mood_label=result.mood_label,
-                headline=result.headline,
-                description=result.description,
-                items=movie_items
-            )
+            # Serialized from cached parts (static headers and items) plus the mood label
+            response = PreSerialized(movie_result_bytes(result))
 
             logger.info(f"Movie recommendations completed for user {request.user_id}. "
                        f"Category: {result.category}, Items: {len(result.items)}")
@@ -361,24 +618,329 @@ class AIAnalysisServicer(ai_pb2_grpc.AIAnalysisServiceServicer):
             context.set_details(str(e))
             return ai_pb2.MovieRecommendationResult()
 
+    def PrecomputeMovieRecommendations(self, request, context):
+        """Queue background generation of movie recommendations."""
+        logger.info(f"PrecomputeMovieRecommendations called with {len(request.requests)} user requests")
 
-def serve():
-    """Start the gRPC server."""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    ai_pb2_grpc.add_AIAnalysisServiceServicer_to_server(
-        AIAnalysisServicer(), server
+        if not self.precomputer:
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details("Gemini API not configured")
+            return ai_pb2.PrecomputeRecommendationsResult()
+
+        try:
+            if request.requests:
+                jobs = [
+                    PrecomputeJob(
+                        mood=r.dominant_mood,
+                        mood_score=r.mood_score if r.mood_score > 0 else None,
+                        summary=r.summary,
+                        highlights=list(r.highlights),
+                        affirmation=r.affirmation,
+                        user_id=r.user_id,
+                    )
+                    for r in request.requests
+                ]
+            else:
+                jobs = grid_jobs(request.results_per_key or recommendation_cache.pool_size)
+
+            queued = self.precomputer.submit(jobs)
+            return ai_pb2.PrecomputeRecommendationsResult(
+                queued=queued,
+                pending=self.precomputer.pending()
+            )
+
+        except Exception as e:
+            logger.error(f"Error in PrecomputeMovieRecommendations: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ai_pb2.PrecomputeRecommendationsResult()
+
+
+class AdminServicer(ai_pb2_grpc.AdminServiceServicer):
+    """Admin-only live diagnostics, authenticated by the x-admin-token header."""
+
+    def __init__(self, token: str):
+        self.token = token
+        self.profiler = SamplingProfiler()
+        self.memory = MemoryTracker()
+
+    def _authorize(self, context):
+        supplied = dict(context.invocation_metadata()).get('x-admin-token', '')
+        if not hmac.compare_digest(supplied.encode(), self.token.encode()):
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, "Invalid admin token")
+
+    def CpuProfile(self, request, context):
+        """Sample the live server's stacks for a few seconds."""
+        self._authorize(context)
+        logger.info(f"CpuProfile called for {request.seconds or 5:.1f}s")
+
+        try:
+            collapsed, samples, duration = self.profiler.profile(
+                request.seconds or 5.0,
+                request.sample_hz or 100,
+                request.include_idle
+            )
+            return ai_pb2.CpuProfileResult(
+                collapsed_stacks=collapsed,
+                samples=samples,
+                duration=duration
+            )
+
+        except ProfilerBusy as e:
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(str(e))
+            return ai_pb2.CpuProfileResult()
+
+    def MemorySnapshot(self, request, context):
+        """Start/stop allocation tracing or take a snapshot diffed against the previous one."""
+        self._authorize(context)
+        action = request.action or 'snapshot'
+        logger.info(f"MemorySnapshot called with action {action}")
+
+        if action == 'start':
+            self.memory.start(request.frames or 1)
+        elif action == 'stop':
+            self.memory.stop()
+        elif action != 'snapshot':
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Unknown action: {action}")
+            return ai_pb2.MemorySnapshotResult()
+
+        stats, has_diff = [], False
+        if action == 'snapshot':
+            if not self.memory.tracing:
+                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                context.set_details("Allocation tracing is not running; send action 'start' first")
+                return ai_pb2.MemorySnapshotResult()
+            stats, has_diff = self.memory.snapshot(request.top or 25, request.group_by or 'lineno')
+
+        traced, peak = self.memory.usage()
+        return ai_pb2.MemorySnapshotResult(
+            tracing=self.memory.tracing,
+            traced_bytes=traced,
+            peak_bytes=peak,
+            has_diff=has_diff,
+            stats=[
+                ai_pb2.MemoryStat(
+                    location=stat.location,
+                    size_bytes=stat.size,
+                    size_diff_bytes=stat.size_diff,
+                    count=stat.count,
+                    count_diff=stat.count_diff
+                )
+                for stat in stats
+            ]
+        )
+
+
+def _report_heartbeat(heartbeat):
+    """Tell the supervisor this worker is alive.
+
+    Runs on its own thread rather than through the RPC thread pool: a pool busy
+    with slow Gemini calls or a long CpuProfile is loaded, not hung, and must
+    not get the worker killed along with its in-flight requests.
+    """
+    while True:
+        heartbeat.value = time.time()
+        time.sleep(WORKER_HEARTBEAT_INTERVAL)
+
+
+# ============================================
+# Warm-up and readiness
+# ============================================
+
+# Services whose health status follows warm-up ('' is the whole server)
+HEALTH_SERVICES = ('', ai_pb2.DESCRIPTOR.services_by_name['AIAnalysisService'].full_name)
+
+WARMUP_DATE = '2024-01-01'
+WARMUP_NOTES = [
+    ai_pb2.JournalNote(
+        id=1,
+        title='Hari yang panjang',
+        body='Pagi ini aku senang banget karena presentasi berjalan lancar dan timku memberi banyak pujian. '
+             'Sore harinya aku agak cemas memikirkan deadline minggu depan, tapi aku mencoba tetap tenang. '
+             'Malam ini aku menulis jurnal sambil minum teh hangat.',
+        created_at='2024-01-01T20:00:00',
+    ),
+]
+WARMUP_RESPONSE = (
+    '{"summary": "Hari yang produktif.", "dominantMood": "senang", "moodScore": 72, '
+    '"highlights": ["Presentasi lancar"], "advice": ["Istirahat cukup"], "affirmation": "Kamu hebat."}'
+)
+
+
+def set_serving(health_servicer, serving: bool):
+    if health_servicer is None:
+        return
+    status = health_pb2.HealthCheckResponse.SERVING if serving else health_pb2.HealthCheckResponse.NOT_SERVING
+    for service in HEALTH_SERVICES:
+        health_servicer.set(service, status)
+
+
+def exercise_local_paths():
+    """Run one synthetic request through the local code paths (regex compiles, lazy tables)."""
+    build_daily_prompt(WARMUP_NOTES, WARMUP_DATE)
+    provisional_analysis(WARMUP_NOTES, WARMUP_DATE)
+    DayFingerprint.from_notes(WARMUP_NOTES)
+    dict_to_analysis_result(parse_gemini_response(WARMUP_RESPONSE))
+    style = analyze_text(' '.join(note.body for note in WARMUP_NOTES))
+    if style:
+        find_doppelganger(style)
+    get_fallback_recommendations('senang', 72)
+
+
+def warm_up(servicer: AIAnalysisServicer, health_servicer=None, worker_index: int = None):
+    """Prime what the first requests would otherwise pay for, then report SERVING."""
+    start = time.monotonic()
+    steps = [
+        ('recommendation cache', load_recommendation_cache),
+        ('saved state', lambda: load_saved_state(servicer, worker_index)),
+        ('lexicons and catalog', lambda: (category_keywords(), sentiment_lexicon(), get_movie_catalog())),
+        ('stemmer', get_stemmer),
+        ('local code paths', exercise_local_paths),
+        ('response templates', prime_movie_templates),
+    ]
+    if servicer.model is not None:
+        steps.append(('Gemini connection', lambda: servicer.model.connect(WARMUP_CONNECT_TIMEOUT)))
+
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            # Readiness must not hang on a failed step; whatever is missing loads on first use
+            logger.warning(f"Warm-up step '{name}' failed: {e}")
+
+    set_serving(health_servicer, True)
+    logger.info(f"Warm-up finished in {time.monotonic() - start:.2f}s, now serving")
+
+
+# ============================================
+# Drain and state handoff
+# ============================================
+
+def load_saved_state(servicer: AIAnalysisServicer, worker_index: int = None):
+    load_stem_dictionary(worker_path(STEM_DICTIONARY_PATH, worker_index))
+    if servicer.model is not None:
+        load_router_stats(servicer.model, worker_path(ROUTER_STATS_PATH, worker_index))
+    if servicer.near_duplicates is not None:
+        load_near_duplicates(servicer.near_duplicates, worker_path(NEAR_DUPLICATES_PATH, worker_index))
+
+
+def save_state(servicer: AIAnalysisServicer, worker_index: int = None):
+    """Snapshot hot caches and learned statistics for the next process (the same worker slot)."""
+    steps = [
+        ('recommendation cache', save_recommendation_cache),
+        ('stem dictionary', lambda: save_stem_dictionary(worker_path(STEM_DICTIONARY_PATH, worker_index))),
+    ]
+    if servicer.model is not None:
+        steps.append(('router stats', lambda: save_router_stats(
+            servicer.model, worker_path(ROUTER_STATS_PATH, worker_index))))
+    if servicer.near_duplicates is not None:
+        steps.append(('near-duplicate index', lambda: save_near_duplicates(
+            servicer.near_duplicates, worker_path(NEAR_DUPLICATES_PATH, worker_index))))
+
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Could not save {name}: {e}")
+
+
+def drain(server, servicer: AIAnalysisServicer, health_servicer=None, worker_index: int = None,
+          notice=None):
+    """Report NOT_SERVING, keep serving for the notice period, then stop taking new RPCs,
+    let in-flight ones finish within the grace period and save state.
+
+    ``notice`` is an Event that cuts the notice period short when set.
+    """
+    if health_servicer is not None:
+        health_servicer.enter_graceful_shutdown()
+        # Load balancers only see NOT_SERVING at their next health check; until
+        # then new requests still arrive and must be served, not refused
+        logger.info(f"Draining: reporting NOT_SERVING, still serving for {DRAIN_NOTICE_SECONDS:.0f}s")
+        if notice is not None:
+            notice.wait(DRAIN_NOTICE_SECONDS)
+        else:
+            time.sleep(DRAIN_NOTICE_SECONDS)
+
+    logger.info(f"Draining: refusing new RPCs, waiting up to {DRAIN_GRACE_SECONDS:.0f}s for in-flight ones")
+    start = time.monotonic()
+    server.stop(DRAIN_GRACE_SECONDS).wait()
+    logger.info(f"Drained in {time.monotonic() - start:.1f}s")
+
+    if servicer.precomputer is not None and servicer.precomputer.pending():
+        logger.info(f"Dropping {servicer.precomputer.pending()} queued precompute jobs")
+    save_state(servicer, worker_index)
+
+
+def run_server(worker_index: int = None, heartbeat=None):
+    """Run one gRPC server; ``worker_index`` is set when running under the supervisor."""
+    if SHARED_CACHE_DIR:
+        attach_shared_cache(Path(SHARED_CACHE_DIR) / 'recommendations.sqlite3')
+
+    executor = futures.ThreadPoolExecutor(max_workers=10)
+    THREADPOOL_QUEUE_DEPTH.set_function(executor._work_queue.qsize)
+    server = grpc.server(
+        executor,
+        # PreSerializedInterceptor goes last so it wraps the servicer's own handlers
+        interceptors=[MetricsInterceptor(), TracingInterceptor(), PreSerializedInterceptor()],
+        options=[('grpc.so_reuseport', 1 if worker_index is not None else 0)],
     )
+    servicer = AIAnalysisServicer()
+    ai_pb2_grpc.add_AIAnalysisServiceServicer_to_server(servicer, server)
+    if ADMIN_TOKEN:
+        ai_pb2_grpc.add_AdminServiceServicer_to_server(AdminServicer(ADMIN_TOKEN), server)
+        logger.info("Admin diagnostics service enabled")
+
+    # Reports NOT_SERVING until warm-up has finished, so load balancers hold traffic back
+    health_servicer = None
+    if health is not None:
+        health_servicer = health.HealthServicer()
+        health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+        set_serving(health_servicer, False)
+    else:
+        logger.warning("grpcio-health-checking not installed; readiness is not reported")
 
     server.add_insecure_port(f'[::]:{GRPC_PORT}')
     server.start()
-    logger.info(f"AI Analysis gRPC server started on port {GRPC_PORT}")
+    worker = f" (worker {worker_index}, pid {os.getpid()})" if worker_index is not None else ""
+    logger.info(f"AI Analysis gRPC server started on port {GRPC_PORT}{worker}")
+    threading.Thread(
+        target=warm_up, args=(servicer, health_servicer, worker_index), name='warm-up', daemon=True
+    ).start()
+
+    if METRICS_PORT:
+        # Each worker exposes its own registry on consecutive ports
+        start_metrics_server(METRICS_PORT + (worker_index or 0))
+
+    if heartbeat is not None:
+        threading.Thread(
+            target=_report_heartbeat, args=(heartbeat,), name='heartbeat', daemon=True
+        ).start()
+
+    stop_requested = threading.Event()
+    interrupted = threading.Event()
 
-    try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
-        logger.info("Shutting down server...")
-        server.stop(0)
+    def request_stop(signum, frame):
+        if stop_requested.is_set() and signum == signal.SIGINT:
+            logger.warning("Interrupted again, cancelling in-flight RPCs")
+            interrupted.set()
+            server.stop(0)
+        stop_requested.set()
 
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    stop_requested.wait()
+    drain(server, servicer, health_servicer, worker_index, notice=interrupted)
+
+
+def serve():
+    """Start the gRPC server, or a supervised pool of workers when GRPC_WORKERS > 1."""
+    if GRPC_WORKERS > 1:
+        # Workers need the drain notice and grace periods plus time to save their state
+        supervise(run_server, GRPC_WORKERS, stop_timeout=DRAIN_NOTICE_SECONDS + DRAIN_GRACE_SECONDS + 10)
+    else:
+        run_server()
 
 if __name__ == '__main__':
     serve()
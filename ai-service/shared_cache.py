@@ -0,0 +1,94 @@
+"""
+🗄️ Shared Cache Tier
+
+A small SQLite-backed store that lets the worker processes of one host share
+cached results. Each process keeps its fast in-memory cache, and this tier
+sits behind it: results are written through on insert and pulled in when a
+process's local pool for a key is not yet complete.
+
+Entries are pools of members per ``(namespace, key)``, each with a wall-clock
+timestamp so expiry works across processes and restarts. The database uses
+WAL mode, so readers in every worker run concurrently with a writer.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    member TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key, member)
+)
+"""
+
+
+class SharedCache:
+    """Pools of JSON payloads shared between processes through SQLite."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections are not thread-safe
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def _key(key) -> str:
+        return json.dumps(list(key) if isinstance(key, tuple) else key, ensure_ascii=False)
+
+    def add(self, namespace: str, key, member: str, payload: dict):
+        """Insert or refresh one member of a key's pool."""
+        try:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                (namespace, self._key(key), member, json.dumps(payload, ensure_ascii=False), time.time()),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write failed: {e}")
+
+    def members(self, namespace: str, key, max_age: float, limit: int) -> list:
+        """Return ``[(age_seconds, payload), ...]`` newest first, skipping expired members."""
+        now = time.time()
+        try:
+            rows = self._connection().execute(
+                'SELECT stored_at, payload FROM entries '
+                'WHERE namespace = ? AND key = ? AND stored_at >= ? '
+                'ORDER BY stored_at DESC LIMIT ?',
+                (namespace, self._key(key), now - max_age, limit),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            return []
+        return [(now - stored_at, json.loads(payload)) for stored_at, payload in rows]
+
+    def purge(self, namespace: str, max_age: float) -> int:
+        """Delete expired members; returns rows removed."""
+        try:
+            cursor = self._connection().execute(
+                'DELETE FROM entries WHERE namespace = ? AND stored_at < ?',
+                (namespace, time.time() - max_age),
+            )
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache purge failed: {e}")
+            return 0
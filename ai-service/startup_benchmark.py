@@ -0,0 +1,134 @@
+"""
+⏱️ Startup Benchmark
+
+Measures how quickly a fresh AI service process becomes useful:
+
+    - import time of ``server`` from ``python -X importtime``, with the
+      heaviest modules it pulls in
+    - time from launching ``server.py`` to the first successfully served RPC
+      (a ``MoodTrends`` call, which needs no Gemini access)
+
+Each measurement is repeated and the fastest run is reported, to reduce
+noise from the OS page cache. Exits non-zero when a budget is exceeded, so
+it can gate CI or a deploy.
+
+Usage:
+    python startup_benchmark.py
+    python startup_benchmark.py --import-budget-ms 300 --first-rpc-budget-ms 1000 --runs 5
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import grpc
+
+import ai_pb2
+import ai_pb2_grpc
+
+SERVICE_DIR = Path(__file__).parent
+DEFAULT_IMPORT_BUDGET_MS = float(os.getenv('STARTUP_IMPORT_BUDGET_MS', '400'))
+DEFAULT_FIRST_RPC_BUDGET_MS = float(os.getenv('STARTUP_FIRST_RPC_BUDGET_MS', '1500'))
+FIRST_RPC_TIMEOUT_SECONDS = 30.0
+
+
+def measure_import_time() -> tuple:
+    """Return ``(total_ms, [(cumulative_ms, module), ...])`` for ``import server``."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import server'],
+        cwd=SERVICE_DIR, capture_output=True, text=True, check=True,
+    )
+    total_ms, modules = 0.0, []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        depth = len(name) - len(name.lstrip()) - 1
+        cumulative_ms = int(cumulative) / 1000
+        if name.strip() == 'server' and depth == 0:
+            total_ms = cumulative_ms
+        elif depth == 2:  # imported directly by server
+            modules.append((cumulative_ms, name.strip()))
+    return total_ms, sorted(modules, reverse=True)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def measure_first_rpc() -> float:
+    """Milliseconds from launching the server to its first successful RPC."""
+    port = free_port()
+    env = dict(os.environ, GRPC_PORT=str(port), GRPC_WORKERS='1', METRICS_PORT='0')
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, 'server.py'], cwd=SERVICE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with grpc.insecure_channel(f'localhost:{port}') as channel:
+            stub = ai_pb2_grpc.AIAnalysisServiceStub(channel)
+            request = ai_pb2.MoodTrendsRequest(user_id='startup-benchmark')
+            while time.perf_counter() - start < FIRST_RPC_TIMEOUT_SECONDS:
+                if process.poll() is not None:
+                    raise RuntimeError(f"server.py exited with code {process.returncode}")
+                try:
+                    stub.MoodTrends(request, timeout=1.0, wait_for_ready=False)
+                    return (time.perf_counter() - start) * 1000
+                except grpc.RpcError as e:
+                    if e.code() not in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED):
+                        raise
+                time.sleep(0.01)
+        raise RuntimeError(f"No RPC served within {FIRST_RPC_TIMEOUT_SECONDS:.0f}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure AI service cold start against a budget')
+    parser.add_argument('--import-budget-ms', type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help='Budget for importing server.py')
+    parser.add_argument('--first-rpc-budget-ms', type=float, default=DEFAULT_FIRST_RPC_BUDGET_MS,
+                        help='Budget from process launch to the first served RPC')
+    parser.add_argument('--runs', type=int, default=3, help='Repetitions; the fastest run counts')
+    parser.add_argument('--top', type=int, default=10, help='Heaviest direct imports to list')
+    args = parser.parse_args()
+    runs = max(1, args.runs)
+
+    import_ms, modules = min((measure_import_time() for _ in range(runs)), key=lambda r: r[0])
+    first_rpc_ms = min(measure_first_rpc() for _ in range(runs))
+
+    print("\n" + "=" * 60)
+    print("⏱️  AI SERVICE STARTUP")
+    print("=" * 60)
+    print(f"\n📦 import server: {import_ms:.0f} ms (budget {args.import_budget_ms:.0f} ms)")
+    for cumulative_ms, name in modules[:args.top]:
+        print(f"   {cumulative_ms:8.1f} ms  {name}")
+    print(f"\n🚀 Launch to first RPC: {first_rpc_ms:.0f} ms (budget {args.first_rpc_budget_ms:.0f} ms)")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import time {import_ms:.0f} ms > {args.import_budget_ms:.0f} ms")
+    if first_rpc_ms > args.first_rpc_budget_ms:
+        failures.append(f"time to first RPC {first_rpc_ms:.0f} ms > {args.first_rpc_budget_ms:.0f} ms")
+
+    if failures:
+        print(f"\n❌ Startup over budget: {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Startup within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+💾 State Handoff
+
+Snapshots of learned in-memory state, written when a server drains and
+loaded by the next process during warm-up, so a deploy does not start cold:
+
+    - Gemini router statistics (latency / error EWMAs and cooldowns), so
+      routing keeps avoiding a slow model instead of relearning it.
+    - The near-duplicate index of analyzed days, so edited drafts keep
+      reusing their earlier analyses.
+
+The movie recommendation cache has its own file (``save_recommendation_cache``).
+Under the supervisor every worker keeps its own snapshot files
+(``worker_path``), so workers neither overwrite each other's state nor all
+start from the state of whichever worker drained last. Snapshots older than
+``STATE_MAX_AGE_SECONDS`` are ignored, since stale latency statistics would
+mislead routing.
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import ai_pb2
+from note_fingerprint import DayFingerprint
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = Path(os.getenv('STATE_DIR', str(Path(__file__).parent / 'cache')))
+ROUTER_STATS_PATH = STATE_DIR / 'router_stats.json'
+NEAR_DUPLICATES_PATH = STATE_DIR / 'near_duplicates.json'
+STATE_MAX_AGE_SECONDS = float(os.getenv('STATE_MAX_AGE_SECONDS', '3600'))
+
+
+def worker_path(path, worker_index: int = None):
+    """``path`` for one supervised worker (``router_stats.worker-2.json``); unchanged outside the supervisor."""
+    if worker_index is None or not path:
+        return path
+    named = Path(path).with_name(f'{Path(path).stem}.worker-{worker_index}{Path(path).suffix}')
+    return named if isinstance(path, Path) else str(named)
+
+
+def write_json(path: Path, data):
+    """Write atomically; each process uses its own temp file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    tmp.replace(path)
+
+
+def read_snapshot(path: Path):
+    """Return ``(data, age_seconds)`` of a snapshot file, or None if missing, unreadable or stale."""
+    try:
+        snapshot = json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Could not load state snapshot from {path}: {e}")
+        return None
+
+    age = time.time() - snapshot.get('savedAt', 0)
+    if age > STATE_MAX_AGE_SECONDS:
+        logger.info(f"Ignoring state snapshot {path} ({age:.0f}s old)")
+        return None
+    return snapshot.get('data'), max(0.0, age)
+
+
+# ============================================
+# Router statistics
+# ============================================
+
+def save_router_stats(router, path: Path = ROUTER_STATS_PATH) -> int:
+    stats = router.snapshot()
+    write_json(path, {'savedAt': time.time(), 'data': stats})
+    logger.info(f"Saved Gemini router stats for {len(stats)} models to {path}")
+    return len(stats)
+
+
+def load_router_stats(router, path: Path = ROUTER_STATS_PATH) -> int:
+    loaded = read_snapshot(path)
+    if loaded is None:
+        return 0
+    data, age = loaded
+    restored = router.restore(data, elapsed=age)
+    logger.info(f"Restored Gemini router stats for {restored} models from {path}")
+    return restored
+
+
+# ============================================
+# Near-duplicate index
+# ============================================
+
+def save_near_duplicates(index, path: Path = NEAR_DUPLICATES_PATH) -> int:
+    """Payloads are ``(AnalysisResult, local_score, (positive_terms, negative_terms))`` triples."""
+    entries = [
+        {
+            'key': list(key),
+            'entries': [
+                {
+                    'day': fingerprint.day,
+                    'notes': list(fingerprint.notes),
+                    'result': base64.b64encode(result.SerializeToString()).decode('ascii'),
+                    'localScore': local_score,
+                    'terms': [sorted(terms[0]), sorted(terms[1])],
+                }
+                for fingerprint, (result, local_score, terms) in day_entries
+            ],
+        }
+        for key, day_entries in index.snapshot()
+    ]
+    write_json(path, {'savedAt': time.time(), 'data': entries})
+    logger.info(f"Saved {len(entries)} near-duplicate days to {path}")
+    return len(entries)
+
+
+def load_near_duplicates(index, path: Path = NEAR_DUPLICATES_PATH) -> int:
+    loaded = read_snapshot(path)
+    if loaded is None:
+        return 0
+    data, _ = loaded
+    snapshot = [
+        (tuple(entry['key']), [
+            (
+                DayFingerprint(day=item['day'], notes=tuple(item['notes'])),
+                (
+                    ai_pb2.AnalysisResult.FromString(base64.b64decode(item['result'])),
+                    item['localScore'],
+                    # Snapshots without terms never match, so those days are re-analyzed once
+                    tuple(frozenset(t) for t in item['terms']) if 'terms' in item else None,
+                ),
+            )
+            for item in entry['entries']
+        ])
+        for entry in data
+    ]
+    restored = index.restore(snapshot)
+    logger.info(f"Restored {restored} near-duplicate days from {path}")
+    return restored
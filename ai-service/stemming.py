@@ -0,0 +1,145 @@
+"""
+🌱 Indonesian Stemming
+
+Reduces inflected Indonesian words to their root ("makanan", "dimakan" ->
+"makan") with the Sastrawi stemmer, so vocabulary and top-word statistics
+count words rather than surface forms.
+
+Sastrawi strips affixes by trying rule after rule against its dictionary,
+which is slow per token. Words are therefore stemmed once per distinct type,
+never per token, and the stems are kept in a bounded per-process LRU. The
+stems can be persisted to a dictionary file (``STEM_DICTIONARY_PATH``) so a
+new process starts with the vocabulary of earlier ones; the file is also
+used, for the words it holds, when Sastrawi is not installed.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Distinct words whose stems are kept in memory
+STEM_CACHE_MAX_WORDS = int(os.getenv('STEM_CACHE_MAX_WORDS', '50000'))
+# Where stems are persisted across restarts; empty disables the file
+STEM_DICTIONARY_PATH = os.getenv(
+    'STEM_DICTIONARY_PATH', str(Path(__file__).parent / 'cache' / 'stem_dictionary.json')
+)
+
+
+@lru_cache(maxsize=1)
+def get_stemmer():
+    """Sastrawi's stemmer, created on first use (it loads a 30k-word dictionary); None if not installed."""
+    try:
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+    except ImportError:
+        logger.info("Sastrawi not installed; Indonesian words are not stemmed")
+        return None
+    stemmer = StemmerFactory().create_stemmer()
+    # Bypass Sastrawi's own result cache, which grows without bound; StemCache replaces it
+    stemmer = getattr(stemmer, 'delegatedStemmer', stemmer)
+    # Its dictionary is a list, so every root lookup scans ~30k words; a set makes them O(1)
+    dictionary = getattr(stemmer, 'dictionary', None)
+    if isinstance(getattr(dictionary, 'words', None), list):
+        dictionary.words = frozenset(dictionary.words)
+    return stemmer
+
+
+class StemCache:
+    """Bounded LRU of word -> stem in front of the stemmer."""
+
+    def __init__(self, max_words: int = STEM_CACHE_MAX_WORDS):
+        self.max_words = max_words
+        self._stems = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._stems)
+
+    def _put_all(self, stems: dict):
+        with self._lock:
+            for word, stem in stems.items():
+                self._stems[word] = stem
+                self._stems.move_to_end(word)
+            while len(self._stems) > self.max_words:
+                self._stems.popitem(last=False)
+
+    def stems(self, words) -> dict:
+        """Map each distinct word to its stem, running the stemmer only for unseen words."""
+        result, missing = {}, []
+        with self._lock:
+            for word in words:
+                stem = self._stems.get(word)
+                if stem is None:
+                    missing.append(word)
+                else:
+                    self._stems.move_to_end(word)
+                    result[word] = stem
+        if not missing:
+            return result
+
+        stemmer = get_stemmer()
+        if stemmer is None:
+            result.update((word, word) for word in missing)
+            return result
+
+        stemmed = {word: stemmer.stem_word(word) or word for word in missing}
+        self._put_all(stemmed)
+        result.update(stemmed)
+        return result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._stems)
+
+    def restore(self, stems: dict) -> int:
+        """Load stems, keeping the most recently used ones already in memory."""
+        with self._lock:
+            loaded = [(word, stem) for word, stem in stems.items() if word not in self._stems]
+            loaded = loaded[-self.max_words:]
+            current = self._stems
+            self._stems = OrderedDict(loaded)
+            self._stems.update(current)
+            while len(self._stems) > self.max_words:
+                self._stems.popitem(last=False)
+        return len(loaded)
+
+
+stem_cache = StemCache()
+
+
+def stem_words(words) -> dict:
+    """``{word: stem}`` for the distinct ``words``."""
+    return stem_cache.stems(words)
+
+
+def save_stem_dictionary(path: str = STEM_DICTIONARY_PATH) -> int:
+    if not path or not len(stem_cache):
+        return 0
+    stems = stem_cache.snapshot()
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(stems, ensure_ascii=False), encoding='utf-8')
+    tmp.replace(target)
+    logger.info(f"Saved {len(stems)} stems to {path}")
+    return len(stems)
+
+
+def load_stem_dictionary(path: str = STEM_DICTIONARY_PATH) -> int:
+    if not path:
+        return 0
+    try:
+        stems = json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return 0
+    except Exception as e:
+        logger.warning(f"Could not load stem dictionary from {path}: {e}")
+        return 0
+    loaded = stem_cache.restore(stems)
+    logger.info(f"Loaded {loaded} stems from {path}")
+    return loaded
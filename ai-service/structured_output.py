@@ -0,0 +1,252 @@
+"""
+🧾 Structured Gemini Output
+
+Typed response schemas for the daily/weekly analyses and the movie
+recommendations, passed to Gemini as ``response_schema`` so generation is
+constrained to the expected shape instead of spelling the format out in every
+prompt. Responses are parsed with orjson when it is installed, truncated JSON
+(cut off by ``max_output_tokens``) is repaired by closing open strings and
+brackets, and the result is coerced against the schema: missing fields get
+defaults, numbers are clamped to their range and lists are trimmed.
+
+Schemas use the Gemini subset of OpenAPI, plus ``minimum``/``maximum`` and
+``default`` which are only applied locally and stripped before the schema is
+sent.
+"""
+
+import json
+import logging
+import math
+import re
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Keys understood by the local validator but not by the Gemini API
+LOCAL_ONLY_KEYS = {'minimum', 'maximum', 'default'}
+# How many earlier cut points to try when repairing truncated JSON
+MAX_REPAIR_ATTEMPTS = 8
+
+FENCE_PATTERN = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+CLOSERS = {'{': '}', '[': ']'}
+
+
+# ============================================
+# Schemas
+# ============================================
+
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'summary': {'type': 'string'},
+        'dominantMood': {'type': 'string', 'default': 'unknown',
+                         'description': 'satu kata mood dalam bahasa Indonesia'},
+        'moodScore': {'type': 'integer', 'minimum': 0, 'maximum': 100, 'description': '0-100'},
+        'highlights': {'type': 'array', 'items': {'type': 'string'}},
+        'advice': {'type': 'array', 'items': {'type': 'string'}},
+        'affirmation': {'type': 'string'},
+    },
+    'required': ['summary', 'dominantMood', 'moodScore', 'highlights', 'advice', 'affirmation'],
+}
+
+PACKED_ANALYSIS_SCHEMA = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {'id': {'type': 'string'}, **ANALYSIS_SCHEMA['properties']},
+        'required': ['id'] + ANALYSIS_SCHEMA['required'],
+    },
+}
+
+MOVIE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'category': {
+            'type': 'string',
+            'enum': ['joyful', 'comfort', 'grounding', 'reflective', 'motivational', 'balanced'],
+        },
+        'headline': {'type': 'string', 'description': 'judul bagian, personal dan hangat'},
+        'description': {'type': 'string', 'description': 'mengapa film-film ini cocok'},
+        'movies': {
+            'type': 'array',
+            'max_items': 3,
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'title': {'type': 'string', 'description': 'judul film dalam bahasa Inggris'},
+                    'year': {'type': 'integer', 'minimum': 1900, 'maximum': 2100},
+                    'tagline': {'type': 'string'},
+                    'imdbId': {'type': 'string', 'nullable': True, 'description': 'format tt1234567'},
+                    'genres': {'type': 'array', 'max_items': 3, 'items': {'type': 'string'}},
+                    'reason': {'type': 'string', 'description': 'alasan personal terkait mood pengguna'},
+                },
+                'required': ['title', 'year', 'tagline', 'genres', 'reason'],
+            },
+        },
+    },
+    'required': ['category', 'headline', 'description', 'movies'],
+}
+
+
+def gemini_schema(schema: dict) -> dict:
+    """Copy of a schema with the local-only keys removed, for ``response_schema``."""
+    if isinstance(schema, dict):
+        return {k: gemini_schema(v) for k, v in schema.items() if k not in LOCAL_ONLY_KEYS}
+    return schema
+
+
+# ============================================
+# Parsing and repair
+# ============================================
+
+def loads(text):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def repair_candidates(text: str):
+    """Yield progressively shorter completions of possibly truncated JSON."""
+    text = FENCE_PATTERN.sub('', text)
+    starts = [i for i in (text.find('{'), text.find('[')) if i >= 0]
+    if not starts:
+        return
+    text = text[min(starts):]
+
+    stack, cuts = [], []
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in CLOSERS:
+            stack.append(CLOSERS[char])
+        elif char in '}]':
+            if not stack:
+                # Unbalanced closer
+                yield text[:i]
+                return
+            stack.pop()
+            if not stack:
+                yield text[:i + 1]
+                return
+        elif char == ',':
+            cuts.append((i, tuple(stack)))
+
+    # Truncated: close what is open, or cut back to an earlier comma. A value
+    # cut off mid-string is only kept when there is nothing earlier to fall back to.
+    closed = (text[:-1] if escaped else text) + ('"' if in_string else '') + ''.join(reversed(stack))
+    if not in_string:
+        yield closed
+    for i, open_stack in reversed(cuts[-MAX_REPAIR_ATTEMPTS:]):
+        yield text[:i] + ''.join(reversed(open_stack))
+    if in_string:
+        yield closed
+
+
+def parse_json(text: str):
+    """Parse JSON, repairing truncation and stray wrapping. Returns None if hopeless."""
+    if not text:
+        return None
+    try:
+        return loads(text)
+    except ValueError:
+        pass
+
+    for candidate in repair_candidates(text):
+        try:
+            data = loads(candidate)
+        except ValueError:
+            continue
+        logger.info(f"Repaired malformed JSON response ({len(text)} chars)")
+        return data
+    return None
+
+
+# ============================================
+# Validation
+# ============================================
+
+def default_for(schema: dict):
+    if 'default' in schema:
+        return schema['default']
+    if schema.get('nullable'):
+        return None
+    return {'string': '', 'integer': 0, 'number': 0.0, 'boolean': False,
+            'array': [], 'object': {}}.get(schema.get('type'))
+
+
+def conform(value, schema: dict, problems: list, path: str = '$'):
+    """Coerce a value to the schema, recording anything that had to be fixed."""
+    kind = schema.get('type')
+    if value is None:
+        if not schema.get('nullable'):
+            problems.append(f"{path}: missing")
+        return default_for(schema)
+
+    if kind == 'object':
+        if not isinstance(value, dict):
+            problems.append(f"{path}: expected object")
+            return None
+        result = {}
+        for name, prop in schema.get('properties', {}).items():
+            if name not in value and name not in schema.get('required', ()):
+                continue
+            result[name] = conform(value.get(name), prop, problems, f"{path}.{name}")
+        return result
+
+    if kind == 'array':
+        if not isinstance(value, list):
+            value = [value]
+        item_schema = schema.get('items', {})
+        items = [conform(v, item_schema, problems, f"{path}[{i}]") for i, v in enumerate(value)]
+        items = [v for v in items if v is not None]
+        return items[:schema['max_items']] if 'max_items' in schema else items
+
+    if kind in ('integer', 'number'):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            problems.append(f"{path}: not a number")
+            return default_for(schema)
+        # NaN and Infinity get through json.loads when orjson is missing
+        if not math.isfinite(number):
+            problems.append(f"{path}: not a finite number")
+            return default_for(schema)
+        if 'minimum' in schema:
+            number = max(schema['minimum'], number)
+        if 'maximum' in schema:
+            number = min(schema['maximum'], number)
+        return int(round(number)) if kind == 'integer' else number
+
+    if kind == 'string':
+        value = value if isinstance(value, str) else str(value)
+        if 'enum' in schema and value.strip().lower() in schema['enum']:
+            value = value.strip().lower()
+        return value
+
+    if kind == 'boolean':
+        return bool(value)
+    return value
+
+
+def parse_structured(text: str, schema: dict) -> Optional[object]:
+    """Parse and validate a response against a schema; None when unusable."""
+    data = parse_json(text)
+    if data is None:
+        return None
+
+    problems = []
+    result = conform(data, schema, problems)
+    if problems:
+        logger.info(f"Coerced {len(problems)} field(s) in structured response: {', '.join(problems[:5])}")
+    return result
@@ -0,0 +1,249 @@
+"""
+🗓️ Writing Style Timeline
+
+Writing style metrics over rolling windows of dated entries (for example
+30-day windows advancing a week at a time), to show how someone's writing
+changes month over month.
+
+Each entry is analyzed once into additive statistics: word, sentence and
+punctuation counts, syllables, language votes and word / stem frequencies.
+A window keeps running sums of these, so advancing it only adds the entries
+that enter and subtracts the ones that leave, instead of re-analyzing the
+whole window. Distinct word counts (for the type-token ratio) stay exact,
+because a word leaves the window's frequency table when its count drops to
+zero.
+
+Window metrics equal ``analyze_text`` over the window's entries joined with
+newlines, as AnalyzeWritingStyle joins them. Sentence splitting does not
+stop at a newline, so an entry without final punctuation runs into the next
+entry's first sentence; each entry records whether it joins the next one
+that way, and a window counts such a join only while both entries are in it.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+from stemming import stem_words
+from writing_style import (
+    PUNCTUATION_PATTERN,
+    SENTENCE_SPLIT_PATTERN,
+    WritingStyle,
+    count_syllables_english,
+    count_syllables_indonesian,
+    flesch_reading_ease,
+    language_from_votes,
+    language_votes,
+    syllable_language,
+    tokenize,
+)
+
+WINDOW_DAYS = {'week': 7, 'month': 30}
+DEFAULT_STEP_DAYS = 7
+# Same minimum as a single writing style analysis
+MIN_WINDOW_CHARS = 50
+
+
+@dataclass
+class EntryStats:
+    day: date
+    chars: int
+    words: int
+    sentences: int
+    punctuation: int
+    word_chars: int
+    exclamations: int
+    questions: int
+    syllables_indonesian: int
+    syllables_english: int
+    indonesian_votes: int
+    english_votes: int
+    language: str
+    word_counts: Counter
+    stem_counts: Counter
+    opens: bool                 # starts mid-sentence (text before any terminator)
+    closes: bool                # ends with sentence punctuation
+    joins_next: bool = False    # its last sentence runs into the next entry's first one
+
+
+# EntryStats fields a window sums
+ADDITIVE_FIELDS = (
+    'chars', 'words', 'sentences', 'punctuation', 'word_chars', 'exclamations', 'questions',
+    'syllables_indonesian', 'syllables_english', 'indonesian_votes', 'english_votes',
+)
+
+
+def entry_stats(entries: list) -> list:
+    """``[(iso_date, text), ...]`` -> EntryStats sorted by date, stemming each distinct word once.
+
+    Blank entries are left out. Raises ValueError for a date that is not YYYY-MM-DD.
+    """
+    dated = [(date.fromisoformat(day), text) for day, text in entries]
+    tokenized = [(day, text, tokenize(text)) for day, text in dated if text.strip()]
+    word_counts = [Counter(words) for _, _, words in tokenized]
+    stems = stem_words(set().union(*word_counts)) if word_counts else {}
+
+    stats = []
+    for (day, text, words), counts in zip(tokenized, word_counts):
+        stem_counts = Counter()
+        for word, n in counts.items():
+            stem_counts[stems.get(word, word)] += n
+        indonesian, english = language_votes(words)
+        segments = SENTENCE_SPLIT_PATTERN.split(text)
+        stats.append(EntryStats(
+            day=day,
+            chars=len(text.strip()),
+            words=len(words),
+            sentences=sum(1 for sentence in segments if sentence.strip()),
+            punctuation=len(PUNCTUATION_PATTERN.findall(text)),
+            word_chars=sum(len(word) * n for word, n in counts.items()),
+            exclamations=text.count('!'),
+            questions=text.count('?'),
+            syllables_indonesian=sum(count_syllables_indonesian(word) * n for word, n in counts.items()),
+            syllables_english=sum(count_syllables_english(word) * n for word, n in counts.items()),
+            indonesian_votes=indonesian,
+            english_votes=english,
+            language=language_from_votes(indonesian, english, len(words)),
+            word_counts=counts,
+            stem_counts=stem_counts,
+            opens=bool(segments[0].strip()),
+            closes=not segments[-1].strip(),
+        ))
+    stats.sort(key=lambda entry: entry.day)
+    for entry, following in zip(stats, stats[1:]):
+        entry.joins_next = not entry.closes and following.opens
+    return stats
+
+
+def _merge(total: Counter, counts: Counter, sign: int):
+    """Add (sign 1) or subtract (sign -1) counts, dropping keys that reach zero."""
+    for key, n in counts.items():
+        value = total.get(key, 0) + sign * n
+        if value:
+            total[key] = value
+        else:
+            del total[key]
+
+
+class WindowStats:
+    """Running sums of the entries currently in a window.
+
+    Entries are added at the end and removed from the front, in date order.
+    """
+
+    def __init__(self):
+        for name in ADDITIVE_FIELDS:
+            setattr(self, name, 0)
+        self.entries = 0
+        self._last = None
+        self.word_counts = Counter()
+        self.stem_counts = Counter()
+        self.language_words = Counter()
+
+    def _apply(self, entry: EntryStats, sign: int):
+        for name in ADDITIVE_FIELDS:
+            setattr(self, name, getattr(self, name) + sign * getattr(entry, name))
+        _merge(self.word_counts, entry.word_counts, sign)
+        _merge(self.stem_counts, entry.stem_counts, sign)
+        if entry.words:
+            _merge(self.language_words, {entry.language: entry.words}, sign)
+
+    def add(self, entry: EntryStats):
+        if self.entries and self._last.joins_next:
+            self.sentences -= 1
+        self._apply(entry, 1)
+        self.entries += 1
+        self._last = entry
+
+    def remove(self, entry: EntryStats):
+        self._apply(entry, -1)
+        self.entries -= 1
+        if self.entries and entry.joins_next:
+            self.sentences += 1
+
+    def style(self) -> Optional[WritingStyle]:
+        """Metrics of the window, or None when it has too little text."""
+        if self.chars < MIN_WINDOW_CHARS or not self.words or not self.sentences:
+            return None
+
+        language = language_from_votes(self.indonesian_votes, self.english_votes, self.words)
+        # Stems count as one word for Indonesian, as in analyze_text
+        vocabulary_size = len(self.word_counts) if language == 'english' else len(self.stem_counts)
+        syllables = (
+            self.syllables_english if syllable_language(language) == 'english' else self.syllables_indonesian
+        )
+        avg_sentence_length = self.words / self.sentences
+        syllables_per_word = syllables / self.words
+        return WritingStyle(
+            total_words=self.words,
+            total_sentences=self.sentences,
+            avg_sentence_length=avg_sentence_length,
+            vocabulary_richness=vocabulary_size / self.words,
+            punctuation_density=self.punctuation / self.words * 100,
+            avg_word_length=self.word_chars / self.words,
+            language=language,
+            top_words=[],
+            exclamation_ratio=self.exclamations / self.sentences,
+            question_ratio=self.questions / self.sentences,
+            syllables_per_word=syllables_per_word,
+            readability=flesch_reading_ease(avg_sentence_length, syllables_per_word, language),
+            language_breakdown={
+                name: words / self.words for name, words in self.language_words.most_common()
+            },
+        )
+
+
+@dataclass
+class StyleWindow:
+    start: date
+    end: date  # inclusive
+    entries: int
+    style: WritingStyle
+
+
+def style_timeline(entries: list, window_days: int, step_days: int = DEFAULT_STEP_DAYS) -> list:
+    """Writing style per window over ``[(iso_date, text), ...]``.
+
+    Windows span ``window_days`` days, start at the first entry's date and
+    advance by ``step_days`` until one covers the last entry. Windows with
+    too little text are left out.
+
+    Raises ValueError for an invalid date or a ``step_days`` outside
+    1..``window_days`` (a longer step would skip entries between windows),
+    and OverflowError when a window would end past the year 9999.
+    """
+    if not 1 <= step_days <= window_days:
+        raise ValueError(f"step_days must be between 1 and {window_days}")
+    stats = entry_stats(entries)
+    if not stats:
+        return []
+
+    window = WindowStats()
+    windows = []
+    span = timedelta(days=window_days - 1)
+    step = timedelta(days=step_days)
+    start, last = stats[0].day, stats[-1].day
+    entering = leaving = 0
+
+    while True:
+        end = start + span
+        if window.entries == 0 and stats[entering].day > end:
+            # Empty window: jump to the first step that reaches the next entry
+            gap = (stats[entering].day - end).days
+            start += step * -(-gap // step_days)
+            continue
+
+        while entering < len(stats) and stats[entering].day <= end:
+            window.add(stats[entering])
+            entering += 1
+        while leaving < entering and stats[leaving].day < start:
+            window.remove(stats[leaving])
+            leaving += 1
+
+        style = window.style()
+        if style is not None:
+            windows.append(StyleWindow(start=start, end=end, entries=window.entries, style=style))
+        if end >= last:
+            return windows
+        start += step
@@ -0,0 +1,173 @@
+"""
+👷 Worker Supervisor
+
+Runs several copies of the gRPC server so one host can use every core: the
+GIL limits a single process to roughly one core of Python work. Each worker
+is a separate process that binds the same port with ``SO_REUSEPORT``, and
+the kernel spreads incoming connections across them.
+
+Workers are started with the ``spawn`` method (gRPC is not fork-safe once
+its threads exist) and report a heartbeat through shared memory. The
+supervisor restarts workers that exit, and kills and replaces workers whose
+heartbeat goes stale, with exponential backoff for workers that keep
+crashing. SIGTERM / SIGINT stop all workers, each draining its in-flight
+RPCs first. SIGHUP restarts the workers one at a time (a rolling restart,
+e.g. after a deploy) while the others keep serving the port.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# A worker that has not reported for this long is considered hung
+WORKER_HEARTBEAT_TIMEOUT = float(os.getenv('WORKER_HEARTBEAT_TIMEOUT', '30'))
+# Time a new worker gets to import, load caches and report its first heartbeat
+WORKER_STARTUP_GRACE = 60.0
+MONITOR_INTERVAL = 1.0
+STOP_TIMEOUT = 35.0
+# A hung worker is not worth waiting the full drain period for
+HUNG_STOP_TIMEOUT = 5.0
+MAX_RESTART_DELAY = 30.0
+# A worker that stays up this long resets its crash backoff
+STABLE_AFTER_SECONDS = 60.0
+
+
+@dataclass
+class WorkerSlot:
+    index: int
+    heartbeat: object
+    process: object = None
+    started_at: float = 0.0
+    restarts: int = 0
+    restart_at: float = 0.0
+
+
+class Supervisor:
+    """Keeps ``workers`` processes running ``target(index, heartbeat)``."""
+
+    def __init__(self, target, workers: int, heartbeat_timeout: float = WORKER_HEARTBEAT_TIMEOUT,
+                 startup_grace: float = WORKER_STARTUP_GRACE, stop_timeout: float = STOP_TIMEOUT):
+        self.target = target
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_grace = startup_grace
+        self.stop_timeout = stop_timeout
+        self._ctx = multiprocessing.get_context('spawn')
+        self._slots = [WorkerSlot(i, self._ctx.Value('d', 0.0)) for i in range(workers)]
+        self._stopping = False
+        self._reload = False
+
+    def _start(self, slot: WorkerSlot):
+        slot.heartbeat.value = 0.0
+        slot.process = self._ctx.Process(
+            target=self.target, args=(slot.index, slot.heartbeat), name=f'grpc-worker-{slot.index}'
+        )
+        slot.process.start()
+        slot.started_at = time.time()
+        logger.info(f"Started worker {slot.index} (pid {slot.process.pid})")
+
+    def _kill(self, slot: WorkerSlot, timeout: float = None):
+        process = slot.process
+        if process is None or not process.is_alive():
+            return
+        process.terminate()
+        process.join(self.stop_timeout if timeout is None else timeout)
+        if process.is_alive():
+            logger.warning(f"Worker {slot.index} (pid {process.pid}) did not stop in time, killing")
+            process.kill()
+            process.join()
+
+    def _schedule_restart(self, slot: WorkerSlot, reason: str):
+        now = time.time()
+        if now - slot.started_at >= STABLE_AFTER_SECONDS:
+            slot.restarts = 0
+        delay = min(2 ** slot.restarts - 1, MAX_RESTART_DELAY)
+        slot.restarts += 1
+        slot.restart_at = now + delay
+        slot.process = None
+        logger.warning(f"Worker {slot.index} {reason}; restarting in {delay:.0f}s")
+
+    def _check(self, slot: WorkerSlot):
+        now = time.time()
+        if slot.process is None:
+            if now >= slot.restart_at:
+                self._start(slot)
+            return
+
+        if not slot.process.is_alive():
+            self._schedule_restart(slot, f"exited with code {slot.process.exitcode}")
+            return
+
+        last_beat = slot.heartbeat.value or slot.started_at
+        grace = self.startup_grace if not slot.heartbeat.value else self.heartbeat_timeout
+        if now - last_beat > grace:
+            self._kill(slot, HUNG_STOP_TIMEOUT)
+            self._schedule_restart(slot, f"stopped responding ({now - last_beat:.0f}s since heartbeat)")
+
+    def _wait_until_up(self, slot: WorkerSlot):
+        deadline = time.time() + self.startup_grace
+        while not self._stopping and time.time() < deadline and slot.process.is_alive():
+            if slot.heartbeat.value:
+                return
+            time.sleep(0.1)
+
+    def _rolling_restart(self):
+        """Replace workers one at a time; each drains and saves its state before its successor starts."""
+        logger.info("Rolling restart of all workers")
+        for slot in self._slots:
+            if self._stopping:
+                return
+            self._kill(slot)
+            self._start(slot)
+            self._wait_until_up(slot)
+            slot.restarts = 0
+
+    def _handle_signal(self, signum, frame):
+        self._stopping = True
+
+    def _handle_reload(self, signum, frame):
+        self._reload = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        logger.info(f"Supervising {len(self._slots)} gRPC workers (pid {os.getpid()})")
+
+        for slot in self._slots:
+            self._start(slot)
+        try:
+            while not self._stopping:
+                time.sleep(MONITOR_INTERVAL)
+                if self._reload:
+                    self._reload = False
+                    self._rolling_restart()
+                for slot in self._slots:
+                    if not self._stopping:
+                        self._check(slot)
+        finally:
+            self._stop_all()
+
+    def _stop_all(self):
+        """SIGTERM every worker at once so they drain in parallel, then wait for all against one deadline."""
+        logger.info("Stopping workers...")
+        running = [slot for slot in self._slots if slot.process is not None and slot.process.is_alive()]
+        for slot in running:
+            slot.process.terminate()
+        deadline = time.monotonic() + self.stop_timeout
+        for slot in running:
+            slot.process.join(max(0.0, deadline - time.monotonic()))
+        for slot in running:
+            if slot.process.is_alive():
+                logger.warning(f"Worker {slot.index} (pid {slot.process.pid}) did not stop in time, killing")
+                slot.process.kill()
+                slot.process.join()
+
+
+def supervise(target, workers: int, stop_timeout: float = STOP_TIMEOUT):
+    """Run ``target(index, heartbeat)`` in ``workers`` supervised processes until signalled."""
+    Supervisor(target, workers, stop_timeout=stop_timeout).run()
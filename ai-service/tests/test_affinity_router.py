@@ -0,0 +1,97 @@
+from concurrent import futures
+
+import grpc
+import pytest
+
+from affinity_router import AffinityRouter, HashRing
+
+DAILY = '/ai.AIAnalysisService/AnalyzeDaily'
+DAILY_STREAM = '/ai.AIAnalysisService/AnalyzeDailyStream'
+
+
+# ---------- HashRing ----------
+
+def test_owner_is_first_candidate_and_candidates_are_distinct():
+    ring = HashRing(['a:1', 'b:1', 'c:1'], vnodes=64)
+    for i in range(200):
+        candidates = ring.candidates(f'user-{i}')
+        assert candidates[0] == ring.owner(f'user-{i}')
+        assert sorted(candidates) == ['a:1', 'b:1', 'c:1']
+
+
+def test_shares_cover_the_ring():
+    shares = HashRing(['a:1', 'b:1', 'c:1', 'd:1'], vnodes=160).shares()
+    assert sum(shares.values()) == pytest.approx(1.0)
+    assert all(0.15 < share < 0.35 for share in shares.values())
+
+
+def test_adding_a_node_only_moves_users_to_it():
+    old = HashRing(['a:1', 'b:1', 'c:1'], vnodes=160)
+    new = HashRing(['a:1', 'b:1', 'c:1', 'd:1'], vnodes=160)
+    users = [f'user-{i}' for i in range(4000)]
+    moved = [u for u in users if old.owner(u) != new.owner(u)]
+    assert all(new.owner(u) == 'd:1' for u in moved)
+    assert 0.15 < len(moved) / len(users) < 0.35
+
+
+def test_removing_a_node_only_moves_its_users():
+    old = HashRing(['a:1', 'b:1', 'c:1'], vnodes=160)
+    new = HashRing(['a:1', 'b:1'], vnodes=160)
+    for i in range(2000):
+        user = f'user-{i}'
+        if old.owner(user) != 'c:1':
+            assert new.owner(user) == old.owner(user)
+
+
+def test_empty_ring():
+    ring = HashRing([])
+    assert ring.owner('x') is None
+    assert ring.candidates('x') == []
+
+
+# ---------- Forwarding ----------
+
+class EchoNode(grpc.GenericRpcHandler):
+    """Answers AnalyzeDaily with the request bytes, and AnalyzeDailyStream with them twice."""
+
+    def service(self, handler_call_details):
+        if handler_call_details.method == DAILY:
+            return grpc.unary_unary_rpc_method_handler(lambda request, context: request)
+        if handler_call_details.method == DAILY_STREAM:
+            return grpc.unary_stream_rpc_method_handler(lambda request, context: iter([request, request]))
+        return None
+
+
+def start_server(handler):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4), handlers=[handler])
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, f'localhost:{port}'
+
+
+@pytest.fixture
+def router_channel():
+    node, address = start_server(EchoNode())
+    router = AffinityRouter([address], vnodes=8)
+    proxy, proxy_address = start_server(router)
+    channel = grpc.insecure_channel(proxy_address)
+    yield channel
+    channel.close()
+    proxy.stop(0)
+    node.stop(0)
+
+
+# user_id = "u1" (field 1)
+REQUEST = b'\x0a\x02u1'
+
+
+def test_unary_call_without_deadline_is_forwarded(router_channel):
+    assert router_channel.unary_unary(DAILY)(REQUEST) == REQUEST
+
+
+def test_stream_call_without_deadline_is_forwarded(router_channel):
+    assert list(router_channel.unary_stream(DAILY_STREAM)(REQUEST)) == [REQUEST, REQUEST]
+
+
+def test_unary_call_with_deadline_is_forwarded(router_channel):
+    assert router_channel.unary_unary(DAILY)(REQUEST, timeout=5) == REQUEST
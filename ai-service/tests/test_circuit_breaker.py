@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    return now
+
+
+def breaker(**kwargs):
+    options = dict(window_seconds=60, min_calls=4, failure_rate_threshold=0.5, slow_call_seconds=5, open_seconds=30)
+    options.update(kwargs)
+    return CircuitBreaker('test', **options)
+
+
+def trip(cb):
+    for _ in range(cb.min_calls):
+        assert cb.allow_request()
+        cb.record(0.1, ok=False)
+
+
+def test_opens_at_failure_rate_after_min_calls(clock):
+    cb = breaker()
+    for ok in (True, False, True):
+        cb.record(0.1, ok=ok)
+    assert cb.state == CLOSED
+    cb.record(0.1, ok=False)
+    assert cb.state == OPEN
+    assert not cb.allow_request()
+
+
+def test_slow_calls_count_as_failures(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record(6.0, ok=True)
+    assert cb.state == OPEN
+
+
+def test_old_calls_leave_the_window(clock):
+    cb = breaker()
+    for _ in range(3):
+        cb.record(0.1, ok=False)
+    clock[0] += 61
+    cb.record(0.1, ok=False)
+    assert cb.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through(clock):
+    cb = breaker()
+    trip(cb)
+    clock[0] += 29
+    assert not cb.allow_request()
+    clock[0] += 1
+    assert cb.allow_request()
+    assert cb.state == HALF_OPEN
+    assert not cb.allow_request()
+
+
+def test_successful_probe_closes(clock):
+    cb = breaker()
+    trip(cb)
+    clock[0] += 30
+    assert cb.allow_request()
+    cb.record(0.1, ok=True)
+    assert cb.state == CLOSED
+    assert cb.allow_request()
+
+
+def test_failed_probe_reopens(clock):
+    cb = breaker()
+    trip(cb)
+    clock[0] += 30
+    assert cb.allow_request()
+    cb.record(0.1, ok=False)
+    assert cb.state == OPEN
+    clock[0] += 29
+    assert not cb.allow_request()
+
+
+def test_release_frees_the_probe_without_a_verdict(clock):
+    cb = breaker()
+    trip(cb)
+    clock[0] += 30
+    assert cb.allow_request()
+    cb.release()
+    assert cb.state == HALF_OPEN
+    assert cb.allow_request()
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+from model_router import BudgetExhausted, ModelRouter
+
+
+class FakeModel:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.calls = 0
+
+    def generate_content(self, contents, generation_config=None, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f'{self.name} down')
+        return SimpleNamespace(text=self.name)
+
+
+def router(*fail, **kwargs):
+    router = ModelRouter(['flash', 'pro'], light_prompt_chars=100, **kwargs)
+    router.models = {name: FakeModel(name, fail=name in fail) for name in router.model_names}
+    return router
+
+
+def test_routes_by_prompt_size_and_rpc():
+    r = router()
+    assert r.generate_content('x' * 50).text == 'flash'
+    assert r.generate_content('x' * 500).text == 'pro'
+    assert r.generate_content('x', rpc='AnalyzeWeekly').text == 'pro'
+
+
+def test_fails_over_and_cools_down_a_failing_model():
+    r = router('flash', max_consecutive_failures=2)
+    assert r.generate_content('x').text == 'pro'
+    assert r.generate_content('x').text == 'pro'
+    assert r.is_degraded('flash')
+    assert r.candidates('x')[0] == 'pro'
+    calls = r.models['flash'].calls
+    r.generate_content('x')
+    assert r.models['flash'].calls == calls
+
+
+def test_raises_the_last_error_when_every_model_fails():
+    with pytest.raises(RuntimeError):
+        router('flash', 'pro').generate_content('x')
+
+
+def test_budget_is_shared_and_checked_before_calling():
+    r = router(rpm_limit=2)
+    assert r.has_budget(reserve=1)
+    r.generate_content('x')
+    assert r.has_budget() and not r.has_budget(reserve=1)
+    r.generate_content('x')
+    with pytest.raises(BudgetExhausted):
+        r.generate_content('x')
+    assert r.models['flash'].calls == 2
+
+
+def test_snapshot_restore_keeps_remaining_cooldown():
+    r = router('flash', max_consecutive_failures=1, cooldown_seconds=30)
+    r.generate_content('x')
+    snapshot = r.snapshot()
+    assert 0 < snapshot['flash']['cooldown_until'] <= 30
+
+    fresh = router()
+    assert fresh.restore({**snapshot, 'retired-model': {}}, elapsed=10) == 2
+    assert fresh.is_degraded('flash')
+    expired = router()
+    expired.restore(snapshot, elapsed=60)
+    assert not expired.is_degraded('flash')
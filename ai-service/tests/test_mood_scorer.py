@@ -0,0 +1,32 @@
+import pytest
+
+from mood_scorer import score_sentiment
+
+
+def total(text):
+    return score_sentiment(text).total
+
+
+def test_prefix_intensifier_boosts_only_the_next_term():
+    assert total("sangat senang") == pytest.approx(1.5 * total("senang"))
+    assert total("sangat lelah lalu senang") == pytest.approx(1.5 * total("lelah") + total("senang"))
+
+
+def test_prefix_intensifier_reaches_past_a_negator():
+    assert total("sangat tidak senang") == pytest.approx(1.5 * total("tidak senang"))
+
+
+def test_postfix_intensifier_needs_the_preceding_term():
+    assert total("senang banget") == pytest.approx(1.5 * total("senang"))
+    assert total("senang pagi banget") == pytest.approx(total("senang"))
+
+
+def test_sentence_breaks_end_negation_and_intensifiers():
+    assert total("aku sangat. senang") == pytest.approx(total("senang"))
+    assert total("tidak tahu. senang") == pytest.approx(total("senang"))
+    assert total("senang!\nbanget") == pytest.approx(total("senang"))
+
+
+def test_bigram_terms_take_precedence():
+    score = score_sentiment("aku patah hati")
+    assert score.negative_terms == ['patah hati']
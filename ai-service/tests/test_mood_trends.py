@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from mood_trends import compute_mood_trends
+
+
+def day(date, score, mood=''):
+    return SimpleNamespace(date=date, mood_score=score, dominant_mood=mood)
+
+
+def test_window_spans_calendar_days():
+    trends = compute_mood_trends([day('2026-01-01', 40), day('2026-01-02', 60), day('2026-01-20', 80)], window=7)
+    assert trends.dates == ['2026-01-01', '2026-01-02', '2026-01-20']
+    # The gap leaves the last day alone in its window
+    assert list(trends.moving_average) == [40.0, 50.0, 80.0]
+
+
+def test_undated_and_unknown_days_are_left_out():
+    trends = compute_mood_trends([day('', 10, 'sedih'), day('  ', 20), day('2026-01-01', 0),
+                                  day('2026-01-01', 60, 'senang'), day('2026-01-03', 70)])
+    assert trends.dates == ['2026-01-01', '2026-01-03']
+    assert trends.days == 2
+    assert trends.trend_slope == pytest.approx(5.0)
+    assert trends.mood_counts == {'sedih': 1, 'senang': 1}
+
+
+def test_unparsable_dates_fall_back_to_entry_windows():
+    trends = compute_mood_trends([day('2026-01-01', 60), day('2026-01-03', 70), day('NaT', 80)], window=2)
+    assert list(trends.moving_average) == [60.0, 65.0, 75.0]
+    assert trends.trend_slope == pytest.approx(10.0)
+
+
+def test_empty_series():
+    trends = compute_mood_trends([day('2026-01-01', 0, 'netral')])
+    assert trends.days == 0
+    assert trends.mood_counts == {'netral': 1}
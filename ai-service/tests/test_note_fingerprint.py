@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import ai_pb2
+from note_fingerprint import DayFingerprint, NearDuplicateIndex, hamming, simhash, text_features
+from server import local_sentiment, patch_near_duplicate
+
+BODY = ("Hari ini kerja cukup lancar walaupun rapat pagi molor hampir satu jam. Siangnya aku makan "
+        "bersama tim di warung dekat kantor dan kami membahas rencana proyek bulan depan. Sore hari "
+        "aku pulang lebih awal, jalan kaki sebentar di taman, lalu menulis jurnal ini. Aku merasa "
+        "bersyukur atas dukungan tim.")
+
+
+def day(*bodies):
+    return [SimpleNamespace(title='Harian', body=body) for body in bodies]
+
+
+def test_simhash_is_stable_and_similar_for_small_edits():
+    original = simhash(text_features(BODY))
+    assert original == simhash(text_features(BODY))
+    edited = simhash(text_features(BODY.replace('satu jam', 'sejam')))
+    unrelated = simhash(text_features("Liburan ke pantai bersama keluarga, ombaknya besar sekali dan airnya jernih."))
+    assert hamming(original, edited) < hamming(original, unrelated)
+    assert simhash(text_features('')) == 0
+
+
+def test_day_distance_requires_matching_notes():
+    base = DayFingerprint.from_notes(day(BODY, 'Catatan kedua tentang makan malam.'))
+    assert base.distance(base, 3) == 0
+    assert base.distance(DayFingerprint.from_notes(day(BODY)), 3) is None
+    swapped = DayFingerprint.from_notes(day('Catatan kedua tentang makan malam.', BODY))
+    assert swapped.distance(base, 3) == 0
+
+
+def test_index_returns_closest_and_bounds_entries():
+    index = NearDuplicateIndex(max_entries=2, max_distance=64, per_day=2)
+    near = DayFingerprint.from_notes(day(BODY))
+    far = DayFingerprint.from_notes(day('Sesuatu yang sama sekali berbeda dari biasanya.'))
+    index.add('u', '2026-01-01', far, 'far')
+    index.add('u', '2026-01-01', near, 'near')
+    assert index.lookup('u', '2026-01-01', near) == ('near', 0)
+    assert index.lookup('u', '2026-01-02', near) is None
+
+    index.add('u', '2026-01-02', near, 'b')
+    index.add('u', '2026-01-03', near, 'c')
+    assert index.lookup('u', '2026-01-01', near) is None
+    assert len(index.snapshot()) == 2
+
+
+def test_reuse_is_refused_when_sentiment_terms_change():
+    notes = day(BODY)
+    score, terms = local_sentiment(notes)
+    cached = ai_pb2.AnalysisResult(summary='Hari yang penuh syukur', mood_score=75)
+
+    flipped = day(BODY.replace('merasa bersyukur atas dukungan tim', 'merasa hancur dan ingin menyerah'))
+    assert patch_near_duplicate(cached, score, terms, flipped, distance=2) is None
+
+    reworded = day(BODY.replace('molor hampir satu jam', 'molor sejam'))
+    patched = patch_near_duplicate(cached, score, terms, reworded, distance=2)
+    assert patched.summary == cached.summary
+
+    assert patch_near_duplicate(cached, score, None, notes, distance=0) == cached
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from prompt_budget import (GAP_MARKER, MAX_TITLE_CHARS, NOTE_SEPARATOR, estimate_tokens, fit_notes,
+                           render_note, split_sentences)
+
+SENTENCES = [
+    "Pagi ini aku bangun terlambat dan buru-buru berangkat ke kantor.",
+    "Rapat dengan tim berjalan lancar dan aku merasa senang sekali.",
+    "Siangnya aku makan bersama teman lama yang sudah lama tidak bertemu.",
+    "Sore hari hujan deras jadi aku menunggu di kafe sambil membaca buku.",
+    "Malamnya aku cemas memikirkan tenggat laporan minggu depan.",
+]
+
+
+def note(hour, body, title='Catatan'):
+    return SimpleNamespace(created_at=f'2026-01-01T{hour:02d}:00:00', title=title, body=body)
+
+
+def rendered_tokens(pairs):
+    return estimate_tokens(NOTE_SEPARATOR.join(render_note(n, body) for n, body in pairs))
+
+
+def test_day_within_budget_is_unchanged():
+    notes = [note(8, SENTENCES[0]), note(20, SENTENCES[1])]
+    assert fit_notes(notes, budget=1000) == [(n, n.body) for n in notes]
+
+
+@pytest.mark.parametrize('budget', [150, 300, 600])
+def test_rendered_notes_fit_the_budget(budget):
+    notes = [note(hour, ' '.join(SENTENCES * 3), title='Judul ' * 10) for hour in range(8, 20)]
+    pairs = fit_notes(notes, budget=budget)
+    assert pairs
+    assert rendered_tokens(pairs) <= budget
+    # Kept notes stay in their original order
+    hours = [n.created_at for n, _ in pairs]
+    assert hours == sorted(hours)
+
+
+def test_oldest_notes_are_dropped_when_headers_exceed_the_budget():
+    notes = [note(hour, 'singkat', title='x' * 500) for hour in range(8, 20)]
+    pairs = fit_notes(notes, budget=150)
+    assert 0 < len(pairs) < len(notes)
+    assert pairs[-1][0] is notes[-1]
+    assert rendered_tokens(pairs) <= 150
+
+
+def test_long_titles_are_capped():
+    text = render_note(note(8, 'isi', title='x' * 1000), 'isi')
+    assert len(text.split('\n')[1]) <= len('Judul: ') + MAX_TITLE_CHARS + 1
+
+
+def test_compressed_bodies_mark_gaps():
+    notes = [note(8, ' '.join(SENTENCES * 4)), note(20, SENTENCES[0])]
+    pairs = fit_notes(notes, budget=120)
+    older = pairs[0][1]
+    assert GAP_MARKER in older
+    assert len(older) < len(notes[0].body)
+    assert pairs[1][1] == SENTENCES[0]
+
+
+def test_split_sentences_chunks_unpunctuated_text():
+    chunks = split_sentences('kata ' * 300)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 400 for chunk in chunks)
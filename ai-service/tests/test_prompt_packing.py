@@ -0,0 +1,92 @@
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from prompt_packing import DailyPromptPacker, build_packed_prompt, parse_packed_response
+
+
+def entry(entry_id, summary='Ringkasan'):
+    return {'id': entry_id, 'summary': summary, 'dominantMood': 'tenang', 'moodScore': 60,
+            'highlights': [], 'advice': [], 'affirmation': ''}
+
+
+class FakeModel:
+    """Answers a packed prompt with one entry per id, except the ids in ``drop``."""
+
+    def __init__(self, drop=(), fail=False):
+        self.drop = set(drop)
+        self.fail = fail
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+        if self.fail:
+            raise RuntimeError('upstream down')
+        ids = re.findall(r'=== id: (d\d+) \(tanggal (\S+)\)', prompt)
+        return SimpleNamespace(text=json.dumps([entry(i, f'Ringkasan {date}') for i, date in ids if i not in self.drop]))
+
+
+def submit_all(packer, dates):
+    with ThreadPoolExecutor(max_workers=len(dates)) as pool:
+        futures = [pool.submit(packer.submit, f'catatan {date}', date, lambda date=date: {'summary': f'sendiri {date}'})
+                   for date in dates]
+        return [f.result(timeout=5) for f in futures]
+
+
+def test_packed_prompt_keys_days_by_id():
+    days = [SimpleNamespace(date='2026-01-01', notes_text='satu'), SimpleNamespace(date='2026-01-02', notes_text='dua')]
+    prompt = build_packed_prompt(days)
+    assert '=== id: d0 (tanggal 2026-01-01) ===\nsatu' in prompt
+    assert '=== id: d1 (tanggal 2026-01-02) ===\ndua' in prompt
+    assert '(2 id)' in prompt
+
+
+def test_parse_packed_response_keeps_first_usable_entry_per_id():
+    text = json.dumps([entry('d0', 'pertama'), entry('d0', 'kedua'), entry('d1', ''), {'summary': 'tanpa id'}])
+    results = parse_packed_response(text)
+    assert list(results) == ['d0']
+    assert results['d0']['summary'] == 'pertama'
+    assert 'id' not in results['d0']
+    assert parse_packed_response('bukan json') == {}
+
+
+def test_concurrent_days_share_one_call():
+    model = FakeModel()
+    packer = DailyPromptPacker(model, window_seconds=0.2)
+    dates = ['2026-01-01', '2026-01-02', '2026-01-03']
+    results = submit_all(packer, dates)
+    assert len(model.prompts) == 1
+    assert sorted(r['summary'] for r in results) == [f'Ringkasan {d}' for d in dates]
+
+
+def test_dropped_days_fall_back_individually():
+    model = FakeModel(drop={'d0'})
+    packer = DailyPromptPacker(model, window_seconds=0.2)
+    results = submit_all(packer, ['2026-01-01', '2026-01-02'])
+    assert sum(r['summary'].startswith('sendiri') for r in results) == 1
+    assert sum(r['summary'].startswith('Ringkasan') for r in results) == 1
+
+
+def test_failed_call_falls_back_for_every_day():
+    packer = DailyPromptPacker(FakeModel(fail=True), window_seconds=0.2)
+    results = submit_all(packer, ['2026-01-01', '2026-01-02'])
+    assert sorted(r['summary'] for r in results) == ['sendiri 2026-01-01', 'sendiri 2026-01-02']
+
+
+def test_single_day_skips_packing():
+    model = FakeModel()
+    packer = DailyPromptPacker(model, window_seconds=0.01)
+    assert packer.submit('catatan', '2026-01-01', lambda: {'summary': 'sendiri'}) == {'summary': 'sendiri'}
+    assert model.prompts == []
+
+
+def test_token_budget_splits_batches():
+    model = FakeModel()
+    packer = DailyPromptPacker(model, window_seconds=0.2, max_tokens=10)
+    results = submit_all(packer, ['2026-01-01', '2026-01-02', '2026-01-03', '2026-01-04'])
+    assert len(results) == 4
+    assert all(prompt.count('=== id:') <= 2 for prompt in model.prompts)
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from rate_limiter import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(time, 'sleep', lambda seconds: now.__setitem__(0, now[0] + seconds))
+    return now
+
+
+def test_starts_full_and_drains(clock):
+    bucket = TokenBucket(rate_per_minute=3)
+    assert bucket.available() == 3
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+
+
+def test_refills_continuously_up_to_capacity(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=5)
+    for _ in range(5):
+        bucket.try_acquire()
+    clock[0] += 2.5
+    assert bucket.available() == pytest.approx(2.5)
+    clock[0] += 60
+    assert bucket.available() == 5
+
+
+def test_reserve_is_left_for_live_traffic(clock):
+    bucket = TokenBucket(rate_per_minute=4)
+    assert bucket.try_acquire(reserve=2)
+    assert bucket.try_acquire(reserve=2)
+    assert not bucket.try_acquire(reserve=2)
+    assert bucket.try_acquire()
+
+
+def test_acquire_waits_for_refill(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=1)
+    bucket.try_acquire()
+    start = clock[0]
+    assert bucket.acquire()
+    assert clock[0] - start == pytest.approx(1.0)
+
+
+def test_acquire_gives_up_at_timeout(clock):
+    bucket = TokenBucket(rate_per_minute=6, capacity=1)
+    bucket.try_acquire()
+    start = clock[0]
+    assert not bucket.acquire(timeout=5)
+    assert clock[0] - start == pytest.approx(5.0)
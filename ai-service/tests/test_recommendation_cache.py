@@ -0,0 +1,107 @@
+import pytest
+
+import movie_recommendations
+import recommendation_cache as cache_module
+from movie_recommendations import MovieItem, MovieRecommendationResult, cache_recommendation
+from recommendation_cache import RecommendationCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    return clock
+
+
+def result(*titles, reason='Karena minggumu penuh rapat dengan Budi.'):
+    return MovieRecommendationResult(
+        category='comfort', mood_label='sedih', headline='Untukmu yang rindu Budi',
+        description='Ringkasan pribadi', items=[MovieItem(t, 2000, '', genres=['Drama'], reason=reason) for t in titles],
+    )
+
+
+def test_make_key_buckets_scores():
+    cache = RecommendationCache(bucket_size=10)
+    assert cache.make_key('comfort', 'sedih', 42) == ('comfort', 4, 'sedih')
+    assert cache.make_key('comfort', 'sedih', 49) == cache.make_key('comfort', 'sedih', 40)
+    assert cache.make_key('comfort', 'sedih', None)[1] == -1
+
+
+def test_pool_rotates_and_skips_duplicates(clock):
+    cache = RecommendationCache(pool_size=2)
+    key = ('comfort', 4, 'sedih')
+    assert cache.put(key, result('A'))
+    assert not cache.is_full(key)
+    assert cache.put(key, result('B'))
+    assert cache.is_full(key)
+    assert [cache.get(key).items[0].title for _ in range(3)] == ['A', 'B', 'A']
+    assert not cache.put(key, result('a'))
+
+    # A third distinct set pushes out the oldest
+    cache.put(key, result('C'))
+    assert {cache.get(key).items[0].title for _ in range(2)} == {'B', 'C'}
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = RecommendationCache(ttl_seconds=60)
+    key = ('joyful', 8, 'senang')
+    cache.put(key, result('A'))
+    clock.now += 30
+    cache.put(key, result('B'))
+    clock.now += 31
+    assert cache.get(key).items[0].title == 'B'
+    clock.now += 30
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_key_is_evicted(clock):
+    cache = RecommendationCache(max_keys=2)
+    cache.put(('a',), result('A'))
+    cache.put(('b',), result('B'))
+    cache.get(('a',))
+    cache.put(('c',), result('C'))
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) and cache.get(('c',))
+
+
+def test_duplicate_answers_still_fill_the_pool():
+    # Gemini repeating itself means the bucket has converged
+    cache = RecommendationCache(pool_size=2)
+    cache.put(('a',), result('A'))
+    assert not cache.put(('a',), result('A'))
+    assert cache.is_full(('a',))
+
+
+def test_snapshot_restore_keeps_age(clock):
+    cache = RecommendationCache(ttl_seconds=60)
+    cache.put(('a',), result('A'))
+    clock.now += 50
+    restored = RecommendationCache(ttl_seconds=60)
+    assert restored.restore(cache.snapshot()) == 1
+    clock.now += 11
+    assert restored.get(('a',)) is None
+
+
+def test_shared_pools_drop_personal_text(monkeypatch):
+    monkeypatch.setattr(movie_recommendations, 'recommendation_cache', RecommendationCache())
+    monkeypatch.setattr(movie_recommendations, 'shared_cache', None)
+    key = ('comfort', 4, 'sedih')
+    personal = result('A')
+
+    cache_recommendation(key, personal)
+    cache_recommendation(key + ('user-1',), personal)
+
+    shared = movie_recommendations.recommendation_cache.get(key)
+    assert shared.items[0].title == 'A'
+    assert 'Budi' not in shared.headline + shared.description + shared.items[0].reason
+    assert shared.items[0].reason == movie_recommendations.catalog_reason(['Drama'], 'comfort')
+    assert movie_recommendations.recommendation_cache.get(key + ('user-1',)) == personal
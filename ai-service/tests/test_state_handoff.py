@@ -0,0 +1,83 @@
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import ai_pb2
+import state_handoff
+from note_fingerprint import DayFingerprint, NearDuplicateIndex
+
+
+class FakeRouter:
+    def __init__(self, stats=None):
+        self.stats = stats or {}
+        self.restored = None
+
+    def snapshot(self):
+        return self.stats
+
+    def restore(self, data, elapsed):
+        self.restored = (data, elapsed)
+        return len(data)
+
+
+def fingerprint(body):
+    return DayFingerprint.from_notes([SimpleNamespace(title='Harian', body=body)])
+
+
+def test_worker_path():
+    assert state_handoff.worker_path(Path('/s/router_stats.json'), 2) == Path('/s/router_stats.worker-2.json')
+    assert state_handoff.worker_path('/s/near.json', 0) == '/s/near.worker-0.json'
+    assert state_handoff.worker_path('/s/near.json') == '/s/near.json'
+
+
+def test_router_stats_round_trip(tmp_path):
+    path = tmp_path / 'router_stats.json'
+    assert state_handoff.save_router_stats(FakeRouter({'flash': {'latency': 1.2}}), path) == 1
+    router = FakeRouter()
+    assert state_handoff.load_router_stats(router, path) == 1
+    data, age = router.restored
+    assert data == {'flash': {'latency': 1.2}}
+    assert 0 <= age < 5
+
+
+def test_stale_and_missing_snapshots_are_ignored(tmp_path, monkeypatch):
+    path = tmp_path / 'router_stats.json'
+    path.write_text(json.dumps({'savedAt': time.time() - 7200, 'data': {'flash': {}}}))
+    monkeypatch.setattr(state_handoff, 'STATE_MAX_AGE_SECONDS', 3600)
+    assert state_handoff.load_router_stats(FakeRouter(), path) == 0
+    assert state_handoff.load_router_stats(FakeRouter(), tmp_path / 'missing.json') == 0
+    (tmp_path / 'broken.json').write_text('{')
+    assert state_handoff.load_router_stats(FakeRouter(), tmp_path / 'broken.json') == 0
+
+
+def test_near_duplicates_round_trip(tmp_path):
+    path = tmp_path / 'near_duplicates.json'
+    index = NearDuplicateIndex()
+    day = fingerprint('Hari ini aku merasa bersyukur.')
+    result = ai_pb2.AnalysisResult(summary='Hari yang baik', mood_score=72)
+    terms = (frozenset({'bersyukur'}), frozenset())
+    index.add('u1', '2026-01-01', day, (result, 70, terms))
+    assert state_handoff.save_near_duplicates(index, path) == 1
+
+    restored = NearDuplicateIndex()
+    assert state_handoff.load_near_duplicates(restored, path) == 1
+    (loaded, local_score, loaded_terms), distance = restored.lookup('u1', '2026-01-01', day)
+    assert (loaded, local_score, loaded_terms, distance) == (result, 70, terms, 0)
+
+
+def test_near_duplicates_without_terms_load_as_unknown(tmp_path):
+    path = tmp_path / 'near_duplicates.json'
+    index = NearDuplicateIndex()
+    day = fingerprint('Catatan lama.')
+    index.add('u1', '2026-01-01', day, (ai_pb2.AnalysisResult(summary='lama'), 50, (frozenset(), frozenset())))
+    state_handoff.save_near_duplicates(index, path)
+
+    snapshot = json.loads(path.read_text())
+    del snapshot['data'][0]['entries'][0]['terms']
+    path.write_text(json.dumps(snapshot))
+
+    restored = NearDuplicateIndex()
+    state_handoff.load_near_duplicates(restored, path)
+    (_, _, terms), _ = restored.lookup('u1', '2026-01-01', day)
+    assert terms is None
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from structured_output import (ANALYSIS_SCHEMA, MOVIE_SCHEMA, conform, gemini_schema, parse_json,
+                               parse_structured, repair_candidates)
+
+FULL = {
+    'summary': 'Hari yang tenang.',
+    'dominantMood': 'tenang',
+    'moodScore': 70,
+    'highlights': ['jalan pagi'],
+    'advice': ['istirahat cukup'],
+    'affirmation': 'Kamu hebat.',
+}
+
+
+def test_valid_json_passes_through():
+    assert parse_structured(json.dumps(FULL), ANALYSIS_SCHEMA) == FULL
+
+
+def test_code_fences_are_stripped():
+    assert parse_json('```json\n{"a": 1}\n```') == {'a': 1}
+
+
+@pytest.mark.parametrize('cut', [
+    '{"summary": "Hari yang tenang.", "moodScore": 70, "highlights": ["jalan pagi", "mem',
+    '{"summary": "Hari yang tenang.", "moodScore": 70, "highlights": ["jalan pagi"',
+    '{"summary": "Hari yang tenang.", "moodScore": 70, "highl',
+])
+def test_truncated_json_is_repaired(cut):
+    data = parse_structured(cut, ANALYSIS_SCHEMA)
+    assert data['summary'] == 'Hari yang tenang.'
+    assert data['moodScore'] == 70
+    assert data['highlights'] in ([], ['jalan pagi'])
+
+
+def test_truncated_string_value_is_kept_when_nothing_earlier_fits():
+    assert parse_json('{"summary": "Hari yang ten') == {'summary': 'Hari yang ten'}
+
+
+def test_escaped_quotes_do_not_confuse_the_repair():
+    assert parse_json('{"a": "kata \\"kutipan\\"", "b": [1, 2') == {'a': 'kata "kutipan"', 'b': [1, 2]}
+
+
+def test_trailing_garbage_after_the_object():
+    assert next(repair_candidates('{"a": 1}} extra')) == '{"a": 1}'
+
+
+def test_hopeless_text_returns_none():
+    assert parse_json('maaf, saya tidak bisa membantu') is None
+    assert parse_structured('', ANALYSIS_SCHEMA) is None
+
+
+def test_fields_are_coerced_to_the_schema():
+    data = parse_structured('{"summary": 5, "moodScore": "250", "highlights": "satu", "advice": null}',
+                            ANALYSIS_SCHEMA)
+    assert data['summary'] == '5'
+    assert data['moodScore'] == 100
+    assert data['highlights'] == ['satu']
+    assert data['advice'] == []
+    assert data['dominantMood'] == 'unknown'
+
+
+def test_non_finite_numbers_get_the_default():
+    problems = []
+    assert conform(float('nan'), ANALYSIS_SCHEMA['properties']['moodScore'], problems) == 0
+    assert problems
+
+
+def test_enums_and_max_items():
+    movies = [{'title': f'Film {i}', 'year': 3000, 'tagline': '', 'genres': ['a', 'b', 'c', 'd'], 'reason': ''}
+              for i in range(5)]
+    data = parse_structured(json.dumps({'category': ' Comfort ', 'movies': movies}), MOVIE_SCHEMA)
+    assert data['category'] == 'comfort'
+    assert len(data['movies']) == 3
+    assert data['movies'][0]['year'] == 2100
+    assert data['movies'][0]['genres'] == ['a', 'b', 'c']
+    assert 'imdbId' not in data['movies'][0]
+
+
+def test_gemini_schema_strips_local_keys():
+    schema = gemini_schema(ANALYSIS_SCHEMA)
+    assert 'minimum' not in schema['properties']['moodScore']
+    assert 'default' not in schema['properties']['dominantMood']
+    assert 'minimum' in ANALYSIS_SCHEMA['properties']['moodScore']
+
+
+def test_analysis_with_blank_summary_is_not_a_fallback():
+    from server import EMPTY_SUMMARY, parse_gemini_response
+
+    data = parse_gemini_response(json.dumps(dict(FULL, summary=' ')))
+    assert data['summary'] == EMPTY_SUMMARY
+    assert data['moodScore'] == 70
+    assert '_fallback' not in data
+    assert parse_gemini_response('bukan json')['_fallback']
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+import pytest
+
+from style_timeline import style_timeline
+from writing_style import analyze_text
+
+INDONESIAN = [
+    "Hari ini aku pergi ke pasar bersama ibu dan kami membeli sayur yang segar sekali. Senang rasanya!",
+    "Pekerjaan di kantor cukup melelahkan tapi aku tetap semangat menyelesaikan laporan itu",
+    "Apakah aku sudah cukup istirahat minggu ini? Rasanya belum, jadi besok aku mau tidur lebih awal.",
+    "Malam ini hujan deras dan aku menulis jurnal sambil minum teh hangat di kamar",
+]
+ENGLISH = [
+    "I went for a long walk by the river this morning and the air was cold but fresh.",
+    "Work was busy again and I could not finish the report before the deadline",
+    "Why do I always leave the hardest tasks for last? Tomorrow I will start with them!",
+]
+
+
+def dated_entries(texts, days=60, every=2):
+    start = date(2026, 1, 1)
+    return [
+        ((start + timedelta(days=day)).isoformat(), texts[i % len(texts)])
+        for i, day in enumerate(range(0, days, every))
+    ]
+
+
+@pytest.mark.parametrize('texts', [INDONESIAN, ENGLISH])
+@pytest.mark.parametrize('window_days, step_days', [(7, 1), (30, 7), (30, 30)])
+def test_window_metrics_match_analyze_text(texts, window_days, step_days):
+    entries = dated_entries(texts)
+    windows = style_timeline(entries, window_days, step_days)
+    assert windows
+
+    for window in windows:
+        window_texts = [text for day, text in entries if window.start <= date.fromisoformat(day) <= window.end]
+        assert window.entries == len(window_texts)
+        expected = analyze_text("\n".join(window_texts), entries=window_texts)
+        style = window.style
+
+        assert style.total_words == expected.total_words
+        assert style.total_sentences == expected.total_sentences
+        assert style.language == expected.language
+        for name in ('avg_sentence_length', 'vocabulary_richness', 'punctuation_density', 'avg_word_length',
+                     'exclamation_ratio', 'question_ratio', 'syllables_per_word', 'readability'):
+            assert getattr(style, name) == pytest.approx(getattr(expected, name)), name
+        assert style.language_breakdown == pytest.approx(expected.language_breakdown)
+
+
+def test_entry_without_final_punctuation_joins_next_sentence():
+    entries = [('2026-01-01', "aku sangat lelah hari ini"), ('2026-01-02', "Besok aku libur. Senang sekali rasanya.")]
+    window, = style_timeline(entries, 7, 7)
+    expected = analyze_text("\n".join(text for _, text in entries))
+    assert window.style.total_sentences == expected.total_sentences == 2
+
+
+def test_step_longer_than_window_is_rejected():
+    with pytest.raises(ValueError):
+        style_timeline(dated_entries(ENGLISH), 7, 10 ** 6)
+
+
+def test_window_past_year_9999_overflows():
+    with pytest.raises(OverflowError):
+        style_timeline([('9999-12-30', ENGLISH[0] * 2)], 30, 7)
@@ -0,0 +1,281 @@
+"""
+🧵 Request Tracing
+
+Lightweight per-stage tracing for the request pipeline. A server interceptor
+opens a root span for each sampled RPC, joining the caller's trace when the
+request carries a W3C ``traceparent`` header in its gRPC metadata, and code
+inside the request wraps its stages in ``span(...)``. Finished traces are
+exported in batches on a background thread, either as JSON lines to a local
+file or as OTLP/HTTP JSON to a collector.
+
+With ``TRACE_SAMPLE_RATE=0`` (the default) and no sampled incoming trace,
+``span`` is a single context-variable lookup returning a shared no-op span.
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from pathlib import Path
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0'))
+# JSON lines file for finished spans (used when no OTLP endpoint is set)
+TRACE_FILE = os.getenv('TRACE_FILE', str(Path(__file__).parent / 'cache' / 'traces.jsonl'))
+# OTLP/HTTP traces endpoint, e.g. http://localhost:4318/v1/traces
+TRACE_OTLP_ENDPOINT = os.getenv('TRACE_OTLP_ENDPOINT', '')
+SERVICE_NAME = 'ai-service'
+
+TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+EXPORT_BATCH_SIZE = 256
+EXPORT_INTERVAL_SECONDS = 2.0
+
+_current_span = ContextVar('current_span', default=None)
+
+
+class Span:
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'attributes',
+                 'start_ns', 'end_ns', 'error', 'is_root', '_token')
+
+    def __init__(self, name: str, trace_id: str, parent_id: str = '', attributes: dict = None,
+                 is_root: bool = False):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error = ''
+        self.is_root = is_root
+        self._token = None
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        exporter.export(self)
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'durationMs': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes):
+    """Child span of the current span; a no-op when the request is not traced."""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(name, parent.trace_id, parent.span_id, attributes)
+
+
+def parse_traceparent(value: str):
+    """Return ``(trace_id, parent_span_id, sampled)`` from a traceparent header, or None."""
+    match = TRACEPARENT_PATTERN.match(value.strip().lower()) if value else None
+    if not match or match.group(1) == '0' * 32:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+def start_trace(name: str, traceparent: str = '', sample_rate: float = None, **attributes):
+    """Root span for a request, joining an incoming trace when there is one."""
+    rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    incoming = parse_traceparent(traceparent)
+    if incoming:
+        trace_id, parent_id, sampled = incoming
+    else:
+        trace_id, parent_id, sampled = f"{random.getrandbits(128):032x}", '', False
+
+    if not sampled and (rate <= 0 or random.random() >= rate):
+        return NOOP_SPAN
+    return Span(name, trace_id, parent_id, attributes, is_root=True)
+
+
+# ============================================
+# Export
+# ============================================
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def to_otlp(spans: list) -> dict:
+    """OTLP/HTTP JSON payload for a batch of spans."""
+    return {'resourceSpans': [{
+        'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+        'scopeSpans': [{
+            'scope': {'name': SERVICE_NAME},
+            'spans': [{
+                'traceId': s.trace_id,
+                'spanId': s.span_id,
+                'parentSpanId': s.parent_id,
+                'name': s.name,
+                'kind': 2 if s.is_root else 1,  # SERVER for request roots, INTERNAL otherwise
+                'startTimeUnixNano': str(s.start_ns),
+                'endTimeUnixNano': str(s.end_ns),
+                'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in s.attributes.items()],
+                'status': {'code': 2, 'message': s.error} if s.error else {'code': 1},
+            } for s in spans],
+        }],
+    }]}
+
+
+class SpanExporter:
+    """Batches finished spans and writes them from a background thread."""
+
+    def __init__(self, path: str = TRACE_FILE, endpoint: str = TRACE_OTLP_ENDPOINT):
+        self.path = path
+        self.endpoint = endpoint
+        self._queue = queue.Queue(maxsize=10000)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='trace-exporter', daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass  # drop rather than slow down requests
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + EXPORT_INTERVAL_SECONDS
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.warning(f"Could not export {len(batch)} spans: {e}")
+
+    def _write(self, spans: list):
+        if self.endpoint:
+            request = urllib.request.Request(
+                self.endpoint,
+                data=json.dumps(to_otlp(spans)).encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+            )
+            urllib.request.urlopen(request, timeout=5).close()
+            return
+
+        target = Path(self.path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'a', encoding='utf-8') as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict(), ensure_ascii=False) + '\n')
+
+
+exporter = SpanExporter()
+
+
+# ============================================
+# gRPC interceptor
+# ============================================
+
+def _traceparent(handler_call_details) -> str:
+    for key, value in handler_call_details.invocation_metadata or ():
+        if key == 'traceparent':
+            return value
+    return ''
+
+
+class TracingInterceptor(grpc.ServerInterceptor):
+    """Opens a root span per sampled RPC."""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        method = handler_call_details.method.rsplit('/', 1)[-1]
+        traceparent = _traceparent(handler_call_details)
+
+        if handler.unary_unary:
+            behavior = handler.unary_unary
+
+            def unary_unary(request, context):
+                with start_trace(method, traceparent, rpc=method) as root:
+                    response = behavior(request, context)
+                    root.set('grpc.status', (context.code() or grpc.StatusCode.OK).name)
+                    return response
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        if handler.unary_stream:
+            behavior = handler.unary_stream
+
+            def unary_stream(request, context):
+                with start_trace(method, traceparent, rpc=method) as root:
+                    for i, message in enumerate(behavior(request, context)):
+                        root.set('messages', i + 1)
+                        yield message
+                    root.set('grpc.status', (context.code() or grpc.StatusCode.OK).name)
+
+            return grpc.unary_stream_rpc_method_handler(
+                unary_stream,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
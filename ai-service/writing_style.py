@@ -13,8 +13,8 @@ Features:
     - Sentence length analysis
     - Vocabulary richness (Type-Token Ratio)
     - Punctuation habits
-    - Word complexity (syllables per word)
-    - Indonesian language support via Sastrawi stemmer
+    - Word complexity (syllables per word) and Flesch readability
+    - Indonesian language support via Sastrawi stemmer (optional, see stemming.py)
 """
 
 import argparse
@@ -23,9 +23,12 @@ import sys
 import random
 from pathlib import Path
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
+from stemming import stem_words
+
 # ============================================================================
 # Author Profiles - Based on typical writing characteristics
 # ============================================================================
@@ -37,6 +40,7 @@ class AuthorProfile:
     vocabulary_richness: float  # type-token ratio (0-1)
     punctuation_density: float  # punctuation marks per 100 words
     avg_word_length: float      # characters per word
+    readability: float          # Flesch reading ease (0-100, higher = easier)
     description: str
     fun_fact: str
 
@@ -50,6 +54,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.45,
         punctuation_density=8.0,
         avg_word_length=4.2,
+        readability=88.0,
         description="Master of short, punchy sentences. Less is more.",
         fun_fact="He once wrote a 6-word story: 'For sale: baby shoes, never worn.'"
     ),
@@ -60,6 +65,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.72,
         punctuation_density=15.0,
         avg_word_length=4.8,
+        readability=62.0,
         description="Rich vocabulary, dramatic flair, loves commas.",
         fun_fact="He invented over 1,700 words including 'lonely' and 'generous'."
     ),
@@ -70,6 +76,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.55,
         punctuation_density=12.0,
         avg_word_length=4.5,
+        readability=74.0,
         description="Balanced sentences, vivid descriptions, accessible vocabulary.",
         fun_fact="She was rejected by 12 publishers before Harry Potter was accepted."
     ),
@@ -80,6 +87,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.60,
         punctuation_density=10.0,
         avg_word_length=5.5,
+        readability=58.0,
         description="Powerful prose, historical depth, poetic Indonesian.",
         fun_fact="He wrote his famous Buru Quartet while imprisoned, without paper."
     ),
@@ -90,6 +98,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.52,
         punctuation_density=11.0,
         avg_word_length=5.0,
+        readability=68.0,
         description="Heartfelt storytelling, simple yet profound language.",
         fun_fact="Laskar Pelangi has been translated into 34 languages."
     ),
@@ -100,6 +109,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.48,
         punctuation_density=9.0,
         avg_word_length=4.8,
+        readability=80.0,
         description="Short sentences, conversational tone, emotional impact.",
         fun_fact="His real name is Darwis and he used to work as an accountant."
     ),
@@ -110,6 +120,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.65,
         punctuation_density=18.0,
         avg_word_length=4.9,
+        readability=55.0,
         description="Long, winding sentences with vivid character descriptions.",
         fun_fact="He walked 12 miles every day to help him think of ideas."
     ),
@@ -120,6 +131,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.50,
         punctuation_density=10.0,
         avg_word_length=4.4,
+        readability=79.0,
         description="Direct, conversational, keeps you on the edge of your seat.",
         fun_fact="He writes 2,000 words every single day, including holidays."
     ),
@@ -130,6 +142,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.58,
         punctuation_density=9.0,
         avg_word_length=4.6,
+        readability=76.0,
         description="Dreamy, surreal, simple words with deep meaning.",
         fun_fact="He runs marathons and once ran 100km in a single day."
     ),
@@ -140,6 +153,7 @@ AUTHOR_PROFILES = [
         vocabulary_richness=0.35,
         punctuation_density=5.0,
         avg_word_length=4.0,
+        readability=90.0,
         description="Super short, casual, emoji-friendly vibes.",
         fun_fact="280 characters is more than enough to change the world... or start drama."
     ),
@@ -180,29 +194,144 @@ ENGLISH_STOPWORDS = {
 
 ALL_STOPWORDS = INDONESIAN_STOPWORDS | ENGLISH_STOPWORDS
 
+WORD_PATTERN = re.compile(r'\b[a-zA-Z]+\b')
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+PUNCTUATION_PATTERN = re.compile(r'[.,;:!?\-\'"()—]')
+
+
+def tokenize(text: str) -> list:
+    """Lowercased alphabetic words of a text."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+# Indonesian particles, weighted above ordinary stopwords
+INDONESIAN_PARTICLES = frozenset({'nya', 'kan', 'lah', 'kah', 'pun', 'lagi', 'dong', 'sih', 'deh', 'nih'})
 
-def detect_language(text: str) -> str:
-    """Detect if text is primarily Indonesian or English."""
-    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
+# (Indonesian, English) votes of each marker word
+LANGUAGE_VOTES = {
+    word: ((word in INDONESIAN_STOPWORDS) + 2 * (word in INDONESIAN_PARTICLES), int(word in ENGLISH_STOPWORDS))
+    for word in INDONESIAN_STOPWORDS | INDONESIAN_PARTICLES | ENGLISH_STOPWORDS
+}
+
+# Detection reads chunks spread over the text. Words within a chunk share an
+# entry and a language, so each chunk counts as one observation: reading stops
+# once the mean Indonesian share of the chunks read is LANGUAGE_CONFIDENCE_Z
+# standard errors away from an even split
+LANGUAGE_SAMPLE_WORDS = 200
+LANGUAGE_SAMPLE_CHARS = 1500
+LANGUAGE_MIN_CHUNKS = 4
+LANGUAGE_MIN_VOTES = 30
+LANGUAGE_CONFIDENCE_Z = 3.0
+
+
+def _spread_order(count: int):
+    """Indices 0..count-1 ordered to cover the range evenly early: 0, middle, quarters, ..."""
+    seen = set()
+    step = count
+    while step >= 1:
+        for index in range(0, count, step):
+            if index not in seen:
+                seen.add(index)
+                yield index
+        if step == 1:
+            break
+        step //= 2
+
+
+def _word_chunks(words: list):
+    chunks = (len(words) + LANGUAGE_SAMPLE_WORDS - 1) // LANGUAGE_SAMPLE_WORDS
+    for index in _spread_order(chunks):
+        yield words[index * LANGUAGE_SAMPLE_WORDS:(index + 1) * LANGUAGE_SAMPLE_WORDS]
+
+
+def _text_chunks(text: str):
+    chunks = (len(text) + LANGUAGE_SAMPLE_CHARS - 1) // LANGUAGE_SAMPLE_CHARS
+    for index in _spread_order(chunks):
+        start, end = index * LANGUAGE_SAMPLE_CHARS, (index + 1) * LANGUAGE_SAMPLE_CHARS
+        words = tokenize(text[start:end])
+        # Drop words cut at chunk edges; the neighbouring chunk sees them whole
+        if words and start > 0 and text[start - 1].isalpha() and text[start].isalpha():
+            words = words[1:]
+        if words and end < len(text) and text[end - 1].isalpha() and text[end].isalpha():
+            words = words[:-1]
+        yield words
+
+
+def language_votes(words) -> tuple:
+    """``(indonesian, english)`` votes of all ``words``."""
+    indonesian = english = 0
+    for word in words:
+        votes = LANGUAGE_VOTES.get(word)
+        if votes is not None:
+            indonesian += votes[0]
+            english += votes[1]
+    return indonesian, english
+
+
+def language_from_votes(indonesian: int, english: int, words: int) -> str:
     if not words:
         return 'unknown'
-    
-    id_count = sum(1 for w in words if w in INDONESIAN_STOPWORDS)
-    en_count = sum(1 for w in words if w in ENGLISH_STOPWORDS)
-    
-    # Indonesian-specific patterns
-    id_patterns = ['nya', 'kan', 'lah', 'kah', 'pun', 'lagi', 'dong', 'sih', 'deh', 'nih']
-    id_pattern_count = sum(1 for w in words if w in id_patterns)
-    id_count += id_pattern_count * 2  # Weight Indonesian patterns more
-    
-    if id_count > en_count:
+    if indonesian > english:
         return 'indonesian'
-    elif en_count > id_count:
+    elif english > indonesian:
         return 'english'
     else:
         return 'mixed'
 
 
+def _language_votes(chunks) -> tuple:
+    """``(indonesian, english, words_seen)``, stopping early once one side clearly leads."""
+    indonesian = english = seen = 0
+    samples = share_sum = share_squares = 0.0
+    for words in chunks:
+        seen += len(words)
+        chunk_indonesian, chunk_english = language_votes(words)
+        indonesian += chunk_indonesian
+        english += chunk_english
+        if not chunk_indonesian + chunk_english:
+            continue
+        share = chunk_indonesian / (chunk_indonesian + chunk_english)
+        samples += 1
+        share_sum += share
+        share_squares += share * share
+        if samples >= LANGUAGE_MIN_CHUNKS and indonesian + english >= LANGUAGE_MIN_VOTES:
+            mean = share_sum / samples
+            variance = max(share_squares / samples - mean * mean, 0.0) * samples / (samples - 1)
+            if abs(mean - 0.5) > LANGUAGE_CONFIDENCE_Z * (variance / samples) ** 0.5:
+                break
+    return indonesian, english, seen
+
+
+def detect_language(text: str = '', words: list = None) -> str:
+    """Detect if text is primarily Indonesian or English.
+
+    Pass ``words`` when the text is already tokenized; otherwise only the
+    sampled chunks of ``text`` are tokenized.
+    """
+    chunks = _word_chunks(words) if words is not None else _text_chunks(text)
+    return language_from_votes(*_language_votes(chunks))
+
+
+def language_breakdown(entry_words: list) -> dict:
+    """Share of words in each language, classifying every entry on its own."""
+    totals = Counter()
+    for words in entry_words:
+        if words:
+            totals[detect_language(words=words)] += len(words)
+    total = sum(totals.values())
+    return {language: count / total for language, count in totals.most_common()} if total else {}
+
+
+# Distinct words whose syllable counts are memoized, per language
+SYLLABLE_CACHE_SIZE = 16384
+
+# Flesch reading ease is calibrated on English, whose words average about 1.4
+# syllables; Indonesian words average about 2.4, so Indonesian syllable counts
+# are scaled to the English baseline to keep scores on one 0-100 scale.
+TYPICAL_SYLLABLES_PER_WORD = {'english': 1.4, 'indonesian': 2.4}
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
 def count_syllables_indonesian(word: str) -> int:
     """Count syllables in an Indonesian word (vowel-based estimation)."""
     vowels = 'aiueoAIUEO'
@@ -219,6 +348,7 @@ def count_syllables_indonesian(word: str) -> int:
     return max(1, count)
 
 
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
 def count_syllables_english(word: str) -> int:
     """Count syllables in an English word (approximate)."""
     word = word.lower()
@@ -243,6 +373,24 @@ def count_syllables_english(word: str) -> int:
     return max(1, count)
 
 
+def syllable_language(language: str) -> str:
+    """Syllable rules for a detected language; mixed and unknown text is mostly Indonesian here."""
+    return 'english' if language == 'english' else 'indonesian'
+
+
+def count_text_syllables(word_counts: Counter, language: str) -> int:
+    """Total syllables of a word frequency table, counting each distinct word once."""
+    count = count_syllables_english if syllable_language(language) == 'english' else count_syllables_indonesian
+    return sum(count(word) * n for word, n in word_counts.items())
+
+
+def flesch_reading_ease(words_per_sentence: float, syllables_per_word: float, language: str) -> float:
+    """Flesch reading ease clamped to 0-100, with syllables scaled to the English baseline."""
+    scale = TYPICAL_SYLLABLES_PER_WORD['english'] / TYPICAL_SYLLABLES_PER_WORD[syllable_language(language)]
+    score = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word * scale
+    return min(100.0, max(0.0, score))
+
+
 # ============================================================================
 # Text Analysis Functions
 # ============================================================================
@@ -258,26 +406,34 @@ class WritingStyle:
     top_words: list
     exclamation_ratio: float
     question_ratio: float
+    syllables_per_word: float = 0.0
+    readability: float = 0.0  # Flesch reading ease (0-100, higher = easier)
+    language_breakdown: dict = field(default_factory=dict)  # language -> share of words
+
 
+def analyze_text(text: str, entries: list = None) -> Optional[WritingStyle]:
+    """Analyze writing style metrics from text.
 
-def analyze_text(text: str) -> Optional[WritingStyle]:
-    """Analyze writing style metrics from text."""
+    ``entries`` are the separate texts ``text`` was joined from, used for the
+    per-entry language breakdown.
+    """
     if not text or len(text.strip()) < 50:
         return None
     
+    # Tokenize once per entry; joined entries tokenize to the same words
+    entry_words = [tokenize(entry) for entry in entries] if entries else [tokenize(text)]
+    words = entry_words[0] if len(entry_words) == 1 else [w for ws in entry_words for w in ws]
+
     # Detect language
-    language = detect_language(text)
+    language = detect_language(words=words)
     
     # Split into sentences (handle both . ! ? and Indonesian patterns)
-    sentences = re.split(r'[.!?]+', text)
+    sentences = SENTENCE_SPLIT_PATTERN.split(text)
     sentences = [s.strip() for s in sentences if s.strip()]
     
     if not sentences:
         return None
     
-    # Extract words
-    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-    
     if not words:
         return None
     
@@ -286,20 +442,30 @@ def analyze_text(text: str) -> Optional[WritingStyle]:
     total_sentences = len(sentences)
     avg_sentence_length = total_words / total_sentences if total_sentences > 0 else 0
     
-    # Vocabulary richness (Type-Token Ratio)
-    unique_words = set(words)
-    vocabulary_richness = len(unique_words) / total_words if total_words > 0 else 0
+    # Vocabulary richness (Type-Token Ratio), over stems for Indonesian so
+    # "makan", "makanan" and "dimakan" count as one word
+    word_counts = Counter(words)
+    stems = stem_words(word_counts) if language != 'english' else {}
+    vocabulary_size = len(set(stems.values())) if stems else len(word_counts)
+    vocabulary_richness = vocabulary_size / total_words if total_words > 0 else 0
     
     # Punctuation density (per 100 words)
-    punctuation = re.findall(r'[.,;:!?\-\'"()—]', text)
+    punctuation = PUNCTUATION_PATTERN.findall(text)
     punctuation_density = (len(punctuation) / total_words) * 100 if total_words > 0 else 0
     
     # Average word length
     avg_word_length = sum(len(w) for w in words) / total_words if total_words > 0 else 0
+
+    # Word complexity and readability
+    syllables_per_word = count_text_syllables(word_counts, language) / total_words
+    readability = flesch_reading_ease(avg_sentence_length, syllables_per_word, language)
     
     # Top words (excluding stopwords)
-    content_words = [w for w in words if w not in ALL_STOPWORDS and len(w) > 2]
-    word_freq = Counter(content_words)
+    word_freq = Counter()
+    for word, count in word_counts.items():
+        stem = stems.get(word, word)
+        if word not in ALL_STOPWORDS and len(stem) > 2:
+            word_freq[stem] += count
     top_words = word_freq.most_common(5)
     
     # Exclamation and question ratios
@@ -319,6 +485,9 @@ def analyze_text(text: str) -> Optional[WritingStyle]:
         top_words=top_words,
         exclamation_ratio=exclamation_ratio,
         question_ratio=question_ratio,
+        syllables_per_word=syllables_per_word,
+        readability=readability,
+        language_breakdown=language_breakdown(entry_words),
     )
 
 
@@ -326,10 +495,11 @@ def calculate_similarity(style: WritingStyle, author: AuthorProfile) -> float:
     """Calculate similarity score between user style and author profile."""
     # Weight each metric
     weights = {
-        'sentence_length': 0.30,
-        'vocabulary': 0.25,
+        'sentence_length': 0.25,
+        'vocabulary': 0.20,
         'punctuation': 0.20,
-        'word_length': 0.25,
+        'word_length': 0.20,
+        'readability': 0.15,
     }
     
     # Calculate normalized differences (0 = perfect match, 1 = very different)
@@ -337,19 +507,22 @@ def calculate_similarity(style: WritingStyle, author: AuthorProfile) -> float:
     diff_vocab = abs(style.vocabulary_richness - author.vocabulary_richness)
     diff_punct = abs(style.punctuation_density - author.punctuation_density) / 20.0
     diff_word = abs(style.avg_word_length - author.avg_word_length) / 3.0
+    diff_readability = abs(style.readability - author.readability) / 50.0
     
     # Convert to similarity (1 = perfect match)
     sim_sentence = max(0, 1 - diff_sentence)
     sim_vocab = max(0, 1 - diff_vocab)
     sim_punct = max(0, 1 - diff_punct)
     sim_word = max(0, 1 - diff_word)
+    sim_readability = max(0, 1 - diff_readability)
     
     # Weighted average
     similarity = (
         weights['sentence_length'] * sim_sentence +
         weights['vocabulary'] * sim_vocab +
         weights['punctuation'] * sim_punct +
-        weights['word_length'] * sim_word
+        weights['word_length'] * sim_word +
+        weights['readability'] * sim_readability
     )
     
     return similarity * 100  # Convert to percentage
@@ -461,7 +634,12 @@ def print_analysis(style: WritingStyle):
     print(f"  📚 Vocabulary Richness:   {style.vocabulary_richness:.2%}")
     print(f"  ✏️  Punctuation Density:  {style.punctuation_density:.1f} per 100 words")
     print(f"  🔤 Avg Word Length:       {style.avg_word_length:.1f} characters")
+    print(f"  🧩 Syllables per Word:    {style.syllables_per_word:.2f}")
+    print(f"  📖 Readability (Flesch):  {style.readability:.0f}/100")
     print(f"  🌐 Detected Language:     {lang_emoji} {style.language.title()}")
+    if len(style.language_breakdown) > 1:
+        mix = ", ".join(f"{share:.0%} {language.title()}" for language, share in style.language_breakdown.items())
+        print(f"  🌍 Language Mix:          {mix}")
     
     if style.top_words:
         words_str = ", ".join([f"'{w}' ({c}x)" for w, c in style.top_words])